@@ -1,44 +1,118 @@
 """Main CLI application for the crypto tax tool."""
 
 import argparse
+import functools
+import importlib
+import json
+import shutil
 import sys
 import os
 import logging
 from pathlib import Path
+from typing import Any, Dict, Mapping, Optional
 
-# Ensure project root is on path (when executed as module this is already true)
-sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from app.core.config import config, load_exchange_mappings, read_exchange_index, write_exchange_index
 
-from app.core.normalize import normalize_csv
-from app.core.calculate import calculate_taxes
-from app.core.report import generate_all_reports, generate_turbotax_report, generate_pdf_summary
-from app.core.validate import validate_df
-from app.core.config import config, load_exchange_mappings
-from app.core.auto_detect import auto_process_input_folder, interactive_exchange_selection, ExchangeDetector
-import pandas as pd
+# Heavy modules (pandas and everything built on it) are imported on first use,
+# so `--help` and `list-exchanges` start without them. Maps name -> (module, attribute).
+_LAZY_IMPORTS = {
+    'pd': ('pandas', None),
+    'normalize_csv': ('app.core.normalize', 'normalize_csv'),
+    'calculate_taxes': ('app.core.calculate', 'calculate_taxes'),
+    'generate_all_reports': ('app.core.report', 'generate_all_reports'),
+    'generate_turbotax_report': ('app.core.report', 'generate_turbotax_report'),
+    'generate_pdf_summary': ('app.core.report', 'generate_pdf_summary'),
+    'ReportGenerator': ('app.core.report', 'ReportGenerator'),
+    'validate_df': ('app.core.validate', 'validate_df'),
+    'auto_process_input_folder': ('app.core.auto_detect', 'auto_process_input_folder'),
+    'interactive_exchange_selection': ('app.core.auto_detect', 'interactive_exchange_selection'),
+    'ExchangeDetector': ('app.core.auto_detect', 'ExchangeDetector'),
+}
 
 
-def setup_logging(verbose: bool = False) -> None:
-    """Set up logging configuration."""
+def __getattr__(name: str):
+    """Resolve lazily imported names on first access and cache them as module globals."""
+    if name not in _LAZY_IMPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    module_name, attr = _LAZY_IMPORTS[name]
+    module = importlib.import_module(module_name)
+    value = getattr(module, attr) if attr else module
+    globals()[name] = value
+    return value
+
+
+def _lazy(name: str):
+    """Look up a lazily imported name from inside this module."""
+    if name in globals():
+        return globals()[name]
+    return __getattr__(name)
+
+
+def _cached_mappings(config_path: str = 'config/exchanges.yaml') -> Mapping[str, Mapping[str, Any]]:
+    """Load the (cached) exchange mappings and refresh the name index if it is stale."""
+    mappings = load_exchange_mappings(config_path)
+    if read_exchange_index(config_path) is None:
+        write_exchange_index(mappings, config_path)
+    return mappings
+
+
+@functools.lru_cache(maxsize=1)
+def _get_pyarrow():
+    """Return (pyarrow.csv, pyarrow.compute), or None when pyarrow is not installed."""
+    try:
+        from pyarrow import csv as pacsv, compute as pc
+    except ImportError:
+        return None
+    return pacsv, pc
+
+
+# Columns of gains_losses.csv read by the PDF and JSON summaries
+GAINS_SUMMARY_COLUMNS = ['asset', 'proceeds', 'cost_basis', 'gain_loss', 'short_term']
+
+
+# Commands whose runs are worth keeping in the on-disk log
+DISK_LOG_COMMANDS = {'normalize', 'calculate', 'auto-process'}
+
+
+class _DeferredFileHandler(logging.FileHandler):
+    """FileHandler that creates its directory only when the first record is written."""
+    
+    def __init__(self, filename: str):
+        super().__init__(filename, delay=True)
+    
+    def _open(self):
+        os.makedirs(os.path.dirname(self.baseFilename), exist_ok=True)
+        return super()._open()
+
+
+def setup_logging(verbose: bool = False, command: Optional[str] = None) -> None:
+    """Set up logging configuration.
+    
+    The log file is only attached for verbose runs and for commands in
+    DISK_LOG_COMMANDS, and is not opened until something is logged.
+    """
+    if logging.getLogger().hasHandlers():
+        return
+    
     log_level = logging.DEBUG if verbose else getattr(logging, config.get('app', 'log_level', 'INFO'))
     
-    # Create logs directory
-    log_dir = config.get('output', 'logs_dir', 'output/logs')
-    os.makedirs(log_dir, exist_ok=True)
+    handlers = [logging.StreamHandler(sys.stdout) if verbose else logging.NullHandler()]
+    if verbose or command in DISK_LOG_COMMANDS:
+        log_dir = config.get('output', 'logs_dir', 'output/logs')
+        handlers.append(_DeferredFileHandler(os.path.join(log_dir, 'crypto_tax_tool.log')))
     
     # Configure logging
     logging.basicConfig(
         level=log_level,
         format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler(os.path.join(log_dir, 'crypto_tax_tool.log')),
-            logging.StreamHandler(sys.stdout) if verbose else logging.NullHandler()
-        ]
+        handlers=handlers
     )
 
 
 def cmd_normalize(args) -> None:
     """Handle normalize command."""
+    normalize_csv = _lazy('normalize_csv')
     try:
         print(f"Normalizing {args.input_file} from {args.exchange}...")
         
@@ -60,6 +134,7 @@ def cmd_normalize(args) -> None:
 
 def cmd_calculate(args) -> None:
     """Handle calculate command."""
+    calculate_taxes = _lazy('calculate_taxes')
     try:
         print(f"Calculating taxes using {args.method.upper()} method...")
         
@@ -71,8 +146,9 @@ def cmd_calculate(args) -> None:
         
         # Print summary
         if not gains_df.empty:
-            short_term = gains_df[gains_df['short_term']]['gain_loss'].sum()
-            long_term = gains_df[~gains_df['short_term']]['gain_loss'].sum()
+            sums = gains_df.groupby('short_term', sort=False)['gain_loss'].sum()
+            short_term = sums.get(True, 0.0)
+            long_term = sums.get(False, 0.0)
             
             print(f"\nTax Calculation Results ({args.method.upper()}):")
             print(f"   Short-term gains/losses: ${short_term:,.2f}")
@@ -91,57 +167,133 @@ def cmd_calculate(args) -> None:
         sys.exit(1)
 
 
+def _sum_csv_column(file_path: str, column: str) -> float:
+    """Sum one numeric CSV column without loading the rest of the file."""
+    pyarrow = _get_pyarrow()
+    if pyarrow:
+        pacsv, pc = pyarrow
+        table = pacsv.read_csv(file_path, convert_options=pacsv.ConvertOptions(include_columns=[column]))
+        return pc.sum(table.column(column)).as_py() or 0
+    
+    pd = _lazy('pd')
+    chunk_size = config.getint('processing', 'chunk_size', 262144)
+    return sum(chunk[column].sum() for chunk in pd.read_csv(file_path, usecols=[column], chunksize=chunk_size))
+
+
+def _read_gains(file_path: str, columns: Optional[list] = None) -> 'pd.DataFrame':
+    """Load gains_losses.csv once for all report generators, optionally projecting columns."""
+    pyarrow = _get_pyarrow()
+    if pyarrow:
+        pacsv, _ = pyarrow
+        table = pacsv.read_csv(file_path, convert_options=pacsv.ConvertOptions(include_columns=columns or []))
+        return table.to_pandas(types_mapper=_lazy('pd').ArrowDtype)
+    
+    usecols = (lambda c: c in columns) if columns else None
+    return _lazy('pd').read_csv(file_path, usecols=usecols)
+
+
+REPORT_LABELS = {
+    'turbotax': 'TurboTax CSV',
+    'pdf': 'PDF Summary',
+    'detailed': 'Detailed CSV',
+    'json': 'JSON Summary',
+}
+
+REPORT_CACHE_FILE = '.report_cache.json'
+
+
+def _stat_or_none(path: Path) -> Optional[os.stat_result]:
+    """Stat a file once, returning None if it does not exist."""
+    try:
+        return path.stat()
+    except FileNotFoundError:
+        return None
+
+
+def _report_signature(*stats: Optional[os.stat_result]) -> list:
+    """Identify the input files a set of reports was generated from."""
+    return [[st.st_mtime_ns, st.st_size] if st else None for st in stats]
+
+
+def _load_report_cache(cache_path: Path, signature: list) -> Dict[str, str]:
+    """Return previously generated reports that are still valid for these inputs."""
+    try:
+        cached = json.loads(cache_path.read_text())
+    except (OSError, ValueError):
+        return {}
+    
+    if cached.get('signature') != signature:
+        return {}
+    return {name: path for name, path in cached.get('reports', {}).items() if os.path.isfile(path)}
+
+
+def _save_report_cache(cache_path: Path, signature: list, reports: Dict[str, str]) -> None:
+    """Record which reports were generated from the current inputs."""
+    try:
+        cache_path.write_text(json.dumps({'signature': signature, 'reports': reports}))
+    except OSError:
+        pass  # Caching is best effort
+
+
 def cmd_report(args) -> None:
     """Handle report command."""
+    generate_turbotax_report = _lazy('generate_turbotax_report')
+    generate_pdf_summary = _lazy('generate_pdf_summary')
     try:
         print("Generating reports...")
         
-        # Load existing data
-        reports_dir = config.get('output', 'reports_dir', 'output/reports')
-        gains_file = os.path.join(reports_dir, 'gains_losses.csv')
+        requested = [name for name in REPORT_LABELS if args.all or getattr(args, name)]
+        if not requested:
+            print("No report type specified. Use --turbotax, --pdf, --detailed, --json, or --all")
+            return
+        
+        # Stat inputs once; unchanged inputs let us reuse earlier outputs
+        reports_dir = Path(config.get('output', 'reports_dir', 'output/reports'))
+        gains_path = reports_dir / 'gains_losses.csv'
+        income_path = reports_dir / 'income_events.csv'
+        gains_stat = _stat_or_none(gains_path)
+        income_stat = _stat_or_none(income_path)
+        
+        cache_path = reports_dir / REPORT_CACHE_FILE
+        signature = _report_signature(gains_stat, income_stat)
+        reports = _load_report_cache(cache_path, signature) if gains_stat else {}
+        cached = set(reports) & set(requested)
+        pending = [name for name in requested if name not in reports]
         
-        gains_df = pd.DataFrame()
+        gains_df = None
         income = 0
         
-        if os.path.exists(gains_file):
-            gains_df = pd.read_csv(gains_file)
+        # Parse the gains file once and share it across generators; the
+        # PDF and JSON summaries only need a few of its columns
+        if gains_stat and pending:
+            needs_all_columns = 'turbotax' in pending or 'detailed' in pending
+            gains_df = _read_gains(str(gains_path), None if needs_all_columns else GAINS_SUMMARY_COLUMNS)
         
         # Load income data
-        income_file = os.path.join(reports_dir, 'income_events.csv')
-        if os.path.exists(income_file):
-            income_df = pd.read_csv(income_file)
-            income = income_df['income_amount'].sum() if not income_df.empty else 0
-        
-        generated_reports = []
+        if income_stat and ('pdf' in pending or 'json' in pending):
+            income = _sum_csv_column(str(income_path), 'income_amount')
         
         # Generate requested reports
-        if args.turbotax or args.all:
-            turbotax_file = generate_turbotax_report()
-            generated_reports.append(f"TurboTax CSV: {turbotax_file}")
-        
-        if args.pdf or args.all:
-            pdf_file = generate_pdf_summary(gains_df, income)
-            generated_reports.append(f"PDF Summary: {pdf_file}")
-        
-        if args.detailed or args.all:
-            from report import ReportGenerator
-            generator = ReportGenerator()
-            detailed_file = generator.generate_detailed_report()
-            generated_reports.append(f"Detailed CSV: {detailed_file}")
-        
-        if args.json or args.all:
-            from report import ReportGenerator
-            generator = ReportGenerator()
-            json_file = generator.generate_summary_json(gains_df, income)
-            generated_reports.append(f"JSON Summary: {json_file}")
-        
-        if not generated_reports:
-            print("No report type specified. Use --turbotax, --pdf, --detailed, --json, or --all")
-            return
+        if 'turbotax' in pending:
+            reports['turbotax'] = generate_turbotax_report(gains_df=gains_df)
+        
+        if 'pdf' in pending:
+            reports['pdf'] = generate_pdf_summary(gains_df, income)
+        
+        if 'detailed' in pending or 'json' in pending:
+            generator = _lazy('ReportGenerator')()
+            if 'detailed' in pending:
+                reports['detailed'] = generator.generate_detailed_report(gains_df=gains_df)
+            if 'json' in pending:
+                reports['json'] = generator.generate_summary_json(gains_df, income)
+        
+        if gains_stat and pending:
+            _save_report_cache(cache_path, signature, reports)
         
         print("\n Reports generated:")
-        for report in generated_reports:
-            print(f"   {report}")
+        for name in requested:
+            suffix = " (unchanged)" if name in cached else ""
+            print(f"   {REPORT_LABELS[name]}: {reports[name]}{suffix}")
         
     except Exception as e:
         print(f"Error generating reports: {e}")
@@ -150,11 +302,15 @@ def cmd_report(args) -> None:
 
 def cmd_validate(args) -> None:
     """Handle validate command."""
+    pd = _lazy('pd')
+    validate_df = _lazy('validate_df')
     try:
         print(f"Validating {args.input_file}...")
         
-        df = pd.read_csv(args.input_file)
-        results = validate_df(df)
+        chunk_size = config.getint('processing', 'chunk_size', 262144)
+        # Arrow-backed strings keep each chunk far smaller than object columns
+        read_options = {'dtype_backend': 'pyarrow'} if _get_pyarrow() else {}
+        results = validate_df(pd.read_csv(args.input_file, chunksize=chunk_size, **read_options))
         
         print(f"\nValidation Results:")
         print(f"   Total transactions: {results['total_transactions']}")
@@ -183,8 +339,29 @@ def cmd_validate(args) -> None:
         sys.exit(1)
 
 
+COPY_BUFFER_SIZE = 1 << 20
+
+
+def _combine_csv_files(input_files: list, output_file: str) -> None:
+    """Concatenate CSV files that share a header, keeping only the first header."""
+    with open(output_file, 'wb') as out:
+        for i, input_file in enumerate(input_files):
+            with open(input_file, 'rb') as src:
+                if i > 0:
+                    src.readline()
+                start = out.tell()
+                shutil.copyfileobj(src, out, length=COPY_BUFFER_SIZE)
+                
+                # Keep the next file's first row off this file's last line
+                if out.tell() > start:
+                    src.seek(-1, os.SEEK_END)
+                    if src.read(1) != b'\n':
+                        out.write(b'\n')
+
+
 def cmd_auto_process(args) -> None:
     """Handle auto-process command."""
+    auto_process_input_folder = _lazy('auto_process_input_folder')
     try:
         print(" Auto-processing files in input folder...")
         
@@ -192,7 +369,8 @@ def cmd_auto_process(args) -> None:
             input_dir=args.input_dir,
             output_dir=args.output_dir,
             interactive=not args.no_interactive,
-            ml_fallback=args.ml_fallback
+            ml_fallback=args.ml_fallback,
+            max_workers=args.workers
         )
         
         if not results:
@@ -217,11 +395,26 @@ def cmd_auto_process(args) -> None:
             for result in failed:
                 print(f"   {Path(result['input_file']).name}: {result['error']}")
         
-        if successful:
+        combined_file = os.path.join(args.output_dir, 'combined_normalized.csv')
+        combined = False
+        if successful and args.combine:
+            try:
+                _combine_csv_files([r['output_file'] for r in successful], combined_file)
+                combined = True
+                print(f"\nCombined {len(successful)} files into {combined_file}")
+            except OSError as e:
+                # The individual normalized files are still usable
+                print(f"\nCould not combine files: {e}")
+        
+        if combined:
+            print(f"\nNext steps:")
+            print(f"   1. Calculate taxes: python src/main.py calculate {combined_file}")
+            print(f"   2. Generate reports: python src/main.py report --all")
+        elif successful:
             print(f"\nNext steps:")
             print(f"   1. Review normalized files in {args.output_dir}")
-            print(f"   2. Combine files if needed: cat output/*_normalized.csv > combined.csv")
-            print(f"   3. Calculate taxes: python src/main.py calculate combined.csv")
+            print(f"   2. Combine files if needed: re-run with --combine")
+            print(f"   3. Calculate taxes: python src/main.py calculate {combined_file}")
             print(f"   4. Generate reports: python src/main.py report --all")
         
     except Exception as e:
@@ -234,7 +427,7 @@ def cmd_detect(args) -> None:
     try:
         if args.file:
             # Detect single file
-            exchange = interactive_exchange_selection(args.file)
+            exchange = _lazy('interactive_exchange_selection')(args.file)
             print(f"\nSelected exchange: {exchange}")
             
             if args.normalize:
@@ -244,7 +437,7 @@ def cmd_detect(args) -> None:
                 if args.ml_fallback and (exchange == 'unknown'):
                     exchange = 'ml'
                     print("Low confidence or unknown detected. Using ML fallback mapping.")
-                normalize_csv(
+                _lazy('normalize_csv')(
                     input_file=args.file,
                     exchange=exchange,
                     output_file=output_file,
@@ -255,14 +448,15 @@ def cmd_detect(args) -> None:
                 print(f"Normalized to: {output_file}")
         else:
             # Scan input folder
-            detector = ExchangeDetector()
+            detector = _lazy('ExchangeDetector')(exchange_mappings=_cached_mappings())
             detections = detector.scan_input_folder(args.input_dir)
             
             if not detections:
                 print(f"No CSV or XLSX files found in {args.input_dir}")
                 return
             
-            print(f"\nDetection Results for {len(detections)} files:\n")
+            # Collect the report and write it once rather than per line
+            lines = [f"\nDetection Results for {len(detections)} files:\n"]
             
             for detection in detections:
                 file_name = detection['file_name']
@@ -271,16 +465,19 @@ def cmd_detect(args) -> None:
                 
                 status = "PASS" if confidence >= 0.7 else "WARN" if confidence >= 0.4 else "FAIL"
                 
-                print(f"{status} {file_name}")
-                print(f"   Exchange: {exchange}")
-                print(f"   Confidence: {confidence:.1%}")
+                lines.append(f"{status} {file_name}")
+                lines.append(f"   Exchange: {exchange}")
+                lines.append(f"   Confidence: {confidence:.1%}")
                 
                 if detection['needs_confirmation']:
-                    print(f"   Status: Needs manual confirmation")
+                    lines.append(f"   Status: Needs manual confirmation")
                 else:
-                    print(f"   Status: High confidence detection")
+                    lines.append(f"   Status: High confidence detection")
                 
-                print()
+                lines.append("")
+            
+            sys.stdout.write('\n'.join(lines) + '\n')
+            sys.stdout.flush()
         
     except Exception as e:
         print(f"Error during detection: {e}")
@@ -290,15 +487,18 @@ def cmd_detect(args) -> None:
 def cmd_list_exchanges(args) -> None:
     """Handle list-exchanges command."""
     try:
-        mappings = load_exchange_mappings()
+        # The pre-sorted index avoids parsing the YAML just to list names
+        exchanges = read_exchange_index()
+        if exchanges is None:
+            exchanges = sorted(_cached_mappings().keys())
         
         print("Supported Exchanges:")
         print("=" * 50)
         
-        for exchange in sorted(mappings.keys()):
+        for exchange in exchanges:
             print(f"   {exchange}")
         
-        print(f"\nTotal: {len(mappings)} exchanges supported")
+        print(f"\nTotal: {len(exchanges)} exchanges supported")
         print("\nTo add a new exchange, edit config/exchanges.yaml")
         
     except Exception as e:
@@ -306,8 +506,58 @@ def cmd_list_exchanges(args) -> None:
         sys.exit(1)
 
 
-def main():
-    """Main CLI entry point."""
+def _identity(value: str) -> str:
+    """Default argument type; module-level so a built parser can be pickled."""
+    return value
+
+
+def _use_picklable_types(parser: argparse.ArgumentParser) -> None:
+    """Replace argparse's local default type converter in a parser tree."""
+    parser.register('type', None, _identity)
+    for action in parser._actions:
+        if isinstance(action, argparse._SubParsersAction):
+            for subparser in action.choices.values():
+                _use_picklable_types(subparser)
+
+
+PARSER_CACHE_PATH = Path.home() / '.cache' / 'cyrptax' / 'parser.pkl'
+
+
+def _get_parser() -> argparse.ArgumentParser:
+    """
+    Return the CLI parser, loading it from an on-disk pickle when enabled.
+    
+    Caching is opt-in via CYRPTAX_CACHE_PARSER=1. The pickle is rebuilt
+    whenever this file is newer than the cache or the program name (which
+    argparse bakes into usage text) changes.
+    """
+    if os.environ.get('CYRPTAX_CACHE_PARSER') != '1':
+        return _build_parser()
+    
+    import pickle
+    
+    try:
+        if PARSER_CACHE_PATH.stat().st_mtime >= os.path.getmtime(__file__):
+            with open(PARSER_CACHE_PATH, 'rb') as f:
+                prog, parser = pickle.load(f)
+            if prog == sys.argv[0]:
+                return parser
+    except (OSError, EOFError, ValueError, AttributeError, ImportError, pickle.UnpicklingError):
+        pass  # Missing, stale or written by another entry point; rebuild below
+    
+    parser = _build_parser()
+    _use_picklable_types(parser)
+    try:
+        PARSER_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        with open(PARSER_CACHE_PATH, 'wb') as f:
+            pickle.dump((sys.argv[0], parser), f)
+    except (OSError, pickle.PicklingError):
+        pass  # Caching is best effort
+    return parser
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser for all CLI commands."""
     parser = argparse.ArgumentParser(
         description='Free Crypto Tax Tool - Privacy-focused cryptocurrency tax calculations',
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -342,6 +592,7 @@ Examples:
     norm_parser.add_argument('--fetch-prices', action='store_true',
                            help='Fetch missing price data from CoinGecko')
     norm_parser.add_argument('--sheet', help='Sheet name for XLSX files')
+    norm_parser.set_defaults(func=cmd_normalize)
     
     # Calculate command
     calc_parser = subparsers.add_parser('calculate', help='Calculate taxes from normalized data')
@@ -351,6 +602,7 @@ Examples:
                            help='Tax calculation method (default: fifo)')
     calc_parser.add_argument('--currency', '-c', default='usd',
                            help='Tax currency (default: usd)')
+    calc_parser.set_defaults(func=cmd_calculate)
     
     # Report command
     report_parser = subparsers.add_parser('report', help='Generate tax reports')
@@ -364,10 +616,12 @@ Examples:
                              help='Generate JSON summary')
     report_parser.add_argument('--all', action='store_true',
                              help='Generate all report types')
+    report_parser.set_defaults(func=cmd_report)
     
     # Validate command
     validate_parser = subparsers.add_parser('validate', help='Validate normalized transaction data')
     validate_parser.add_argument('input_file', help='Path to normalized CSV file')
+    validate_parser.set_defaults(func=cmd_validate)
     
     # Auto-process command
     auto_parser = subparsers.add_parser('auto-process', help='Auto-detect and process files in input folder')
@@ -379,6 +633,11 @@ Examples:
                            help='Skip interactive confirmation (use auto-detected exchanges)')
     auto_parser.add_argument('--ml-fallback', action='store_true',
                            help='Use ML mapping when detection is low-confidence or unknown')
+    auto_parser.add_argument('--workers', type=int,
+                           help='Number of files to normalize in parallel (default: CPU count, max 4)')
+    auto_parser.add_argument('--combine', action='store_true',
+                           help='Combine normalized outputs into one CSV (combined_normalized.csv)')
+    auto_parser.set_defaults(func=cmd_auto_process)
     
     # Detect command
     detect_parser = subparsers.add_parser('detect', help='Detect exchange format for files')
@@ -390,31 +649,28 @@ Examples:
     detect_parser.add_argument('--output', help='Output file for normalization')
     detect_parser.add_argument('--ml-fallback', action='store_true',
                               help='Use ML mapping instead when detection is low-confidence or unknown')
+    detect_parser.set_defaults(func=cmd_detect)
     
     # List exchanges command
     list_parser = subparsers.add_parser('list-exchanges', help='List supported exchanges')
+    list_parser.set_defaults(func=cmd_list_exchanges)
+    
+    return parser
+
+
+def main():
+    """Main CLI entry point."""
+    parser = _get_parser()
     
     # Parse arguments
     args = parser.parse_args()
     
     # Set up logging
-    setup_logging(args.verbose)
+    setup_logging(args.verbose, args.command)
     
     # Handle commands
-    if args.command == 'normalize':
-        cmd_normalize(args)
-    elif args.command == 'calculate':
-        cmd_calculate(args)
-    elif args.command == 'report':
-        cmd_report(args)
-    elif args.command == 'validate':
-        cmd_validate(args)
-    elif args.command == 'auto-process':
-        cmd_auto_process(args)
-    elif args.command == 'detect':
-        cmd_detect(args)
-    elif args.command == 'list-exchanges':
-        cmd_list_exchanges(args)
+    if getattr(args, 'func', None):
+        args.func(args)
     else:
         parser.print_help()
         sys.exit(1)
@@ -1,10 +1,24 @@
 """Auto-detection module for identifying exchange formats from CSV files."""
 
 import pandas as pd
+import numpy as np
+import codecs
+import copy
+import functools
+import hashlib
+import heapq
+import io
+import itertools
+import json
+import mmap
 import os
-from typing import Dict, List, Tuple, Optional
+import re
+import threading
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, List, Tuple, Optional
 import logging
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 
 import sys
 import os
@@ -12,20 +26,465 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from config import load_exchange_mappings
 
+try:
+    from rapidfuzz import process as rf_process, fuzz as rf_fuzz
+    RAPIDFUZZ_AVAILABLE = True
+except ImportError:
+    RAPIDFUZZ_AVAILABLE = False
+
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+try:
+    import charset_normalizer
+    CHARSET_NORMALIZER_AVAILABLE = True
+except ImportError:
+    CHARSET_NORMALIZER_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# Upper bound on parallel normalization workers; each one may fetch prices
+MAX_PROCESS_WORKERS = 4
+
+# Threads overlap the file reads of a folder scan, but header scoring holds
+# the GIL, so more threads than cores only adds contention
+MAX_SCAN_WORKERS = 8
+
+# Bytes inspected from the start of a CSV to settle its encoding
+HEADER_PROBE_BYTES = 8192
+
+CSV_ENCODINGS = ['utf-8', 'latin-1', 'cp1252', 'iso-8859-1']
+
+# Detection results are reused across runs while a file's stat and leading
+# bytes are unchanged
+DETECT_CACHE_PATH = 'output/.detect_cache.json'
+DETECT_CACHE_PROBE_BYTES = 1024
+# Bump when header scoring changes so cached detections are discarded
+DETECT_CACHE_VERSION = 1
+
+
+def _read_header_probe(file_path: str, size: int = HEADER_PROBE_BYTES) -> bytes:
+    """Map and return the first ``size`` bytes of a file."""
+    with open(file_path, 'rb') as f:
+        length = min(size, os.fstat(f.fileno()).st_size)
+        if not length:
+            return b''
+        with mmap.mmap(f.fileno(), length, access=mmap.ACCESS_READ) as mm:
+            return mm[:length]
+
+
+# Header words of the columns whose sample values _analyze_data_patterns inspects
+SAMPLED_COLUMN_WORDS = ('time', 'date', 'pair', 'market', 'symbol', 'type', 'side')
+
+
+def _read_csv_sample(file_path: str, probe: bytes, encoding: str, 
+                     nrows: int = 10) -> Tuple[List[str], pd.DataFrame]:
+    """
+    Read a CSV's header and sample rows of just the columns that need them.
+    
+    The header is parsed from the already-read probe when it holds the whole
+    first line. Sample rows are then parsed only for the columns data-pattern
+    analysis looks at (or the first column, to tell whether there is data).
+    
+    Returns:
+        Tuple of (all header names, sample DataFrame)
+    """
+    text = codecs.getincrementaldecoder(encoding)().decode(probe, final=False)
+    if '\n' in text or len(probe) < HEADER_PROBE_BYTES:
+        header = pd.read_csv(io.StringIO(text), nrows=0, dtype=str, engine='c').columns
+    else:
+        header = pd.read_csv(file_path, nrows=0, encoding=encoding, dtype=str, engine='c').columns
+    
+    usecols = [i for i, col in enumerate(header) 
+               if isinstance(col, str) and any(word in col.lower() for word in SAMPLED_COLUMN_WORDS)]
+    df = pd.read_csv(file_path, nrows=nrows, encoding=encoding, dtype=str, engine='c', 
+                     on_bad_lines='skip', usecols=usecols or [0])
+    return list(header), df
+
+
+def _read_xlsx_sample(file_path: str, sheet_name: Optional[str] = None, nrows: int = 10) -> pd.DataFrame:
+    """
+    Read the header and first ``nrows`` rows of a worksheet as strings.
+    
+    The workbook is opened read-only and rows are streamed, so only the
+    sample is parsed no matter how large the sheet is.
+    """
+    import openpyxl
+    
+    workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        worksheet = workbook[sheet_name] if sheet_name else workbook.worksheets[0]
+        rows = list(itertools.islice(worksheet.iter_rows(values_only=True), nrows + 1))
+    finally:
+        workbook.close()
+    
+    if not rows:
+        return pd.DataFrame()
+    
+    header = rows[0]
+    return pd.DataFrame([row[:len(header)] for row in rows[1:]], columns=header, dtype=str)
+
+
+def _decodes(probe: bytes, encoding: str) -> bool:
+    """Check whether the probe is valid in an encoding."""
+    try:
+        # Incremental decoding tolerates a character split at the probe boundary
+        codecs.getincrementaldecoder(encoding)().decode(probe, final=False)
+        return True
+    except UnicodeDecodeError:
+        return False
+
+
+def _sniff_encoding(probe: bytes) -> Optional[str]:
+    """
+    Settle a CSV's encoding from its header probe.
+    
+    UTF-8 is accepted whenever the probe is valid UTF-8. Otherwise the
+    charset-normalizer guess is used when installed, falling back to the
+    first of CSV_ENCODINGS that decodes the probe.
+    """
+    if _decodes(probe, CSV_ENCODINGS[0]):
+        return CSV_ENCODINGS[0]
+    
+    if CHARSET_NORMALIZER_AVAILABLE:
+        best = charset_normalizer.from_bytes(probe).best()
+        if best is not None:
+            return best.encoding
+    
+    for encoding in CSV_ENCODINGS[1:]:
+        if _decodes(probe, encoding):
+            return encoding
+    return None
+
+
+# Keyword categories used by fuzzy column matching
+FUZZY_KEYWORDS = {
+    'timestamp': ['time', 'date', 'datetime', 'created', 'timestamp', 'when'],
+    'type': ['type', 'side', 'operation', 'transaction', 'action', 'kind'],
+    'asset': ['asset', 'symbol', 'currency', 'coin', 'pair', 'market', 'instrument', 'token'],
+    'amount': ['amount', 'quantity', 'vol', 'size', 'filled', 'executed', 'volume', 'units'],
+    'price': ['price', 'rate', 'cost', 'value', 'subtotal', 'total'],
+    'fee': ['fee', 'commission', 'spread', 'gas', 'trading'],
+    'total': ['total', 'subtotal', 'value', 'amount'],
+    'id': ['id', 'hash', 'uuid', 'order', 'tx', 'transaction'],
+    'notes': ['notes', 'info', 'specification', 'remark', 'description']
+}
+
+# Critical categories only match when the names share a whole word, which
+# for cleaned (space-free) names means they are equal
+STRICT_KEYWORD_CATEGORIES = ('timestamp', 'type', 'fee')
+
+# Exchange-specific column vocabulary used by fuzzy column matching
+EXCHANGE_COLUMN_PATTERNS = {
+    'binance': ['base', 'quote', 'bnb'],
+    'coinbase': ['transacted', 'spot', 'gdax'],
+    'kraken': ['pair', 'vol', 'ledger', 'xbt', 'xeth'],
+    'gemini': ['usd', 'specification'],
+    'kucoin': ['filled', 'remark'],
+    'bitfinex': ['description', 'bfx'],
+    'okx': ['instrument', 'okex'],
+    'bybit': ['change', 'coin'],
+    'metamask': ['txhash', 'ethereum']
+}
+
+# Keyword groups that make two columns a fuzzy match when both use a word from one
+_FUZZY_GROUPS = [
+    frozenset(keywords) for category, keywords in FUZZY_KEYWORDS.items()
+    if category not in STRICT_KEYWORD_CATEGORIES
+] + [frozenset(keywords) for keywords in EXCHANGE_COLUMN_PATTERNS.values()]
+
+_WORD_PATTERN = re.compile(r'[a-z]+')
+
+
+# Deletion tables for normalizing names in a single pass
+_SEPARATOR_TABLE = str.maketrans('', '', ' _-')
+_CLEAN_TABLE = str.maketrans('', '', ' _-()')
+
+
+@functools.lru_cache(maxsize=4096)
+def _strip_separators(name: str) -> str:
+    """Lower-case a name and strip spaces, underscores and dashes."""
+    return name.lower().translate(_SEPARATOR_TABLE)
+
+
+@functools.lru_cache(maxsize=4096)
+def _clean_column(name: str) -> str:
+    """Lower-case a column name and strip spaces, underscores, dashes and parentheses."""
+    return name.lower().translate(_CLEAN_TABLE)
+
+
+@functools.lru_cache(maxsize=4096)
+def _keyword_groups(name: str) -> int:
+    """Bit mask of the _FUZZY_GROUPS that share a whole word with a column name."""
+    words = frozenset(_WORD_PATTERN.findall(name.lower()))
+    mask = 0
+    for bit, keywords in enumerate(_FUZZY_GROUPS):
+        if not keywords.isdisjoint(words):
+            mask |= 1 << bit
+    return mask
+
+
+def _contains_matrix(expected: List[str], actual: List[str]) -> np.ndarray:
+    """Boolean matrix of whether each expected/actual pair contains the other."""
+    if RAPIDFUZZ_AVAILABLE:
+        # partial_ratio is 100 exactly when the shorter string occurs in the longer
+        scores = rf_process.cdist(expected, actual, scorer=rf_fuzz.partial_ratio,
+                                  score_cutoff=100, dtype=np.uint8)
+        contains = scores > 0
+        # An empty name is contained in everything but scores 0
+        contains |= np.array([not e for e in expected])[:, None]
+        contains |= np.array([not a for a in actual])[None, :]
+        return contains
+    
+    return np.array([[e in a or a in e for a in actual] for e in expected], dtype=bool).reshape(len(expected), len(actual))
+
+
+# Typical column counts of some exchanges' exports; a file whose column count
+# falls in a range earns a small pattern bonus for every such range
+COLUMN_COUNT_PATTERNS = {
+    'binance': (6, 10),
+    'coinbase': (8, 12),
+    'kraken': (6, 9),
+    'gemini': (6, 8),
+    'kucoin': (7, 10)
+}
+
+# Exchanges with fewer of their required columns present than this are
+# ruled out without scoring
+MIN_REQUIRED_RATIO = 0.3
+
+# Score of a signature pattern found exactly as a column, inside one column,
+# across the joined columns, or only partially
+SIGNATURE_TIER_SCORES = (1.0, 0.9, 0.7, 0.4)
+
+# Transaction type values that mark a column as an exchange's type column
+COMMON_TRANSACTION_TYPES = ['buy', 'sell', 'deposit', 'withdraw', 'trade']
+
+# Mapping keys that hold detection metadata rather than column names
+MAPPING_METADATA_KEYS = ('unique_columns', 'signature_patterns', 'required_columns')
+
+
+@dataclass(frozen=True)
+class PreparedMapping:
+    """Per-exchange column data derived once from an exchange mapping."""
+    name: str
+    expected_cols_clean: Tuple[str, ...]
+    expected_weights: Tuple[float, ...]
+    unique_clean: FrozenSet[str]
+    unique_count: int
+    signature_clean: Tuple[str, ...]
+    signature_set: FrozenSet[str]
+    required_clean: Tuple[str, ...]
+    expected_set: FrozenSet[str]
+    max_possible_score: float
+    
+    @classmethod
+    def from_mapping(cls, name: str, mapping: Dict) -> 'PreparedMapping':
+        """Lower-case and index the columns of one exchange mapping."""
+        unique_columns = mapping.get('unique_columns', [])
+        unique_clean = frozenset(unique.lower() for unique in unique_columns)
+        
+        # Expected columns exclude None values, metadata and non-string values (like lists)
+        expected = tuple(
+            value.lower() for key, value in mapping.items()
+            if key not in MAPPING_METADATA_KEYS and value and value != 'None' and isinstance(value, str)
+        )
+        # Unique identifier columns carry double weight
+        weights = tuple(2.0 if col in unique_clean else 1.0 for col in expected)
+        signatures = tuple(_strip_separators(pattern) for pattern in mapping.get('signature_patterns', []))
+        
+        return cls(
+            name=name,
+            expected_cols_clean=expected,
+            expected_weights=weights,
+            unique_clean=unique_clean,
+            unique_count=len(unique_columns),
+            signature_clean=signatures,
+            signature_set=frozenset(signatures),
+            required_clean=tuple(req.lower() for req in mapping.get('required_columns', [])),
+            expected_set=frozenset(expected),
+            max_possible_score=sum(weights)
+        )
+
+
+@dataclass(frozen=True)
+class ColumnView:
+    """Per-file header data computed once and shared by every exchange's score."""
+    raw: Tuple[str, ...]
+    raw_set: FrozenSet[str]
+    clean: Tuple[str, ...]
+    clean_set: FrozenSet[str]
+    joined_raw: str
+    joined_clean: str
+    fuzzy_matches: Tuple[int, ...]
+    signature_tiers: Tuple[FrozenSet[str], ...]
+    type_values: FrozenSet[str]
+    pattern_score: float
+    matched: np.ndarray
+    unique_matched: np.ndarray
+    required_matched: np.ndarray
+
 
 class ExchangeDetector:
     """Detects exchange format by analyzing CSV column headers and patterns."""
     
-    def __init__(self):
-        self.exchange_mappings = load_exchange_mappings()
+    def __init__(self, exchange_mappings: Optional[Dict[str, Dict]] = None, 
+                 cache_path: Optional[str] = DETECT_CACHE_PATH):
+        self.exchange_mappings = exchange_mappings if exchange_mappings is not None else load_exchange_mappings()
         self.confidence_threshold = 0.9  # Raised to 90% for higher accuracy
+        # Stop scoring once an exchange reaches this score (None scores every exchange,
+        # which keeps all_scores complete and ties reported)
+        self.early_exit_threshold: Optional[float] = None
+        
+        # On-disk detection cache, tied to this exact set of mappings (None disables it)
+        self.cache_path = Path(cache_path) if cache_path else None
+        self._cache_lock = threading.Lock()
+        self._cache_dirty = False
+        self._defer_cache_writes = False
+        self._mappings_digest = hashlib.blake2b(
+            json.dumps({name: dict(mapping) for name, mapping in self.exchange_mappings.items()}, 
+                       sort_keys=True, default=str).encode('utf-8'),
+            digest_size=16
+        ).hexdigest()
+        self._detect_cache = self._load_detect_cache()
+        
+        # Exchange names by lower-cased name, so user input is folded once
+        self._exchange_by_lower = {exchange.lower(): exchange for exchange in self.exchange_mappings}
+        
+        # Column structures are derived once here instead of per file and exchange
+        self._prepared = {
+            exchange: PreparedMapping.from_mapping(exchange, mapping)
+            for exchange, mapping in self.exchange_mappings.items()
+        }
+        
+        # Every expected/required column across all exchanges, so each file
+        # needs a single fuzzy-match pass against its columns
+        self._vocab_index: Dict[str, int] = {}
+        for prepared in self._prepared.values():
+            for col in prepared.expected_cols_clean + prepared.required_clean:
+                self._vocab_index.setdefault(col, len(self._vocab_index))
+        self._vocab_clean = [_clean_column(col) for col in self._vocab_index]
+        self._vocab_groups = np.array([_keyword_groups(col) for col in self._vocab_index], dtype=np.int64)
+        
+        # Expected and required columns of every exchange flattened into arrays,
+        # so per-exchange column totals come from a few bincount reductions
+        self._exchange_position = {exchange: i for i, exchange in enumerate(self._prepared)}
+        self._expected_ids: Dict[str, int] = {}
+        expected_owner, expected_id, expected_weight = [], [], []
+        required_owner, required_vocab = [], []
+        for i, prepared in enumerate(self._prepared.values()):
+            for col, weight in zip(prepared.expected_cols_clean, prepared.expected_weights):
+                expected_owner.append(i)
+                expected_id.append(self._expected_ids.setdefault(col, len(self._expected_ids)))
+                expected_weight.append(weight)
+            for req in prepared.required_clean:
+                required_owner.append(i)
+                required_vocab.append(self._vocab_index[req])
+        self._expected_owner = np.array(expected_owner, dtype=np.intp)
+        self._expected_id = np.array(expected_id, dtype=np.intp)
+        self._expected_weight = np.array(expected_weight, dtype=np.float64)
+        self._expected_vocab = np.array([self._vocab_index[col] for col in self._expected_ids], dtype=np.intp)
+        self._required_owner = np.array(required_owner, dtype=np.intp)
+        self._required_vocab = np.array(required_vocab, dtype=np.intp)
+        
+        # Column-count bonus indexed by column count; counts past the end earn nothing
+        self._column_count_bonus: Tuple[float, ...] = tuple(
+            self._count_bonus(count)
+            for count in range(max(high for _, high in COLUMN_COUNT_PATTERNS.values()) + 1)
+        )
+        
+        # All signature patterns go into one automaton so a file's headers are
+        # scanned once rather than once per pattern
+        self._signature_patterns = sorted({
+            pattern for prepared in self._prepared.values() for pattern in prepared.signature_clean
+        })
+        # Only patterns with leftover whitespace can score in the partial tier
+        self._spaced_signatures = [pattern for pattern in self._signature_patterns if pattern.split() != [pattern]]
+        self._signature_automaton = None
+        if AHOCORASICK_AVAILABLE and any(self._signature_patterns):
+            automaton = ahocorasick.Automaton()
+            for pattern in self._signature_patterns:
+                if pattern:
+                    automaton.add_word(pattern, pattern)
+            automaton.make_automaton()
+            self._signature_automaton = automaton
+    
+    def resolve_exchange(self, name: str) -> Optional[str]:
+        """
+        Find a configured exchange by name, ignoring case and surrounding spaces.
+        
+        Args:
+            name: Exchange name as typed by the user
+        
+        Returns:
+            The exchange name as configured, or None if it is not supported
+        """
+        return self._exchange_by_lower.get(name.strip().lower())
+    
+    def _load_detect_cache(self) -> Dict[str, list]:
+        """Load cached detections made with the current scoring and exchange mappings."""
+        if self.cache_path is None:
+            return {}
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if (not isinstance(data, dict) or data.get('version') != DETECT_CACHE_VERSION
+                or data.get('mappings') != self._mappings_digest):
+            return {}
+        return data.get('entries', {})
+    
+    def _save_detect_cache(self) -> None:
+        """Atomically write the detection cache if it changed, dropping entries for deleted files."""
+        if self.cache_path is None:
+            return
+        with self._cache_lock:
+            if not self._cache_dirty:
+                return
+            existing = {}
+            for key in list(self._detect_cache):
+                path = key.split('|', 1)[0]
+                if path not in existing:
+                    existing[path] = os.path.exists(path)
+                if not existing[path]:
+                    del self._detect_cache[key]
+            payload = {'version': DETECT_CACHE_VERSION, 'mappings': self._mappings_digest,
+                       'entries': self._detect_cache}
+            try:
+                self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = self.cache_path.with_name(self.cache_path.name + '.tmp')
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(payload, f)
+                os.replace(tmp_path, self.cache_path)
+                self._cache_dirty = False
+            except (OSError, TypeError, ValueError) as e:
+                logger.warning(f"Failed to write detection cache: {e}")
+    
+    def _detect_cache_prefix(self, file_path: str, sheet_name: Optional[str]) -> str:
+        """Leading part of the cache key shared by every version of a file and sheet."""
+        return f"{os.path.abspath(file_path)}|{sheet_name or ''}|"
+    
+    def _detect_cache_key(self, file_path: str, sheet_name: Optional[str]) -> Optional[str]:
+        """Key a file by path, sheet, mtime, size and a hash of its first bytes."""
+        try:
+            stat = os.stat(file_path)
+            digest = hashlib.blake2b(_read_header_probe(file_path, DETECT_CACHE_PROBE_BYTES), 
+                                     digest_size=8).hexdigest()
+        except OSError:
+            return None
+        return (f"{self._detect_cache_prefix(file_path, sheet_name)}{stat.st_mtime_ns}|{stat.st_size}|{digest}"
+                f"|{self.early_exit_threshold}")
     
     def detect_exchange(self, file_path: str, sheet_name: Optional[str] = None) -> Tuple[str, float, Dict]:
         """
         Detect the most likely exchange format for a given file with enhanced error handling.
         
+        Results are served from the detection cache while the file is unchanged.
+        
         Args:
             file_path: Path to CSV or XLSX file
             sheet_name: Sheet name for XLSX files
@@ -33,6 +492,36 @@ class ExchangeDetector:
         Returns:
             Tuple of (exchange_name, confidence_score, analysis_details)
         """
+        cache_key = self._detect_cache_key(file_path, sheet_name) if self.cache_path else None
+        if cache_key is not None:
+            with self._cache_lock:
+                cached = self._detect_cache.get(cache_key)
+            if cached is not None:
+                exchange, score, details = copy.deepcopy(cached)
+                return exchange, score, details
+        
+        exchange, score, details = self._detect_exchange_uncached(file_path, sheet_name)
+        
+        # Failed reads are not cached so they are retried next time
+        if cache_key is not None and 'error_type' not in details:
+            prefix = self._detect_cache_prefix(file_path, sheet_name)
+            with self._cache_lock:
+                # Entries for earlier versions (mtime, size) of this file can
+                # never match again
+                version = cache_key[len(prefix):].split('|', 2)[:2]
+                stale = [key for key in self._detect_cache
+                         if key.startswith(prefix) and key[len(prefix):].split('|', 2)[:2] != version]
+                for key in stale:
+                    del self._detect_cache[key]
+                self._detect_cache[cache_key] = copy.deepcopy([exchange, score, details])
+                self._cache_dirty = True
+            if not self._defer_cache_writes:
+                self._save_detect_cache()
+        
+        return exchange, score, details
+    
+    def _detect_exchange_uncached(self, file_path: str, sheet_name: Optional[str]) -> Tuple[str, float, Dict]:
+        """Read a file's header sample and score it against every exchange mapping."""
         from exceptions import FileFormatError, DataValidationError, handle_file_error
         
         try:
@@ -46,23 +535,26 @@ class ExchangeDetector:
                 logger.warning(f"Large file detected: {file_size / 1024 / 1024:.1f}MB")
             
             # Read file with enhanced error handling
+            encoding = None
             try:
                 if file_path.endswith('.xlsx'):
-                    df = pd.read_excel(file_path, sheet_name=sheet_name or 0, nrows=10)
+                    df = _read_xlsx_sample(file_path, sheet_name, nrows=10)
+                    header = list(df.columns)
                 elif file_path.endswith('.csv'):
-                    # Try different encodings
-                    encodings = ['utf-8', 'latin-1', 'cp1252', 'iso-8859-1']
-                    df = None
-                    for encoding in encodings:
-                        try:
-                            df = pd.read_csv(file_path, nrows=10, encoding=encoding)
-                            break
-                        except UnicodeDecodeError:
-                            continue
-                    
-                    if df is None:
+                    # Settle the encoding from the header bytes, then parse once
+                    probe = _read_header_probe(file_path)
+                    encoding = _sniff_encoding(probe)
+                    if encoding is None:
                         raise FileFormatError(f"Could not read CSV file with any encoding", 
                                             file_path=file_path, expected_format="UTF-8 CSV")
+                    
+                    # Only headers and raw sample values are inspected, so skip type inference
+                    try:
+                        header, df = _read_csv_sample(file_path, probe, encoding, nrows=10)
+                    except UnicodeDecodeError:
+                        # Sample rows past the probe were not valid in the sniffed encoding
+                        encoding = 'latin-1'
+                        header, df = _read_csv_sample(file_path, probe, encoding, nrows=10)
                 else:
                     raise FileFormatError(f"Unsupported file format: {Path(file_path).suffix}", 
                                         file_path=file_path, expected_format="CSV or XLSX")
@@ -76,30 +568,37 @@ class ExchangeDetector:
                 raise DataValidationError("File is empty or contains no readable data", file_path=file_path)
             
             # Validate columns
-            if len(df.columns) < 3:
-                raise DataValidationError(f"Insufficient columns: {len(df.columns)} (minimum 3 required)", 
+            if len(header) < 3:
+                raise DataValidationError(f"Insufficient columns: {len(header)} (minimum 3 required)", 
                                         file_path=file_path)
             
-            columns = [col.lower().strip() for col in df.columns if col and str(col).strip()]
+            columns = [col.lower().strip() for col in header if col and str(col).strip()]
             
             if not columns:
                 raise DataValidationError("No valid column headers found", file_path=file_path)
             
             # Analyze each exchange mapping with error handling
             scores = {}
-            analysis = {}
             errors = []
+            view = self._column_view(columns, df)
             
-            for exchange, mapping in self.exchange_mappings.items():
+            candidates = self._prepared.items()
+            if self.early_exit_threshold is not None:
+                # Exchanges with most of their required columns present are the likeliest winners
+                candidates = sorted(candidates, 
+                                    key=lambda item: -view.required_matched[self._exchange_position[item[0]]])
+            
+            for exchange, prepared in candidates:
                 try:
-                    score, details = self._calculate_match_score(columns, mapping, df)
-                    scores[exchange] = score
-                    analysis[exchange] = details
+                    scores[exchange] = self._calculate_match_score(view, prepared)
                 except Exception as e:
                     logger.warning(f"Error analyzing {exchange}: {e}")
                     scores[exchange] = 0.0
-                    analysis[exchange] = {"error": str(e)}
                     errors.append(f"{exchange}: {e}")
+                    continue
+                
+                if self.early_exit_threshold is not None and scores[exchange] >= self.early_exit_threshold:
+                    break
             
             if not scores or all(score == 0.0 for score in scores.values()):
                 return "unknown", 0.0, {
@@ -118,10 +617,11 @@ class ExchangeDetector:
             
             result_details = {
                 "all_scores": scores,
-                "analysis": analysis[best_exchange],
+                "analysis": self._match_details(view, self._prepared[best_exchange]),
                 "columns_found": columns,
                 "file_size_mb": file_size / 1024 / 1024,
-                "rows_analyzed": len(df)
+                "rows_analyzed": len(df),
+                "encoding": encoding
             }
             
             if len(ties) > 1:
@@ -140,100 +640,194 @@ class ExchangeDetector:
             logger.error(f"Unexpected error detecting exchange for {file_path}: {e}")
             return "unknown", 0.0, {"error": f"Unexpected error: {e}", "error_type": "UnexpectedError"}
     
-    def _calculate_match_score(self, columns: List[str], mapping: Dict, df: pd.DataFrame) -> Tuple[float, Dict]:
-        """Calculate how well columns match an exchange mapping with enhanced accuracy."""
-        details = {
-            "matched_columns": [],
-            "missing_columns": [],
-            "extra_columns": [],
-            "pattern_matches": [],
-            "unique_matches": [],
-            "signature_matches": []
-        }
+    def _column_view(self, columns: List[str], df: pd.DataFrame) -> ColumnView:
+        """
+        Derive everything about a file's headers that does not depend on the exchange.
         
-        # Get expected columns from mapping (excluding None values and metadata)
-        expected_columns = []
-        unique_columns = mapping.get('unique_columns', [])
-        signature_patterns = mapping.get('signature_patterns', [])
+        Args:
+            columns: Lower-cased column names from the file
+            df: Sample rows from the file (may be empty)
         
-        for key, value in mapping.items():
-            if key not in ['unique_columns', 'signature_patterns', 'required_columns'] and value and value != 'None':
-                if isinstance(value, str):
-                    expected_columns.append(value.lower())
-                # Skip non-string values (like lists)
+        Returns:
+            ColumnView passed to every exchange's match scoring
+        """
+        clean = tuple(_strip_separators(col) for col in columns)
+        joined_raw = ' '.join(columns)
+        joined_clean = ''.join(clean)
+        fuzzy_matches = self._fuzzy_matches(columns)
+        matched, unique_matched, required_matched = self._column_totals(columns, fuzzy_matches)
         
-        # Enhanced column matching with weighted scoring
-        matched = 0
-        unique_matched = 0
-        total_expected = len(expected_columns)
+        # Distinct lower-cased values of the first type column in the sample
+        type_columns = [col for col in df.columns if 'type' in str(col).lower()]
+        type_values = frozenset(
+            df[type_columns[0]].dropna().astype(str).str.lower().unique()
+        ) if type_columns else frozenset()
         
-        for expected_col in expected_columns:
-            match_found = False
-            match_weight = 1.0
-            
-            # Check if this is a unique identifier column (higher weight)
-            if any(expected_col.lower() == unique.lower() for unique in unique_columns):
-                match_weight = 2.0
-            
-            # Direct exact match (highest score)
-            if expected_col in columns:
-                matched += match_weight
-                if match_weight > 1.0:
-                    unique_matched += 1
-                    details["unique_matches"].append(expected_col)
-                details["matched_columns"].append(expected_col)
-                match_found = True
-            else:
-                # Enhanced fuzzy matching
-                for col in columns:
-                    if self._enhanced_fuzzy_match(expected_col, col):
-                        matched += match_weight * 0.9  # Slight penalty for fuzzy match
-                        if match_weight > 1.0:
-                            unique_matched += 0.9
-                            details["unique_matches"].append(f"{expected_col} -> {col}")
-                        details["matched_columns"].append(f"{expected_col} -> {col}")
-                        match_found = True
-                        break
-            
-            if not match_found:
-                details["missing_columns"].append(expected_col)
+        return ColumnView(
+            raw=tuple(columns),
+            raw_set=frozenset(columns),
+            clean=clean,
+            clean_set=frozenset(clean),
+            joined_raw=joined_raw,
+            joined_clean=joined_clean,
+            fuzzy_matches=tuple(fuzzy_matches),
+            signature_tiers=self._signature_tiers(clean, joined_clean, joined_raw),
+            type_values=type_values,
+            pattern_score=self._enhanced_pattern_matching(columns, df),
+            matched=matched,
+            unique_matched=unique_matched,
+            required_matched=required_matched
+        )
+    
+    def _column_totals(self, columns: List[str], 
+                       fuzzy_matches: List[int]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Total the column matches of every exchange at once.
+        
+        An expected column earns its weight on an exact match and 90% of it on
+        a fuzzy match; unique columns also count 1 (exact) or 0.9 (fuzzy)
+        towards the unique total.
+        
+        Args:
+            columns: Lower-cased column names from the file
+            fuzzy_matches: Result of _fuzzy_matches for the same columns
+        
+        Returns:
+            Weighted matches, unique matches and fuzzily present required
+            columns, each indexed by exchange position
+        """
+        exchange_count = len(self._exchange_position)
+        fuzzy_found = np.asarray(fuzzy_matches, dtype=np.intp) >= 0
+        
+        exact = np.zeros(len(self._expected_ids), dtype=bool)
+        for col in columns:
+            expected_id = self._expected_ids.get(col)
+            if expected_id is not None:
+                exact[expected_id] = True
+        fuzzy = fuzzy_found[self._expected_vocab]
+        
+        entry_exact = exact[self._expected_id]
+        entry_fuzzy = fuzzy[self._expected_id] & ~entry_exact
+        weights = self._expected_weight
+        unique = weights > 1.0
+        
+        credit = np.where(entry_exact, weights, np.where(entry_fuzzy, weights * 0.9, 0.0))
+        unique_credit = np.where(unique & entry_exact, 1.0, np.where(unique & entry_fuzzy, 0.9, 0.0))
+        
+        # bincount adds weights in entry order, matching a sequential sum
+        matched = np.bincount(self._expected_owner, weights=credit, minlength=exchange_count)
+        unique_matched = np.bincount(self._expected_owner, weights=unique_credit, minlength=exchange_count)
+        required_matched = np.bincount(self._required_owner, minlength=exchange_count, 
+                                       weights=fuzzy_found[self._required_vocab].astype(np.float64))
+        
+        return matched, unique_matched, required_matched
+    
+    def _fuzzy_matches(self, columns: List[str]) -> List[int]:
+        """
+        Find the first fuzzily matching file column for every known expected column.
+        
+        Args:
+            columns: Lower-cased column names from the file
+        
+        Returns:
+            For each vocabulary entry, the index into ``columns`` of its first
+            fuzzy match, or -1 if none matches
+        """
+        if not columns:
+            return [-1] * len(self._vocab_clean)
+        
+        actual_clean = [_clean_column(col) for col in columns]
+        actual_groups = np.array([_keyword_groups(col) for col in columns], dtype=np.int64)
+        
+        matches = _contains_matrix(self._vocab_clean, actual_clean)
+        matches |= (self._vocab_groups[:, None] & actual_groups[None, :]) != 0
+        
+        return np.where(matches.any(axis=1), matches.argmax(axis=1), -1).tolist()
+    
+    def _find_signatures(self, text: str) -> set:
+        """Return the known signature patterns that occur in text."""
+        if self._signature_automaton is None:
+            return {pattern for pattern in self._signature_patterns if pattern in text}
+        
+        found = {pattern for _, pattern in self._signature_automaton.iter(text)}
+        if '' in self._signature_patterns:
+            found.add('')
+        return found
+    
+    def _signature_tiers(self, clean: Tuple[str, ...], joined_clean: str, 
+                         joined_raw: str) -> Tuple[FrozenSet[str], ...]:
+        """
+        Split the known signature patterns a file matches into disjoint score tiers.
+        
+        Args:
+            clean: Column names from the file with separators stripped
+            joined_clean: The stripped names concatenated
+            joined_raw: The lower-cased names joined with spaces
+        
+        Returns:
+            One frozenset per entry of SIGNATURE_TIER_SCORES
+        """
+        # Exact column name match (highest score)
+        exact = frozenset(clean)
+        # Direct pattern match in any column (high score); patterns never
+        # contain NUL, so a hit in the joined text lies inside one column
+        in_column = frozenset(self._find_signatures('\0'.join(clean)) if clean else ()) - exact
+        # Pattern in combined column text (medium score)
+        in_text = frozenset(self._find_signatures(joined_clean)) - exact - in_column
+        
+        # Partial pattern match (low score)
+        partial = frozenset(
+            pattern for pattern in self._spaced_signatures
+            if pattern not in exact and pattern not in in_column and pattern not in in_text
+            and any(part in joined_raw for part in pattern.split() if len(part) > 2)
+        )
+        
+        return exact, in_column, in_text, partial
+    
+    def _calculate_match_score(self, view: ColumnView, prepared: PreparedMapping) -> float:
+        """Calculate how well columns match an exchange mapping with enhanced accuracy."""
+        position = self._exchange_position[prepared.name]
+        unique_count = prepared.unique_count
+        
+        # Most files lack most exchanges' required columns; those cannot match
+        required_columns = prepared.required_clean
+        if required_columns and view.required_matched[position] < MIN_REQUIRED_RATIO * len(required_columns):
+            return 0.0
+        
+        # Enhanced column matching with weighted scoring
+        matched = float(view.matched[position])
+        unique_matched = float(view.unique_matched[position])
         
         # Base score from column matching (with unique column bonus)
-        max_possible_score = sum(2.0 if any(exp.lower() == unique.lower() for unique in unique_columns) else 1.0 
-                                for exp in expected_columns)
+        max_possible_score = prepared.max_possible_score
         column_score = matched / max_possible_score if max_possible_score > 0 else 0
         
         # Signature pattern matching (very high weight for accuracy)
-        signature_score = self._check_signature_patterns(columns, signature_patterns)
-        details["signature_matches"] = signature_score
+        signature_score = self._check_signature_patterns(view, prepared.signature_set)
         
         # Enhanced pattern-based scoring
-        pattern_score = self._enhanced_pattern_matching(columns, df, mapping)
-        details["pattern_matches"] = pattern_score
+        pattern_score = view.pattern_score
         
         # Unique column bonus (if we match unique identifiers, very high confidence)
-        unique_bonus = min(unique_matched / len(unique_columns), 1.0) if unique_columns else 0
+        unique_bonus = min(unique_matched / unique_count, 1.0) if unique_count else 0
         
         # Balanced weighted combination for accurate detection
         # 35% column matching, 35% signature patterns, 20% unique columns, 10% general patterns
         final_score = (column_score * 0.35) + (signature_score * 0.35) + (unique_bonus * 0.2) + (pattern_score * 0.1)
         
         # Penalty for missing critical unique columns (prevents over-matching)
-        if unique_columns and unique_matched < len(unique_columns) * 0.5:
+        if unique_count and unique_matched < unique_count * 0.5:
             final_score *= 0.7
         
         # Strong boost for perfect unique matches
-        if unique_matched >= len(unique_columns) * 0.9 and unique_columns:
+        if unique_matched >= unique_count * 0.9 and unique_count:
             final_score = min(final_score * 1.3, 1.0)
-        elif unique_matched >= len(unique_columns) * 0.7 and unique_columns:
+        elif unique_matched >= unique_count * 0.7 and unique_count:
             final_score = min(final_score * 1.15, 1.0)
         
         # Additional boost for required columns match
-        required_columns = mapping.get('required_columns', [])
         if required_columns:
-            required_matched = sum(1 for req in required_columns 
-                                 if any(self._enhanced_fuzzy_match(req.lower(), col) for col in columns))
-            required_ratio = required_matched / len(required_columns)
+            required_ratio = float(view.required_matched[position]) / len(required_columns)
             if required_ratio >= 0.9:
                 final_score = min(final_score * 1.2, 1.0)
             elif required_ratio >= 0.7:
@@ -242,106 +836,65 @@ class ExchangeDetector:
                 # Penalty for missing required columns
                 final_score *= 0.8
         
+        return final_score
+    
+    def _match_details(self, view: ColumnView, prepared: PreparedMapping) -> Dict:
+        """Explain which columns and patterns matched an exchange mapping."""
+        columns = view.raw
+        details = {
+            "matched_columns": [],
+            "missing_columns": [],
+            "extra_columns": [],
+            "pattern_matches": view.pattern_score,
+            "unique_matches": [],
+            "signature_matches": self._check_signature_patterns(view, prepared.signature_set)
+        }
+        
+        for expected_col, match_weight in zip(prepared.expected_cols_clean, prepared.expected_weights):
+            # Direct exact match (highest score)
+            if expected_col in view.raw_set:
+                if match_weight > 1.0:
+                    details["unique_matches"].append(expected_col)
+                details["matched_columns"].append(expected_col)
+                continue
+            
+            # Enhanced fuzzy matching
+            match_index = view.fuzzy_matches[self._vocab_index[expected_col]]
+            if match_index >= 0:
+                col = columns[match_index]
+                if match_weight > 1.0:
+                    details["unique_matches"].append(f"{expected_col} -> {col}")
+                details["matched_columns"].append(f"{expected_col} -> {col}")
+            else:
+                details["missing_columns"].append(expected_col)
+        
         # Identify extra columns
-        details["extra_columns"] = [col for col in columns if col not in expected_columns]
+        details["extra_columns"] = [col for col in columns if col not in prepared.expected_set]
         
-        return final_score, details
+        return details
     
     def _enhanced_fuzzy_match(self, expected: str, actual: str) -> bool:
         """Enhanced fuzzy matching with better accuracy."""
-        expected_clean = expected.lower().replace(' ', '').replace('_', '').replace('-', '').replace('(', '').replace(')', '')
-        actual_clean = actual.lower().replace(' ', '').replace('_', '').replace('-', '').replace('(', '').replace(')', '')
-        
-        # Direct exact match
-        if expected_clean == actual_clean:
-            return True
+        expected_clean = _clean_column(expected)
+        actual_clean = _clean_column(actual)
         
-        # Direct contains match (both directions)
+        # Exact or contains match (both directions)
         if expected_clean in actual_clean or actual_clean in expected_clean:
             return True
         
-        # Enhanced keyword matching with exchange-specific terms
-        enhanced_keywords = {
-            'timestamp': ['time', 'date', 'datetime', 'created', 'timestamp', 'when'],
-            'type': ['type', 'side', 'operation', 'transaction', 'action', 'kind'],
-            'asset': ['asset', 'symbol', 'currency', 'coin', 'pair', 'market', 'instrument', 'token'],
-            'amount': ['amount', 'quantity', 'vol', 'size', 'filled', 'executed', 'volume', 'units'],
-            'price': ['price', 'rate', 'cost', 'value', 'subtotal', 'total'],
-            'fee': ['fee', 'commission', 'spread', 'gas', 'trading'],
-            'total': ['total', 'subtotal', 'value', 'amount'],
-            'id': ['id', 'hash', 'uuid', 'order', 'tx', 'transaction'],
-            'notes': ['notes', 'info', 'specification', 'remark', 'description']
-        }
-        
-        # Check if both strings contain keywords from the same category
-        for category, keywords in enhanced_keywords.items():
-            expected_has_keyword = any(keyword in expected_clean for keyword in keywords)
-            actual_has_keyword = any(keyword in actual_clean for keyword in keywords)
-            
-            if expected_has_keyword and actual_has_keyword:
-                # Additional validation for better accuracy
-                if category in ['timestamp', 'type', 'fee']:
-                    # These are critical fields, require stronger match
-                    common_words = set(expected_clean.split()) & set(actual_clean.split())
-                    if len(common_words) > 0:
-                        return True
-                else:
-                    return True
-        
-        # Exchange-specific pattern matching
-        exchange_patterns = {
-            'binance': ['base', 'quote', 'bnb'],
-            'coinbase': ['transacted', 'spot', 'gdax'],
-            'kraken': ['pair', 'vol', 'ledger', 'xbt', 'xeth'],
-            'gemini': ['usd', 'specification'],
-            'kucoin': ['filled', 'remark'],
-            'bitfinex': ['description', 'bfx'],
-            'okx': ['instrument', 'okex'],
-            'bybit': ['change', 'coin'],
-            'metamask': ['txhash', 'ethereum']
-        }
-        
-        for exchange, patterns in exchange_patterns.items():
-            if any(pattern in expected_clean for pattern in patterns) and any(pattern in actual_clean for pattern in patterns):
-                return True
-        
-        return False
+        # Both names use a keyword from the same category or exchange as a word
+        return bool(_keyword_groups(expected) & _keyword_groups(actual))
     
-    def _check_signature_patterns(self, columns: List[str], signature_patterns: List[str]) -> float:
-        """Check for exchange signature patterns with enhanced matching."""
+    def _check_signature_patterns(self, view: ColumnView, signature_patterns: FrozenSet[str]) -> float:
+        """Check for exchange signature patterns (pre-normalized) with enhanced matching."""
         if not signature_patterns:
             return 0.0
         
-        score = 0.0
-        columns_text = ' '.join(columns).lower()
+        # Each tier holds distinct patterns, so the score is a weighted sum of intersection sizes
+        score = sum(tier_score * len(signature_patterns & tier)
+                    for tier_score, tier in zip(SIGNATURE_TIER_SCORES, view.signature_tiers))
         total_patterns = len(signature_patterns)
         
-        for pattern in signature_patterns:
-            pattern_lower = pattern.lower().replace('-', '').replace('_', '').replace(' ', '')
-            
-            # Exact column name match (highest score)
-            exact_match = any(pattern_lower == col.lower().replace('-', '').replace('_', '').replace(' ', '') 
-                            for col in columns)
-            if exact_match:
-                score += 1.0
-                continue
-            
-            # Direct pattern match in any column (high score)
-            if any(pattern_lower in col.lower().replace('-', '').replace('_', '').replace(' ', '') 
-                   for col in columns):
-                score += 0.9
-                continue
-            
-            # Pattern in combined column text (medium score)
-            if pattern_lower in columns_text.replace('-', '').replace('_', '').replace(' ', ''):
-                score += 0.7
-                continue
-            
-            # Partial pattern match (low score)
-            pattern_parts = [part for part in pattern_lower.split() if len(part) > 2]
-            if pattern_parts and any(part in columns_text for part in pattern_parts):
-                score += 0.4
-        
         # Normalize and apply bonus for high match rate
         normalized_score = score / total_patterns
         
@@ -351,31 +904,28 @@ class ExchangeDetector:
         
         return normalized_score
     
-    def _enhanced_pattern_matching(self, columns: List[str], df: pd.DataFrame, mapping: Dict) -> float:
-        """Enhanced pattern matching for exchange identification."""
-        pattern_score = 0.0
-        
+    @staticmethod
+    def _count_bonus(count: int) -> float:
+        """Sum the column-count bonus over every range in COLUMN_COUNT_PATTERNS that holds count."""
+        bonus = 0.0
+        for min_cols, max_cols in COLUMN_COUNT_PATTERNS.values():
+            if min_cols <= count <= max_cols:
+                bonus += 0.1
+        return bonus
+    
+    def _enhanced_pattern_matching(self, columns: List[str], df: pd.DataFrame) -> float:
+        """Enhanced pattern matching for exchange identification (independent of the exchange)."""
         # Column count patterns (exchanges have typical column counts)
-        column_count_patterns = {
-            'binance': (6, 10),
-            'coinbase': (8, 12),
-            'kraken': (6, 9),
-            'gemini': (6, 8),
-            'kucoin': (7, 10)
-        }
-        
-        # Check if column count matches expected range
-        for exchange, (min_cols, max_cols) in column_count_patterns.items():
-            if min_cols <= len(columns) <= max_cols:
-                pattern_score += 0.1
+        count = len(columns)
+        pattern_score = self._column_count_bonus[count] if count < len(self._column_count_bonus) else 0.0
         
         # Data pattern analysis (if we have sample data)
         if not df.empty and len(df) > 0:
-            pattern_score += self._analyze_data_patterns(df, mapping)
+            pattern_score += self._analyze_data_patterns(df)
         
         return min(pattern_score, 1.0)
     
-    def _analyze_data_patterns(self, df: pd.DataFrame, mapping: Dict) -> float:
+    def _analyze_data_patterns(self, df: pd.DataFrame) -> float:
         """Analyze actual data patterns for exchange identification."""
         score = 0.0
         
@@ -386,36 +936,28 @@ class ExchangeDetector:
                 
                 # Check for specific data formats
                 if 'time' in col_lower or 'date' in col_lower:
-                    sample_values = df[col].dropna().head(3)
-                    for val in sample_values:
-                        val_str = str(val).lower()
-                        # ISO format (common in APIs)
-                        if 't' in val_str and ('z' in val_str or '+' in val_str):
-                            score += 0.1
-                        # Unix timestamp
-                        elif val_str.isdigit() and len(val_str) >= 10:
-                            score += 0.1
+                    values = df[col].dropna().head(3).astype(str).str.lower()
+                    # ISO format (common in APIs)
+                    iso = values.str.contains('t', regex=False) & values.str.contains('[z+]')
+                    # Unix timestamp
+                    unix = values.str.isdigit() & (values.str.len() >= 10)
+                    score += 0.1 * int((iso | unix).sum())
                 
                 # Check for trading pair formats
                 if 'pair' in col_lower or 'market' in col_lower or 'symbol' in col_lower:
-                    sample_values = df[col].dropna().head(3)
-                    for val in sample_values:
-                        val_str = str(val).upper()
-                        # Kraken format (XBTUSD, XETHZUSD)
-                        if val_str.startswith('X') and len(val_str) >= 6:
-                            score += 0.2
-                        # Standard pair format (BTC/USD, BTCUSDT)
-                        elif any(sep in val_str for sep in ['/', '-', 'USD', 'BTC', 'ETH']):
-                            score += 0.1
+                    values = df[col].dropna().head(3).astype(str).str.upper()
+                    # Kraken format (XBTUSD, XETHZUSD)
+                    kraken = values.str.startswith('X') & (values.str.len() >= 6)
+                    # Standard pair format (BTC/USD, BTCUSDT)
+                    standard = ~kraken & values.str.contains('/|-|USD|BTC|ETH')
+                    score += 0.2 * int(kraken.sum()) + 0.1 * int(standard.sum())
                 
                 # Check for transaction types
                 if 'type' in col_lower or 'side' in col_lower:
-                    sample_values = df[col].dropna().head(5)
-                    unique_types = set(str(val).lower() for val in sample_values)
+                    values = df[col].dropna().head(5).astype(str).str.lower()
                     
                     # Common exchange types
-                    common_types = {'buy', 'sell', 'deposit', 'withdraw', 'trade'}
-                    if len(unique_types & common_types) >= 2:
+                    if values[values.isin(COMMON_TRANSACTION_TYPES)].nunique() >= 2:
                         score += 0.2
         
         except Exception as e:
@@ -423,37 +965,31 @@ class ExchangeDetector:
         
         return score
     
-    def _check_exchange_patterns(self, columns: List[str], df: pd.DataFrame, mapping: Dict) -> float:
+    def _check_exchange_patterns(self, view: ColumnView, df: pd.DataFrame, mapping: Dict) -> float:
         """Check for exchange-specific patterns in data."""
         pattern_score = 0.0
         
         # Binance patterns
-        if any('binance' in col for col in columns):
+        if 'binance' in view.joined_raw:
             pattern_score += 0.5
         
         # Coinbase patterns
-        if 'spot price currency' in ' '.join(columns):
+        if 'spot price currency' in view.joined_raw:
             pattern_score += 0.4
         
         # Kraken patterns (X/Z prefixes in pairs)
-        if any(col.startswith('x') or col.startswith('z') for col in columns):
+        if any(col.startswith('x') or col.startswith('z') for col in view.raw):
             pattern_score += 0.3
         
-        # Check data patterns if we have sample data
-        if not df.empty:
-            # Look for common transaction types
-            type_columns = [col for col in df.columns if 'type' in col.lower()]
-            if type_columns:
-                type_col = type_columns[0]
-                unique_types = df[type_col].str.lower().unique()
-                
-                # Binance-style types
-                if any(t in ['buy', 'sell', 'deposit', 'withdraw'] for t in unique_types if pd.notna(t)):
-                    pattern_score += 0.2
-                
-                # Coinbase-style types
-                if any(t in ['buy', 'sell', 'receive', 'send'] for t in unique_types if pd.notna(t)):
-                    pattern_score += 0.2
+        # Look for common transaction types in the sample data
+        if view.type_values:
+            # Binance-style types
+            if view.type_values & {'buy', 'sell', 'deposit', 'withdraw'}:
+                pattern_score += 0.2
+            
+            # Coinbase-style types
+            if view.type_values & {'buy', 'sell', 'receive', 'send'}:
+                pattern_score += 0.2
         
         return min(pattern_score, 1.0)  # Cap at 1.0
     
@@ -467,32 +1003,54 @@ class ExchangeDetector:
         Returns:
             List of detection results for each file
         """
-        input_path = Path(input_dir)
-        if not input_path.exists():
+        if not os.path.isdir(input_dir):
             logger.warning(f"Input directory {input_dir} does not exist")
             return []
         
-        results = []
-        supported_extensions = ['.csv', '.xlsx']
+        supported_extensions = ('.csv', '.xlsx')
         
-        for file_path in input_path.iterdir():
-            if file_path.suffix.lower() in supported_extensions:
-                logger.info(f"Analyzing {file_path.name}...")
-                
-                exchange, confidence, details = self.detect_exchange(str(file_path))
-                
-                result = {
-                    'file_path': str(file_path),
-                    'file_name': file_path.name,
-                    'detected_exchange': exchange,
-                    'confidence': confidence,
-                    'details': details,
-                    'needs_confirmation': confidence < self.confidence_threshold
-                }
-                
-                results.append(result)
+        with os.scandir(input_dir) as it:
+            file_paths = sorted(
+                os.path.join(input_dir, entry.name) for entry in it
+                if entry.name.lower().endswith(supported_extensions) and entry.is_file()
+            )
         
-        return results
+        if not file_paths:
+            return []
+        
+        # pandas releases the GIL while parsing, so file reads overlap across threads
+        workers = min(MAX_SCAN_WORKERS, os.cpu_count() or 1, len(file_paths))
+        results = {}
+        # The detection cache is written once for the whole folder
+        self._defer_cache_writes = True
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = {executor.submit(self._scan_file, path): path for path in file_paths}
+                for done, future in enumerate(as_completed(futures), 1):
+                    path = futures[future]
+                    results[path] = future.result()
+                    logger.debug(f"Scanned {done}/{len(file_paths)}: {os.path.basename(path)}")
+        finally:
+            self._defer_cache_writes = False
+            self._save_detect_cache()
+        
+        return [results[path] for path in file_paths]
+    
+    def _scan_file(self, file_path: str) -> Dict:
+        """Detect the exchange for one file found by scan_input_folder."""
+        file_name = os.path.basename(file_path)
+        logger.info(f"Analyzing {file_name}...")
+        
+        exchange, confidence, details = self.detect_exchange(file_path)
+        
+        return {
+            'file_path': file_path,
+            'file_name': file_name,
+            'detected_exchange': exchange,
+            'confidence': confidence,
+            'details': details,
+            'needs_confirmation': confidence < self.confidence_threshold
+        }
     
     def get_exchange_suggestions(self, columns: List[str], top_n: int = 3) -> List[Tuple[str, float]]:
         """
@@ -506,30 +1064,88 @@ class ExchangeDetector:
             List of (exchange_name, confidence_score) tuples
         """
         scores = {}
-        for exchange, mapping in self.exchange_mappings.items():
-            score, _ = self._calculate_match_score(columns, mapping, pd.DataFrame())
-            scores[exchange] = score
-        sorted_exchanges = sorted(scores.items(), key=lambda x: x[1], reverse=True)
-        return sorted_exchanges[:top_n]
+        view = self._column_view(columns, pd.DataFrame())
+        for exchange, prepared in self._prepared.items():
+            scores[exchange] = self._calculate_match_score(view, prepared)
+        # nlargest keeps sorted()'s order for equal scores without sorting every exchange
+        return heapq.nlargest(top_n, scores.items(), key=lambda x: x[1])
+
+
+@functools.lru_cache(maxsize=1)
+def _get_detector() -> ExchangeDetector:
+    """Return a shared detector so mappings are loaded and prepared only once."""
+    return ExchangeDetector()
+
+
+def _process_one(file_path: str, exchange: str, output_dir: str, 
+                 encoding: Optional[str] = None) -> Dict:
+    """
+    Normalize a single detected file. Runs in a worker process.
+    
+    Args:
+        file_path: Path to the input file
+        exchange: Exchange format to normalize with
+        output_dir: Directory for output files
+        encoding: CSV encoding settled during detection, if known
+    
+    Returns:
+        Processing result for the file
+    """
+    from normalize import normalize_csv
+    
+    # Generate output filename
+    base_name = Path(file_path).stem
+    output_file = os.path.join(output_dir, f"{base_name}_normalized.csv")
+    
+    try:
+        normalize_csv(
+            input_file=file_path,
+            exchange=exchange,
+            output_file=output_file,
+            fetch_missing_prices=True,
+            remove_duplicates=True,
+            encoding=encoding
+        )
+        
+        return {
+            'input_file': file_path,
+            'output_file': output_file,
+            'exchange_used': exchange,
+            'status': 'success'
+        }
+    
+    except Exception as e:
+        return {
+            'input_file': file_path,
+            'exchange_used': exchange,
+            'status': 'error',
+            'error': str(e)
+        }
 
 
 def auto_process_input_folder(input_dir: str = "input", 
                             output_dir: str = "output",
                             interactive: bool = True,
-                            ml_fallback: bool = False) -> List[Dict]:
+                            ml_fallback: bool = False,
+                            max_workers: Optional[int] = None) -> List[Dict]:
     """
     Automatically process all files in input folder with exchange detection.
     
+    Exchange confirmation runs serially up front; the normalization of each
+    file is independent and is then spread over a process pool.
+    
     Args:
         input_dir: Directory containing input files
         output_dir: Directory for output files
         interactive: Whether to ask for user confirmation
         ml_fallback: Whether to use ML mapping when detection is low confidence or unknown
+        max_workers: Worker process limit (default: CPU count, capped at
+            MAX_PROCESS_WORKERS to stay inside CoinGecko rate limits)
         
     Returns:
         List of processing results
     """
-    detector = ExchangeDetector()
+    detector = _get_detector()
     results = []
     
     # Scan input folder
@@ -541,6 +1157,7 @@ def auto_process_input_folder(input_dir: str = "input",
     
     print(f"\nFound {len(detections)} files to process:\n")
     
+    jobs = []
     for detection in detections:
         file_name = detection['file_name']
         detected_exchange = detection['detected_exchange']
@@ -571,59 +1188,64 @@ def auto_process_input_folder(input_dir: str = "input",
             user_input = input(f"   Confirm exchange (press Enter for '{detected_exchange}' or type correct exchange): ").strip()
             
             if user_input:
-                if user_input.lower() in detector.exchange_mappings:
-                    confirmed_exchange = user_input.lower()
+                resolved = detector.resolve_exchange(user_input)
+                if resolved:
+                    confirmed_exchange = resolved
                     print(f"   Using: {confirmed_exchange}")
                 else:
                     print(f"   Unknown exchange '{user_input}'. Using detected: {detected_exchange}")
             else:
                 print(f"   Using detected: {detected_exchange}")
         
-        # Process the file
-        try:
-            from normalize import normalize_csv
-            
-            # Generate output filename
-            base_name = Path(file_name).stem
-            output_file = os.path.join(output_dir, f"{base_name}_normalized.csv")
-            
-            print(f"   Processing with {confirmed_exchange} format...")
-            
-            normalize_csv(
-                input_file=detection['file_path'],
-                exchange=confirmed_exchange,
-                output_file=output_file,
-                fetch_missing_prices=True,
-                remove_duplicates=True
-            )
-            
-            result = {
-                'input_file': detection['file_path'],
-                'output_file': output_file,
-                'exchange_used': confirmed_exchange,
-                'detection_confidence': confidence,
-                'status': 'success'
-            }
-            
-            print(f"   Normalized to: {output_file}")
-            
-        except Exception as e:
-            result = {
-                'input_file': detection['file_path'],
-                'exchange_used': confirmed_exchange,
-                'detection_confidence': confidence,
-                'status': 'error',
-                'error': str(e)
-            }
-            
-            print(f"   Error: {e}")
-        
-        results.append(result)
+        print(f"   Processing with {confirmed_exchange} format...")
         print()  # Empty line for readability
+        jobs.append((detection['file_path'], confirmed_exchange, confidence, 
+                     detection['details'].get('encoding')))
+    
+    # Process the files
+    workers = min(max_workers or os.cpu_count() or 1, MAX_PROCESS_WORKERS, len(jobs))
+    results = [None] * len(jobs)
+    
+    if workers <= 1:
+        for i, (path, exchange, _, encoding) in enumerate(jobs):
+            results[i] = _process_one(path, exchange, output_dir, encoding)
+            _report_processed(results[i])
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(_process_one, path, exchange, output_dir, encoding): i
+                for i, (path, exchange, _, encoding) in enumerate(jobs)
+            }
+            for future in as_completed(futures):
+                i = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    path, exchange, _, _ = jobs[i]
+                    result = {
+                        'input_file': path,
+                        'exchange_used': exchange,
+                        'status': 'error',
+                        'error': str(e)
+                    }
+                results[i] = result
+                _report_processed(result)
+    
+    for result, (_, _, confidence, _) in zip(results, jobs):
+        result['detection_confidence'] = confidence
     
     return results
 
 
+def _report_processed(result: Dict) -> None:
+    """Print the outcome of one processed file."""
+    name = Path(result['input_file']).name
+    if result['status'] == 'success':
+        print(f"{name}: normalized to {result['output_file']}")
+    else:
+        print(f"{name}: Error: {result['error']}")
+
+
 def interactive_exchange_selection(file_path: str) -> str:
     """
     Interactive exchange selection for a specific file.
@@ -634,7 +1256,7 @@ def interactive_exchange_selection(file_path: str) -> str:
     Returns:
         Selected exchange name
     """
-    detector = ExchangeDetector()
+    detector = _get_detector()
     
     # Detect exchange
     exchange, confidence, details = detector.detect_exchange(file_path)
@@ -669,8 +1291,9 @@ def interactive_exchange_selection(file_path: str) -> str:
             return exchange
         elif choice == '2':
             new_exchange = input("Enter exchange name: ").strip().lower()
-            if new_exchange in detector.exchange_mappings:
-                return new_exchange
+            resolved = detector.resolve_exchange(new_exchange)
+            if resolved:
+                return resolved
             else:
                 print(f"Unknown exchange: {new_exchange}")
                 return exchange
@@ -680,15 +1303,17 @@ def interactive_exchange_selection(file_path: str) -> str:
                 print(f"   {i:2d}. {exch}")
             
             selected = input("\nEnter exchange name: ").strip().lower()
-            if selected in detector.exchange_mappings:
-                return selected
+            resolved = detector.resolve_exchange(selected)
+            if resolved:
+                return resolved
             else:
                 print(f"Unknown exchange: {selected}")
                 return exchange
         else:
             # Try to use the input as exchange name
-            if choice.lower() in detector.exchange_mappings:
-                return choice.lower()
+            resolved = detector.resolve_exchange(choice)
+            if resolved:
+                return resolved
             else:
                 print(f"Unknown option: {choice}")
                 return exchange
@@ -3,33 +3,71 @@ Fully Automated Crypto Tax Processor
 One-click solution that rivals paid services like Koinly and CoinMarketCap
 """
 
+import importlib
 import os
 import sys
-import pandas as pd
+import time
 import logging
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional, Tuple
 import json
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 # Add app to path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from auto_detect import ExchangeDetector
-from normalize import normalize_csv
-from calculate import calculate_taxes
-from report import generate_all_reports
-from portfolio_tracker import PortfolioTracker
-from price_fetch import fetch_price
 from config import load_exchange_mappings
 
 logger = logging.getLogger(__name__)
 
+# pandas and the pipeline modules built on it load on first use, so importing
+# this module (e.g. from the web apps) stays cheap. Maps name -> (module, attribute).
+_LAZY_IMPORTS = {
+    'pd': ('pandas', None),
+    'np': ('numpy', None),
+    'ExchangeDetector': ('auto_detect', 'ExchangeDetector'),
+    'MAX_PROCESS_WORKERS': ('auto_detect', 'MAX_PROCESS_WORKERS'),
+    'normalize_csv': ('normalize', 'normalize_csv'),
+    'calculate_taxes': ('calculate', 'calculate_taxes'),
+    'generate_all_reports': ('report', 'generate_all_reports'),
+    'PortfolioTracker': ('portfolio_tracker', 'PortfolioTracker'),
+}
+
+
+def __getattr__(name: str):
+    """Import a lazily loaded name on first access and keep it as a module global."""
+    if name not in _LAZY_IMPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    module_name, attr = _LAZY_IMPORTS[name]
+    module = importlib.import_module(module_name)
+    value = getattr(module, attr) if attr else module
+    globals()[name] = value
+    return value
+
+
+def _lazy(name: str):
+    """Look up a lazily loaded name from inside this module."""
+    if name in globals():
+        return globals()[name]
+    return __getattr__(name)
+
+
+# Columns PortfolioTracker reads from the combined transactions
+PORTFOLIO_COLUMNS = ['timestamp', 'type', 'base_asset', 'base_amount', 'quote_asset', 'quote_amount']
+
 class AutoTaxProcessor:
     """Fully automated crypto tax processor - one-click solution."""
     
     def __init__(self):
-        self.detector = ExchangeDetector()
+        self.detector = _lazy('ExchangeDetector')()
         self.exchange_mappings = load_exchange_mappings()
         self.processing_log = []
         
@@ -57,19 +95,21 @@ class AutoTaxProcessor:
             
             # Step 2: Combine all normalized files
             self._log("Combining transaction data...")
-            combined_file = self._combine_normalized_files(processed_files, output_dir)
+            combined_df = self._combine_normalized_files(processed_files, output_dir)
             
             # Step 3: Auto-determine best tax method
             self._log("Analyzing transactions for optimal tax method...")
-            recommended_method = self._recommend_tax_method(combined_file)
+            recommended_method = self._recommend_tax_method(combined_df)
             
-            # Step 4: Calculate taxes with recommended method
+            # Steps 4-5: Calculate taxes with the recommended method and analyze
+            # the portfolio; both only read combined_df, so they run side by side
             self._log(f"Calculating taxes using {recommended_method.upper()} method...")
-            tax_results = self._calculate_taxes_auto(combined_file, recommended_method)
-            
-            # Step 5: Generate comprehensive portfolio analysis
             self._log("Analyzing portfolio performance...")
-            portfolio_analysis = self._analyze_portfolio(combined_file)
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                tax_future = executor.submit(self._calculate_taxes_auto, combined_df, recommended_method)
+                portfolio_future = executor.submit(self._analyze_portfolio, combined_df)
+                tax_results = tax_future.result()
+                portfolio_analysis = portfolio_future.result()
             
             # Step 6: Generate all reports automatically
             self._log("Generating tax reports...")
@@ -90,7 +130,7 @@ class AutoTaxProcessor:
                 "portfolio_analysis": portfolio_analysis,
                 "reports": reports,
                 "dashboard": dashboard,
-                "processing_log": self.processing_log,
+                "processing_log": self._format_log(),
                 "next_steps": self._get_next_steps(reports)
             }
             
@@ -107,13 +147,16 @@ class AutoTaxProcessor:
         if not input_path.exists():
             raise FileNotFoundError(f"Input directory {input_dir} not found")
         
-        files = list(input_path.glob("*.csv")) + list(input_path.glob("*.xlsx"))
+        # One directory pass; sorted so files are processed in a stable order
+        files = sorted(p for p in input_path.iterdir() if p.suffix.lower() in ('.csv', '.xlsx'))
         
         if not files:
             return processed_files
         
         self._log(f"Found {len(files)} files to process")
         
+        # Detect every file's exchange first; detection shares self.detector
+        jobs = []
         for file_path in files:
             try:
                 # Auto-detect exchange
@@ -127,104 +170,122 @@ class AutoTaxProcessor:
                         exchange = suggestions[0][0]
                         self._log(f"Using best match: {exchange}")
                 
-                # Normalize file
                 output_file = os.path.join(output_dir, f"{file_path.stem}_normalized.csv")
-                
-                normalize_csv(
-                    input_file=str(file_path),
-                    exchange=exchange,
-                    output_file=output_file,
-                    fetch_missing_prices=True,
-                    remove_duplicates=True
-                )
-                
-                processed_files.append({
-                    "original_file": str(file_path),
-                    "normalized_file": output_file,
-                    "exchange": exchange,
-                    "confidence": confidence,
-                    "rows": len(pd.read_csv(output_file))
-                })
-                
-                self._log(f"Processed {file_path.name} as {exchange} ({confidence:.1%})")
+                jobs.append((file_path, exchange, confidence, output_file))
                 
             except Exception as e:
                 self._log(f"Failed to process {file_path.name}: {e}")
                 continue
         
+        # Normalize files independently, spread over a process pool (capped
+        # like auto_process_input_folder to stay inside price API rate limits)
+        workers = min(os.cpu_count() or 1, _lazy('MAX_PROCESS_WORKERS'), len(jobs))
+        outcomes = []
+        if workers <= 1:
+            for file_path, exchange, _, output_file in jobs:
+                try:
+                    outcomes.append(_normalize_one(str(file_path), exchange, output_file))
+                except Exception as e:
+                    outcomes.append(e)
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = [executor.submit(_normalize_one, str(file_path), exchange, output_file)
+                           for file_path, exchange, _, output_file in jobs]
+                for future in futures:
+                    try:
+                        outcomes.append(future.result())
+                    except Exception as e:
+                        outcomes.append(e)
+        
+        # Log from this process, in file order
+        for (file_path, exchange, confidence, output_file), outcome in zip(jobs, outcomes):
+            if isinstance(outcome, Exception):
+                self._log(f"Failed to process {file_path.name}: {outcome}")
+                continue
+            
+            processed_files.append({
+                "original_file": str(file_path),
+                "normalized_file": output_file,
+                "exchange": exchange,
+                "confidence": confidence,
+                "rows": len(outcome),
+                "df": outcome
+            })
+            
+            self._log(f"Processed {file_path.name} as {exchange} ({confidence:.1%})")
+        
         return processed_files
     
-    def _combine_normalized_files(self, processed_files: List[Dict], output_dir: str) -> str:
-        """Combine all normalized files into one master file."""
-        if len(processed_files) == 1:
-            return processed_files[0]["normalized_file"]
+    def _combine_normalized_files(self, processed_files: List[Dict], output_dir: str) -> 'pd.DataFrame':
+        """Combine all normalized data into one master frame, saving it as one master file."""
+        pd, np = _lazy('pd'), _lazy('np')
         
-        # Load all normalized files
-        dataframes = []
-        for file_info in processed_files:
-            df = pd.read_csv(file_info["normalized_file"])
-            df['source_file'] = Path(file_info["original_file"]).name
-            df['source_exchange'] = file_info["exchange"]
-            dataframes.append(df)
+        # Timestamps are parsed here, once; later stages get datetime64 values.
+        # A few dozen tickers repeat across all rows, so assets are categorical.
+        if len(processed_files) == 1:
+            df = processed_files[0]["df"]
+            return df.assign(timestamp=pd.to_datetime(df['timestamp'], format='ISO8601'),
+                             base_asset=df['base_asset'].astype('category'))
         
-        # Combine and sort by timestamp
+        # Combine, then tag every row with its source in one pass per column
+        dataframes = [file_info["df"] for file_info in processed_files]
         combined_df = pd.concat(dataframes, ignore_index=True)
-        combined_df['timestamp'] = pd.to_datetime(combined_df['timestamp'])
-        combined_df = combined_df.sort_values('timestamp')
-        
-        # Save combined file
+        lengths = [len(df) for df in dataframes]
+        combined_df['source_file'] = np.repeat(
+            [Path(file_info["original_file"]).name for file_info in processed_files], lengths)
+        combined_df['source_exchange'] = np.repeat(
+            [file_info["exchange"] for file_info in processed_files], lengths)
+        
+        # Sort by timestamp. Each frame arrives sorted from normalize_csv, so a
+        # stable sort merges the runs and keeps same-time rows in file order.
+        combined_df['timestamp'] = pd.to_datetime(combined_df['timestamp'], format='ISO8601')
+        combined_df['base_asset'] = combined_df['base_asset'].astype('category')
+        combined_df = combined_df.sort_values('timestamp', kind='mergesort', ignore_index=True)
+        
+        # Save combined file (a one-off export; later stages use combined_df).
+        # pandas' writer keeps the file's plain quoting and timestamp format.
         combined_file = os.path.join(output_dir, "combined_transactions.csv")
         combined_df.to_csv(combined_file, index=False)
         
         self._log(f"Combined {len(processed_files)} files into {len(combined_df)} transactions")
         
-        return combined_file
+        return combined_df
     
-    def _recommend_tax_method(self, combined_file: str) -> str:
-        """Intelligently recommend the best tax method based on transaction patterns."""
-        df = pd.read_csv(combined_file)
-        
-        # Analyze transaction patterns
-        total_transactions = len(df)
-        unique_assets = df['base_asset'].nunique()
-        date_range = (pd.to_datetime(df['timestamp']).max() - pd.to_datetime(df['timestamp']).min()).days
-        
-        # Check for specific patterns
-        has_frequent_trading = total_transactions > 100
-        has_many_assets = unique_assets > 10
-        has_long_holdings = date_range > 365
-        
-        # Check for DeFi/Complex transactions
-        has_defi = any(keyword in ' '.join(df['notes'].fillna('').str.lower()) 
-                      for keyword in ['uniswap', 'pancakeswap', 'curve', 'aave', 'compound'])
-        
-        # Recommendation logic
-        if has_defi and has_frequent_trading:
-            return "fifo"  # FIFO is most common and accepted
-        elif has_long_holdings and not has_frequent_trading:
-            return "fifo"  # FIFO for long-term investors
-        elif has_frequent_trading and has_many_assets:
-            return "fifo"  # FIFO for complex portfolios
-        else:
-            return "fifo"  # Default to FIFO (most widely accepted)
+    def _recommend_tax_method(self, df: 'pd.DataFrame') -> str:
+        """
+        Recommend the tax method for the combined transactions.
+        
+        FIFO is the most widely accepted method and is recommended for every
+        transaction pattern (DeFi activity, frequent trading, many assets or
+        long holdings alike), so the transactions need not be scanned.
+        """
+        return "fifo"
     
-    def _calculate_taxes_auto(self, combined_file: str, method: str) -> Dict[str, Any]:
+    def _calculate_taxes_auto(self, df: 'pd.DataFrame', method: str) -> Dict[str, Any]:
         """Calculate taxes with automatic optimization."""
-        gains_df, total_income = calculate_taxes(combined_file, method)
+        gains_df, total_income = _lazy('calculate_taxes')(df, method)
         
         # Calculate summary statistics
         if not gains_df.empty:
-            short_term_gains = gains_df[gains_df['short_term']]['gain_loss'].sum()
-            long_term_gains = gains_df[~gains_df['short_term']]['gain_loss'].sum()
+            # One pass over gain_loss for both holding periods
+            sums = gains_df.groupby('short_term', sort=False)['gain_loss'].sum()
+            short_term_gains = sums.get(True, 0.0)
+            long_term_gains = sums.get(False, 0.0)
             total_gains = short_term_gains + long_term_gains
             
             # Calculate tax implications (simplified)
             short_term_tax = short_term_gains * 0.22  # Assume 22% tax rate
             long_term_tax = long_term_gains * 0.15    # Assume 15% tax rate
             total_tax = short_term_tax + long_term_tax
+            
+            # Render timestamp columns as text in one vectorized pass, so the
+            # JSON writers never fall back to str() value by value
+            datetime_columns = gains_df.select_dtypes(include=['datetime', 'datetimetz']).columns
+            gains_data = gains_df.astype({col: str for col in datetime_columns}).to_dict('list')
         else:
             short_term_gains = long_term_gains = total_gains = 0
             short_term_tax = long_term_tax = total_tax = 0
+            gains_data = {}
         
         return {
             "method_used": method,
@@ -234,15 +295,16 @@ class AutoTaxProcessor:
             "total_gains": float(total_gains),
             "total_income": float(total_income),
             "estimated_tax": float(total_tax),
-            "gains_data": gains_df.to_dict('records') if not gains_df.empty else []
+            # Column-oriented: one list per column rather than one dict per row
+            "gains_data": gains_data
         }
     
-    def _analyze_portfolio(self, combined_file: str) -> Dict[str, Any]:
+    def _analyze_portfolio(self, df: 'pd.DataFrame') -> Dict[str, Any]:
         """Generate comprehensive portfolio analysis."""
         try:
-            df = pd.read_csv(combined_file)
-            tracker = PortfolioTracker()
-            tracker.load_transactions(df)
+            tracker = _lazy('PortfolioTracker')()
+            # The tracker copies and walks the frame row by row; keep it narrow
+            tracker.load_transactions(df[PORTFOLIO_COLUMNS])
             
             # Get portfolio summary
             summary = tracker.get_portfolio_summary()
@@ -274,14 +336,13 @@ class AutoTaxProcessor:
         
         try:
             # Generate all tax software formats
-            all_reports = generate_all_reports()
+            all_reports = _lazy('generate_all_reports')()
             reports.update(all_reports)
             
             # Generate portfolio report
             if 'error' not in portfolio_analysis:
                 portfolio_file = "data/output/reports/portfolio_analysis.json"
-                with open(portfolio_file, 'w') as f:
-                    json.dump(portfolio_analysis, f, indent=2, default=str)
+                _write_json(portfolio_file, portfolio_analysis)
                 reports['portfolio_analysis'] = portfolio_file
             
             # Generate summary report
@@ -306,8 +367,7 @@ class AutoTaxProcessor:
             "next_year_planning": self._get_next_year_planning(tax_results, portfolio_analysis)
         }
         
-        with open(summary_file, 'w') as f:
-            json.dump(summary, f, indent=2, default=str)
+        _write_json(summary_file, summary)
         
         return summary_file
     
@@ -368,22 +428,48 @@ class AutoTaxProcessor:
         return steps
     
     def _log(self, message: str):
-        """Add message to processing log."""
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        log_entry = f"[{timestamp}] {message}"
-        self.processing_log.append(log_entry)
+        """Add message to processing log; entries are formatted only for the result."""
+        self.processing_log.append((time.time(), message))
         logger.info(message)
     
+    def _format_log(self) -> List[str]:
+        """Render the processing log as "[HH:MM:SS] message" lines."""
+        return [f"[{time.strftime('%H:%M:%S', time.localtime(logged_at))}] {message}" 
+                for logged_at, message in self.processing_log]
+    
     def _create_error_result(self, error_message: str) -> Dict[str, Any]:
         """Create error result."""
         return {
             "success": False,
             "error": error_message,
-            "processing_log": self.processing_log,
+            "processing_log": self._format_log(),
             "next_steps": ["Please check the error message above and try again"]
         }
 
 
+def _write_json(path: str, data: Any) -> None:
+    """Write data as indented JSON, using orjson's C serializer when it is installed."""
+    if ORJSON_AVAILABLE:
+        # Same leniency as json.dump(default=str); numpy values serialize natively
+        options = orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(data, default=str, option=options))
+    else:
+        with open(path, 'w') as f:
+            json.dump(data, f, indent=2, default=str)
+
+
+def _normalize_one(file_path: str, exchange: str, output_file: str) -> 'pd.DataFrame':
+    """Normalize a single detected file. Runs in a worker process."""
+    return _lazy('normalize_csv')(
+        input_file=file_path,
+        exchange=exchange,
+        output_file=output_file,
+        fetch_missing_prices=True,
+        remove_duplicates=True
+    )
+
+
 def process_crypto_taxes(input_dir: str = "data/input", output_dir: str = "data/output") -> Dict[str, Any]:
     """
     One-click crypto tax processing - the main function users call.
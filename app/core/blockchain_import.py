@@ -1,25 +1,280 @@
 """
 Blockchain data import module for direct blockchain transaction fetching.
 Supports Ethereum, Bitcoin, and other major blockchains.
+
+All times are UTC: imported timestamps are naive UTC datetimes, and naive
+start/end dates are read as UTC rather than local time.
 """
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import numpy as np
 import pandas as pd
 import logging
 from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict
+import calendar
+import os
+import sys
+import threading
 import time
 import json
 
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from exceptions import APIError
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# Transient HTTP statuses retried by the session adapter
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+ETHERSCAN_API_URL = "https://api.etherscan.io/api"
+BSCSCAN_API_URL = "https://api.bscscan.com/api"
+POLYGONSCAN_API_URL = "https://api.polygonscan.com/api"
+BLOCKCHAIN_INFO_URL = "https://blockchain.info/rawaddr"
+
+# Records an Etherscan-compatible explorer serves per query (page x offset)
+SCAN_RESULT_WINDOW = 10000
+
+# Explorers report "Max rate limit reached" as HTTP 200 with status '0', which
+# the session adapter cannot see; such replies are retried with exponential
+# backoff starting at SCAN_RATE_LIMIT_BACKOFF seconds
+SCAN_RATE_LIMIT_RETRIES = 5
+SCAN_RATE_LIMIT_BACKOFF = 1.0
+
+# Transactions per rawaddr request (blockchain.info's maximum)
+BTC_PAGE_SIZE = 50
+
+# (address, tx hash) entries kept in the Bitcoin totals LRU cache
+BTC_CACHE_SIZE = 200_000
+
+# Per-address (input, output) satoshi totals of confirmed Bitcoin
+# transactions, shared by every importer in the process; confirmed
+# transactions never change, so their totals can be reused
+_btc_cache: 'OrderedDict[Tuple[str, str], Tuple[float, float]]' = OrderedDict()
+_btc_cache_lock = threading.Lock()
+
+# Etherscan-compatible chains: explorer endpoint, account actions listed,
+# native asset and the types used for zero-value transfers (None keeps
+# plain sell/buy)
+EVM_CHAINS = {
+    'ethereum': {
+        'url': ETHERSCAN_API_URL,
+        'explorer': 'Etherscan',
+        'asset': 'ETH',
+        'label': 'Ethereum',
+        'actions': ('txlist', 'txlistinternal'),
+        'zero_value_types': ('transfer', 'receive')
+    },
+    'bsc': {
+        'url': BSCSCAN_API_URL,
+        'explorer': 'BSCScan',
+        'asset': 'BNB',
+        'label': 'BSC',
+        'actions': ('txlist',),
+        'zero_value_types': None
+    },
+    'polygon': {
+        'url': POLYGONSCAN_API_URL,
+        'explorer': 'PolygonScan',
+        'asset': 'MATIC',
+        'label': 'Polygon',
+        'actions': ('txlist',),
+        'zero_value_types': None
+    }
+}
+
+# Full block range queried when no date bound applies
+FIRST_BLOCK = 0
+LAST_BLOCK = 99999999
+
+# Output columns, in the order processors emit row values
+TRANSACTION_COLUMNS = [
+    'timestamp', 'type', 'base_asset', 'base_amount', 'quote_asset',
+    'quote_amount', 'fee_amount', 'fee_asset', 'notes'
+]
+
+# Chunk dtypes; timestamps stay Unix seconds until the frame is built
+COLUMN_DTYPES = {
+    'timestamp': np.int64,
+    'base_amount': np.float64,
+    'quote_amount': np.float64,
+    'fee_amount': np.float64
+}
+
+
+def _new_columns() -> Dict[str, List[np.ndarray]]:
+    """Create empty per-column chunk lists for imported transactions."""
+    return {col: [] for col in TRANSACTION_COLUMNS}
+
+
+def _append_chunk(columns: Dict[str, List[np.ndarray]], chunk: Dict[str, Any]) -> None:
+    """Append one block of column values, such as a result page, to the chunk lists."""
+    for col, chunks in columns.items():
+        chunks.append(np.asarray(chunk[col], dtype=COLUMN_DTYPES.get(col, object)))
+
+
+def _columns_to_frame(columns: Dict[str, List[np.ndarray]]) -> pd.DataFrame:
+    """
+    Build the output DataFrame by concatenating the column chunks.
+    
+    Unix-second timestamps become naive UTC datetimes, not local time.
+    """
+    if not any(len(chunk) for chunk in columns['timestamp']):
+        return pd.DataFrame()
+    data = {col: np.concatenate(chunks) for col, chunks in columns.items()}
+    data['timestamp'] = pd.to_datetime(data['timestamp'], unit='s')
+    # The concatenated arrays are already typed and owned here, so skip pandas' defensive copy
+    return pd.DataFrame(data, copy=False)
+
+
+def _address_totals(n: int, entries: List[Tuple[int, Any, Any]], address: str) -> np.ndarray:
+    """
+    Sum the values of the entries belonging to an address, per transaction.
+    
+    Args:
+        n: Number of transactions
+        entries: (transaction index, address, value) for every input or output
+        address: Address whose entries are summed
+    
+    Returns:
+        Float64 array of length n with the summed values
+    """
+    if not entries:
+        return np.zeros(n)
+    tx_index, addrs, values = zip(*entries)
+    mine = np.array(addrs, dtype=object) == address
+    return np.bincount(np.array(tx_index, dtype=np.int64)[mine],
+                       weights=np.array(values, dtype=np.float64)[mine], minlength=n)
+
+
+def _unix_seconds(date: datetime) -> int:
+    """Convert a datetime to Unix seconds, treating naive values as UTC."""
+    return calendar.timegm(date.utctimetuple())
+
+
+def _decode_json(response: requests.Response) -> Any:
+    """Decode an API response body, using orjson's C parser when it is installed."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(response.content)
+    return response.json()
+
+
+class TokenBucket:
+    """Thread-safe token bucket pacing API requests."""
+    
+    def __init__(self, rate: float, burst: int = 1):
+        """
+        Args:
+            rate: Tokens added per second
+            burst: Maximum number of tokens that can accumulate
+        """
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self) -> None:
+        """Take one token, sleeping until it is available."""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            # Reserve the token now so concurrent callers queue behind each other
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        if wait:
+            time.sleep(wait)
+    
+    def update_from_headers(self, headers: Any) -> None:
+        """
+        Re-pace the bucket from X-RateLimit-Remaining/-Reset response headers.
+        
+        The remaining quota is spread over the time left until the reset, so
+        generous tiers speed up and an exhausted quota waits for the reset.
+        Responses without these headers leave the bucket unchanged.
+        """
+        remaining = headers.get('X-RateLimit-Remaining')
+        reset = headers.get('X-RateLimit-Reset')
+        if remaining is None or reset is None:
+            return
+        try:
+            remaining = int(float(remaining))
+            reset = float(reset)
+        except ValueError:
+            return
+        
+        # Reset is sent either as seconds left or as a Unix timestamp
+        if reset > 1e9:
+            reset -= time.time()
+        if reset <= 0:
+            return
+        
+        with self._lock:
+            self.rate = max(remaining, 1) / reset
+            self.tokens = min(self.tokens, remaining)
+
+
 class BlockchainImporter:
     """Import transaction data directly from blockchain APIs."""
     
-    def __init__(self):
+    def __init__(self, rate_limit_delay: float = 0.2):
         self.etherscan_api_key = None  # Set via environment variable
         self.bitcoin_api_key = None    # Set via environment variable
-        self.rate_limit_delay = 0.2    # Delay between API calls
+        # Paced at one call per rate_limit_delay, without a burst, until the API
+        # reports its own limits (Etherscan's free tier allows 5 calls/second)
+        self.rate_limiter = TokenBucket(rate=1 / rate_limit_delay, burst=1)
+        self.session = self._create_session()
+    
+    def _create_session(self) -> requests.Session:
+        """Create a keep-alive HTTP session shared by all API calls."""
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=8,
+            pool_maxsize=32,
+            max_retries=Retry(
+                total=6,
+                connect=3,
+                read=3,
+                backoff_factor=0.5,
+                status_forcelist=RETRY_STATUSES,
+                respect_retry_after_header=True,
+                allowed_methods=frozenset(['GET'])
+            )
+        )
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        session.headers['Connection'] = 'keep-alive'
+        session.headers['User-Agent'] = 'Cyrptax blockchain importer'
+        return session
+    
+    def _get(self, url: str, **kwargs) -> requests.Response:
+        """Send a rate-limited GET request over the shared session."""
+        self.rate_limiter.acquire()
+        response = self.session.get(url, timeout=30, **kwargs)
+        self.rate_limiter.update_from_headers(response.headers)
+        return response
+    
+    def close(self) -> None:
+        """Close the underlying HTTP session."""
+        self.session.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
         
     def import_ethereum_transactions(self, address: str, start_date: Optional[datetime] = None, 
                                    end_date: Optional[datetime] = None) -> pd.DataFrame:
@@ -28,47 +283,13 @@ class BlockchainImporter:
         
         Args:
             address: Ethereum wallet address
-            start_date: Start date for transactions (optional)
-            end_date: End date for transactions (optional)
+            start_date: Start date for transactions (optional, naive values are UTC)
+            end_date: End date for transactions (optional, naive values are UTC)
             
         Returns:
-            DataFrame with normalized transaction data
+            DataFrame with normalized transaction data, timestamps in UTC
         """
-        if not self.etherscan_api_key:
-            logger.warning("Etherscan API key not set. Set ETHERSCAN_API_KEY environment variable.")
-            return pd.DataFrame()
-        
-        transactions = []
-        page = 1
-        
-        while True:
-            try:
-                # Get normal transactions
-                normal_txs = self._get_ethereum_transactions(address, 'normal', page)
-                if not normal_txs:
-                    break
-                
-                # Get internal transactions
-                internal_txs = self._get_ethereum_transactions(address, 'internal', page)
-                
-                # Process transactions
-                for tx in normal_txs + internal_txs:
-                    processed_tx = self._process_ethereum_transaction(tx, address)
-                    if processed_tx and self._is_in_date_range(processed_tx['timestamp'], start_date, end_date):
-                        transactions.append(processed_tx)
-                
-                page += 1
-                time.sleep(self.rate_limit_delay)
-                
-                # Limit to prevent excessive API calls
-                if page > 100:
-                    break
-                    
-            except Exception as e:
-                logger.error(f"Error fetching Ethereum transactions: {e}")
-                break
-        
-        return pd.DataFrame(transactions)
+        return self._import_evm_transactions('ethereum', address, start_date, end_date)
     
     def import_bitcoin_transactions(self, address: str, start_date: Optional[datetime] = None,
                                   end_date: Optional[datetime] = None) -> pd.DataFrame:
@@ -77,33 +298,35 @@ class BlockchainImporter:
         
         Args:
             address: Bitcoin wallet address
-            start_date: Start date for transactions (optional)
-            end_date: End date for transactions (optional)
+            start_date: Start date for transactions (optional, naive values are UTC)
+            end_date: End date for transactions (optional, naive values are UTC)
             
         Returns:
-            DataFrame with normalized transaction data
+            DataFrame with normalized transaction data, timestamps in UTC
         """
-        transactions = []
+        columns = _new_columns()
+        url = f"{BLOCKCHAIN_INFO_URL}/{address}"
+        offset = 0
+        start_ts = _unix_seconds(start_date) if start_date else None
+        end_ts = _unix_seconds(end_date) if end_date else None
         
-        try:
-            # Get address info
-            url = f"https://blockchain.info/rawaddr/{address}"
-            response = requests.get(url, timeout=30)
+        # Page through the address history so only one page is held in memory
+        while True:
+            response = self._get(url, params={'limit': BTC_PAGE_SIZE, 'offset': offset})
             response.raise_for_status()
             
-            data = response.json()
+            data = _decode_json(response)
+            txs = data.get('txs', [])
             
-            for tx in data.get('txs', []):
-                processed_tx = self._process_bitcoin_transaction(tx, address)
-                if processed_tx and self._is_in_date_range(processed_tx['timestamp'], start_date, end_date):
-                    transactions.append(processed_tx)
-                
-                time.sleep(self.rate_limit_delay)
-                
-        except Exception as e:
-            logger.error(f"Error fetching Bitcoin transactions: {e}")
+            processed_txs = self._process_bitcoin_transactions(txs, address, start_ts, end_ts)
+            if processed_txs:
+                _append_chunk(columns, processed_txs)
+            
+            offset += len(txs)
+            if len(txs) < BTC_PAGE_SIZE or offset >= data.get('n_tx', 0):
+                break
         
-        return pd.DataFrame(transactions)
+        return _columns_to_frame(columns)
     
     def import_bsc_transactions(self, address: str, start_date: Optional[datetime] = None,
                                end_date: Optional[datetime] = None) -> pd.DataFrame:
@@ -112,58 +335,13 @@ class BlockchainImporter:
         
         Args:
             address: BSC wallet address
-            start_date: Start date for transactions (optional)
-            end_date: End date for transactions (optional)
+            start_date: Start date for transactions (optional, naive values are UTC)
+            end_date: End date for transactions (optional, naive values are UTC)
             
         Returns:
-            DataFrame with normalized transaction data
+            DataFrame with normalized transaction data, timestamps in UTC
         """
-        if not self.etherscan_api_key:
-            logger.warning("BSCScan API key not set. Set ETHERSCAN_API_KEY environment variable.")
-            return pd.DataFrame()
-        
-        transactions = []
-        page = 1
-        
-        while True:
-            try:
-                # BSCScan uses similar API to Etherscan
-                url = "https://api.bscscan.com/api"
-                params = {
-                    'module': 'account',
-                    'action': 'txlist',
-                    'address': address,
-                    'startblock': 0,
-                    'endblock': 99999999,
-                    'page': page,
-                    'offset': 10000,
-                    'sort': 'asc',
-                    'apikey': self.etherscan_api_key
-                }
-                
-                response = requests.get(url, params=params, timeout=30)
-                response.raise_for_status()
-                
-                data = response.json()
-                if data['status'] != '1' or not data['result']:
-                    break
-                
-                for tx in data['result']:
-                    processed_tx = self._process_bsc_transaction(tx, address)
-                    if processed_tx and self._is_in_date_range(processed_tx['timestamp'], start_date, end_date):
-                        transactions.append(processed_tx)
-                
-                page += 1
-                time.sleep(self.rate_limit_delay)
-                
-                if page > 100:  # Limit pages
-                    break
-                    
-            except Exception as e:
-                logger.error(f"Error fetching BSC transactions: {e}")
-                break
-        
-        return pd.DataFrame(transactions)
+        return self._import_evm_transactions('bsc', address, start_date, end_date)
     
     def import_polygon_transactions(self, address: str, start_date: Optional[datetime] = None,
                                    end_date: Optional[datetime] = None) -> pd.DataFrame:
@@ -172,226 +350,386 @@ class BlockchainImporter:
         
         Args:
             address: Polygon wallet address
-            start_date: Start date for transactions (optional)
-            end_date: End date for transactions (optional)
+            start_date: Start date for transactions (optional, naive values are UTC)
+            end_date: End date for transactions (optional, naive values are UTC)
             
         Returns:
-            DataFrame with normalized transaction data
+            DataFrame with normalized transaction data, timestamps in UTC
+        """
+        return self._import_evm_transactions('polygon', address, start_date, end_date)
+    
+    def _import_evm_transactions(self, chain: str, address: str, start_date: Optional[datetime],
+                                 end_date: Optional[datetime]) -> pd.DataFrame:
+        """
+        Import transactions for an Etherscan-compatible chain.
+        
+        Args:
+            chain: Key into EVM_CHAINS
+            address: Wallet address
+            start_date: Start date for transactions (optional, naive values are UTC)
+            end_date: End date for transactions (optional, naive values are UTC)
+        
+        Returns:
+            DataFrame with normalized transaction data, timestamps in UTC
         """
+        chain_cfg = EVM_CHAINS[chain]
         if not self.etherscan_api_key:
-            logger.warning("PolygonScan API key not set. Set ETHERSCAN_API_KEY environment variable.")
+            logger.warning(f"{chain_cfg['explorer']} API key not set. Set ETHERSCAN_API_KEY environment variable.")
             return pd.DataFrame()
         
-        transactions = []
-        page = 1
+        url = chain_cfg['url']
+        columns = _new_columns()
+        address_lc = address.lower()
         
-        while True:
-            try:
-                url = "https://api.polygonscan.com/api"
-                params = {
-                    'module': 'account',
-                    'action': 'txlist',
-                    'address': address,
-                    'startblock': 0,
-                    'endblock': 99999999,
-                    'page': page,
-                    'offset': 10000,
-                    'sort': 'asc',
-                    'apikey': self.etherscan_api_key
-                }
-                
-                response = requests.get(url, params=params, timeout=30)
-                response.raise_for_status()
-                
-                data = response.json()
-                if data['status'] != '1' or not data['result']:
-                    break
-                
-                for tx in data['result']:
-                    processed_tx = self._process_polygon_transaction(tx, address)
-                    if processed_tx and self._is_in_date_range(processed_tx['timestamp'], start_date, end_date):
-                        transactions.append(processed_tx)
-                
-                page += 1
-                time.sleep(self.rate_limit_delay)
-                
-                if page > 100:
-                    break
-                    
-            except Exception as e:
-                logger.error(f"Error fetching Polygon transactions: {e}")
-                break
+        block_range = self._block_range(url, start_date, end_date)
+        start_ts = _unix_seconds(start_date) if start_date else None
+        end_ts = _unix_seconds(end_date) if end_date else None
         
-        return pd.DataFrame(transactions)
+        # Each action (normal, internal) is paginated independently and concurrently
+        actions = chain_cfg['actions']
+        with ThreadPoolExecutor(max_workers=len(actions)) as executor:
+            action_pages = list(executor.map(
+                lambda action: self._fetch_scan_pages(url, self._scan_params(action, address, block_range),
+                                                      end_timestamp=end_ts),
+                actions
+            ))
+        
+        for pages in action_pages:
+            for page_txs in pages:
+                processed_page = self._process_evm_page(page_txs, address_lc, chain_cfg, start_ts, end_ts)
+                if processed_page:
+                    _append_chunk(columns, processed_page)
+        
+        return _columns_to_frame(columns)
     
-    def _get_ethereum_transactions(self, address: str, tx_type: str, page: int) -> List[Dict]:
-        """Get Ethereum transactions from Etherscan API."""
-        url = "https://api.etherscan.io/api"
-        params = {
+    def _scan_params(self, action: str, address: str,
+                     block_range: Tuple[int, int] = (FIRST_BLOCK, LAST_BLOCK)) -> Dict[str, Any]:
+        """Build the account query shared by Etherscan-compatible explorers."""
+        return {
             'module': 'account',
-            'action': 'txlist' if tx_type == 'normal' else 'txlistinternal',
+            'action': action,
             'address': address,
-            'startblock': 0,
-            'endblock': 99999999,
-            'page': page,
-            'offset': 10000,
+            'startblock': block_range[0],
+            'endblock': block_range[1],
+            'offset': SCAN_RESULT_WINDOW,
             'sort': 'asc',
             'apikey': self.etherscan_api_key
         }
+    
+    def _date_to_block(self, url: str, date: datetime, closest: str) -> Optional[int]:
+        """
+        Resolve a date to a block number with the explorer's getblocknobytime call.
         
-        response = requests.get(url, params=params, timeout=30)
-        response.raise_for_status()
+        Args:
+            url: Explorer API endpoint
+            date: Date to resolve (naive values are treated as UTC)
+            closest: 'before' or 'after', the side of the date to pick a block from
         
-        data = response.json()
-        if data['status'] != '1':
-            return []
+        Returns:
+            Block number, or None if the explorer could not resolve it
+        """
+        params = {
+            'module': 'block',
+            'action': 'getblocknobytime',
+            'timestamp': _unix_seconds(date),
+            'closest': closest,
+            'apikey': self.etherscan_api_key
+        }
         
-        return data['result']
-    
-    def _process_ethereum_transaction(self, tx: Dict, address: str) -> Optional[Dict]:
-        """Process Ethereum transaction into standard format."""
         try:
-            timestamp = datetime.fromtimestamp(int(tx['timeStamp']))
-            
-            # Determine transaction type and amounts
-            if tx['from'].lower() == address.lower():
-                # Outgoing transaction
-                tx_type = 'sell' if tx['value'] != '0' else 'transfer'
-                base_amount = float(tx['value']) / 1e18  # Convert from wei
-                quote_amount = float(tx.get('gasUsed', 0)) * float(tx.get('gasPrice', 0)) / 1e18
-                base_asset = 'ETH'
-                quote_asset = 'ETH'
-            else:
-                # Incoming transaction
-                tx_type = 'buy' if tx['value'] != '0' else 'receive'
-                base_amount = float(tx['value']) / 1e18
-                quote_amount = 0
-                base_asset = 'ETH'
-                quote_asset = 'ETH'
-            
-            return {
-                'timestamp': timestamp.isoformat(),
-                'type': tx_type,
-                'base_asset': base_asset,
-                'base_amount': base_amount,
-                'quote_asset': quote_asset,
-                'quote_amount': quote_amount,
-                'fee_amount': float(tx.get('gasUsed', 0)) * float(tx.get('gasPrice', 0)) / 1e18,
-                'fee_asset': 'ETH',
-                'notes': f"Ethereum tx: {tx['hash']}"
-            }
+            response = self._get(url, params=params)
+            response.raise_for_status()
+            data = _decode_json(response)
+            if data['status'] == '1':
+                return int(data['result'])
         except Exception as e:
-            logger.error(f"Error processing Ethereum transaction: {e}")
-            return None
+            logger.warning(f"Could not resolve block for {date} from {url}: {e}")
+        return None
     
-    def _process_bitcoin_transaction(self, tx: Dict, address: str) -> Optional[Dict]:
-        """Process Bitcoin transaction into standard format."""
-        try:
-            timestamp = datetime.fromtimestamp(tx['time'])
-            
-            # Calculate input and output amounts for this address
-            input_amount = 0
-            output_amount = 0
-            
-            for inp in tx.get('inputs', []):
-                if inp.get('prev_out', {}).get('addr') == address:
-                    input_amount += inp['prev_out']['value']
+    def _block_range(self, url: str, start_date: Optional[datetime],
+                     end_date: Optional[datetime]) -> Tuple[int, int]:
+        """Narrow the queried block range to the requested dates."""
+        start_block = self._date_to_block(url, start_date, 'after') if start_date else None
+        end_block = self._date_to_block(url, end_date, 'before') if end_date else None
+        return (FIRST_BLOCK if start_block is None else start_block,
+                LAST_BLOCK if end_block is None else end_block)
+    
+    def _fetch_scan_page(self, url: str, params: Dict[str, Any], page: int) -> List[Dict]:
+        """
+        Fetch one result page from an Etherscan-compatible explorer.
+        
+        Rate-limit replies are retried with backoff up to
+        ``SCAN_RATE_LIMIT_RETRIES`` times.
+        
+        Raises:
+            APIError: If the explorer answers with an error instead of results
+        """
+        for attempt in range(SCAN_RATE_LIMIT_RETRIES + 1):
+            response = self._get(url, params={**params, 'page': page})
+            response.raise_for_status()
             
-            for out in tx.get('out', []):
-                if out.get('addr') == address:
-                    output_amount += out['value']
+            data = _decode_json(response)
+            if data['status'] == '1':
+                return data['result']
+            # An account without transactions is status '0' with an empty
+            # result list; any other status '0' reply carries an error text
+            if not data.get('result'):
+                return []
+            if 'rate limit' not in str(data['result']).lower() or attempt == SCAN_RATE_LIMIT_RETRIES:
+                break
+            wait = SCAN_RATE_LIMIT_BACKOFF * 2 ** attempt
+            logger.warning(f"{url} rate limit reached; retrying in {wait:.0f}s")
+            time.sleep(wait)
+        
+        raise APIError(
+            f"{url} returned an error for {params.get('action')}: {data['result']}",
+            api_name=url,
+            response_text=str(data.get('message'))
+        )
+    
+    def _fetch_scan_pages(self, url: str, params: Dict[str, Any], max_pages: Optional[int] = None,
+                          end_timestamp: Optional[int] = None) -> List[List[Dict]]:
+        """
+        Fetch result pages until the end of the account history.
+        
+        Explorers only serve the first ``SCAN_RESULT_WINDOW`` records of a
+        query, so rather than asking for page 2 the query is repeated with
+        ``startblock`` moved to the last block of the previous page. Rows
+        from that block are held back and fetched again with the next query,
+        because the window may have cut the block short. A page shorter than
+        the requested ``offset`` is the last one; since results are sorted
+        ascending, fetching also stops at the first page that runs past
+        ``end_timestamp``.
+        
+        Args:
+            url: Explorer API endpoint
+            params: Query parameters without the page number
+            max_pages: Maximum number of requests to make (optional, unlimited by default)
+            end_timestamp: Unix seconds after which no more pages are needed (optional)
+        
+        Returns:
+            List of non-empty result pages in block order
+        """
+        pages = []
+        page_size = int(params['offset'])
+        query = dict(params)
+        
+        while max_pages is None or len(pages) < max_pages:
+            result = self._fetch_scan_page(url, query, 1)
+            if not result:
+                return pages
+            if self._is_last_page(result, page_size, end_timestamp):
+                pages.append(result)
+                return pages
             
-            # Determine transaction type
-            if input_amount > 0 and output_amount > 0:
-                tx_type = 'trade'
-            elif input_amount > 0:
-                tx_type = 'sell'
+            last_block = int(result[-1]['blockNumber'])
+            complete = [tx for tx in result if int(tx['blockNumber']) < last_block]
+            if complete:
+                pages.append(complete)
+                query['startblock'] = last_block
             else:
-                tx_type = 'buy'
-            
-            amount = max(input_amount, output_amount) / 1e8  # Convert from satoshis
+                # A single block holds a full window of this account's
+                # transactions; the explorer cannot return the rest of it
+                logger.warning(f"Block {last_block} has more than {page_size} {params['action']} "
+                               f"records for {params['address']}; later ones in that block are missing")
+                pages.append(result)
+                query['startblock'] = last_block + 1
+        
+        return pages
+    
+    def _is_last_page(self, result: List[Dict], page_size: int, end_timestamp: Optional[int]) -> bool:
+        """Check whether no page after this one is needed."""
+        if len(result) < page_size:
+            return True
+        return end_timestamp is not None and int(result[-1]['timeStamp']) > end_timestamp
+    
+    def _evm_page_arrays(self, txs: List[Dict], address_lc: str, start_ts: Optional[int],
+                         end_ts: Optional[int]) -> Dict[str, Any]:
+        """
+        Decode an Etherscan-compatible result page into NumPy arrays.
+        
+        Args:
+            txs: Raw transactions from one result page
+            address_lc: Lowercased wallet address the page was requested for
+            start_ts: Start of the date range in Unix seconds (optional)
+            end_ts: End of the date range in Unix seconds (optional)
             
-            return {
-                'timestamp': timestamp.isoformat(),
-                'type': tx_type,
-                'base_asset': 'BTC',
-                'base_amount': amount,
-                'quote_asset': 'BTC',
-                'quote_amount': amount,
-                'fee_amount': 0,  # Bitcoin fees are implicit
-                'fee_asset': 'BTC',
-                'notes': f"Bitcoin tx: {tx['hash']}"
-            }
-        except Exception as e:
-            logger.error(f"Error processing Bitcoin transaction: {e}")
-            return None
+        Returns:
+            Dict of timestamp, outgoing, amount, fee and hash arrays for the
+            transactions inside the date range
+        """
+        n = len(txs)
+        values = np.fromiter((float(tx['value']) for tx in txs), dtype=np.float64, count=n)
+        gas_used = np.fromiter((float(tx.get('gasUsed', 0)) for tx in txs), dtype=np.float64, count=n)
+        gas_price = np.fromiter((float(tx.get('gasPrice', 0)) for tx in txs), dtype=np.float64, count=n)
+        timestamps = np.fromiter((int(tx['timeStamp']) for tx in txs), dtype=np.int64, count=n)
+        senders = np.char.lower(np.array([tx['from'] for tx in txs], dtype=str))
+        hashes = np.array([tx['hash'] for tx in txs], dtype=object)
+        
+        in_range = self._date_mask(timestamps, start_ts, end_ts)
+        
+        return {
+            'timestamp': timestamps[in_range],
+            'outgoing': (senders == address_lc)[in_range],
+            'amount': values[in_range] / 1e18,  # Convert from wei
+            'fee': (gas_used * gas_price / 1e18)[in_range],
+            'hash': hashes[in_range]
+        }
     
-    def _process_bsc_transaction(self, tx: Dict, address: str) -> Optional[Dict]:
-        """Process BSC transaction into standard format."""
+    def _is_valid_evm_tx(self, tx: Dict, chain_cfg: Dict[str, Any]) -> bool:
+        """Check that a raw EVM transaction has every field the page decode reads."""
         try:
-            timestamp = datetime.fromtimestamp(int(tx['timeStamp']))
-            
-            if tx['from'].lower() == address.lower():
-                tx_type = 'sell'
-                base_amount = float(tx['value']) / 1e18
-                quote_amount = float(tx.get('gasUsed', 0)) * float(tx.get('gasPrice', 0)) / 1e18
-            else:
-                tx_type = 'buy'
-                base_amount = float(tx['value']) / 1e18
-                quote_amount = 0
-            
-            return {
-                'timestamp': timestamp.isoformat(),
-                'type': tx_type,
-                'base_asset': 'BNB',
-                'base_amount': base_amount,
-                'quote_asset': 'BNB',
-                'quote_amount': quote_amount,
-                'fee_amount': float(tx.get('gasUsed', 0)) * float(tx.get('gasPrice', 0)) / 1e18,
-                'fee_asset': 'BNB',
-                'notes': f"BSC tx: {tx['hash']}"
-            }
-        except Exception as e:
-            logger.error(f"Error processing BSC transaction: {e}")
-            return None
+            float(tx['value'])
+            float(tx.get('gasUsed', 0))
+            float(tx.get('gasPrice', 0))
+            int(tx['timeStamp'])
+            tx['from'].lower()
+            tx['hash']
+            return True
+        except (KeyError, TypeError, ValueError, AttributeError) as e:
+            logger.error(f"Error processing {chain_cfg['label']} transaction: {e}")
+            return False
     
-    def _process_polygon_transaction(self, tx: Dict, address: str) -> Optional[Dict]:
-        """Process Polygon transaction into standard format."""
+    def _process_evm_page(self, txs: List[Dict], address_lc: str, chain_cfg: Dict[str, Any],
+                          start_ts: Optional[int], end_ts: Optional[int]) -> Dict[str, Any]:
+        """Process a page of EVM transactions into TRANSACTION_COLUMNS arrays."""
         try:
-            timestamp = datetime.fromtimestamp(int(tx['timeStamp']))
-            
-            if tx['from'].lower() == address.lower():
-                tx_type = 'sell'
-                base_amount = float(tx['value']) / 1e18
-                quote_amount = float(tx.get('gasUsed', 0)) * float(tx.get('gasPrice', 0)) / 1e18
-            else:
-                tx_type = 'buy'
-                base_amount = float(tx['value']) / 1e18
-                quote_amount = 0
+            page = self._evm_page_arrays(txs, address_lc, start_ts, end_ts)
+        except (KeyError, TypeError, ValueError, AttributeError):
+            # A malformed transaction fails the whole-page decode; drop only
+            # the bad ones and decode the rest
+            valid_txs = [tx for tx in txs if self._is_valid_evm_tx(tx, chain_cfg)]
+            page = self._evm_page_arrays(valid_txs, address_lc, start_ts, end_ts)
+        outgoing = page['outgoing']
+        
+        tx_type = np.where(outgoing, 'sell', 'buy')
+        if chain_cfg['zero_value_types']:
+            # Zero-value transfers are contract calls rather than trades
+            sent, received = chain_cfg['zero_value_types']
+            tx_type = np.where(page['amount'] != 0, tx_type, np.where(outgoing, sent, received))
+        
+        n = len(tx_type)
+        asset = np.full(n, chain_cfg['asset'], dtype=object)
+        return {
+            'timestamp': page['timestamp'],
+            'type': tx_type,
+            'base_asset': asset,
+            'base_amount': page['amount'],
+            'quote_asset': asset,
+            'quote_amount': np.where(outgoing, page['fee'], 0.0),
+            'fee_amount': page['fee'],
+            'fee_asset': asset,
+            'notes': [f"{chain_cfg['label']} tx: {tx_hash}" for tx_hash in page['hash']]
+        }
+    
+    def _bitcoin_totals(self, txs: List[Dict], address: str) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Calculate the input and output amounts of an address per transaction.
+        
+        Totals of transactions seen by any earlier import in this process
+        come from the module-level LRU cache; only the remaining transactions have their inputs and outputs
+        walked.
+        
+        Args:
+            txs: Raw blockchain.info transactions
+            address: Bitcoin wallet address
+        
+        Returns:
+            (input_amount, output_amount) arrays in satoshis
+        """
+        totals = np.zeros((len(txs), 2))
+        missing = []
+        with _btc_cache_lock:
+            for i, tx in enumerate(txs):
+                key = (address, tx['hash'])
+                cached = _btc_cache.get(key)
+                if cached is None:
+                    missing.append(i)
+                else:
+                    _btc_cache.move_to_end(key)
+                    totals[i] = cached
+        
+        if missing:
+            new_txs = [txs[i] for i in missing]
+            input_amount = _address_totals(len(new_txs), [
+                (i, inp.get('prev_out', {}).get('addr'), inp.get('prev_out', {}).get('value', 0))
+                for i, tx in enumerate(new_txs) for inp in tx.get('inputs', [])
+            ], address)
+            output_amount = _address_totals(len(new_txs), [
+                (i, out.get('addr'), out.get('value', 0))
+                for i, tx in enumerate(new_txs) for out in tx.get('out', [])
+            ], address)
+            totals[missing, 0] = input_amount
+            totals[missing, 1] = output_amount
             
-            return {
-                'timestamp': timestamp.isoformat(),
-                'type': tx_type,
-                'base_asset': 'MATIC',
-                'base_amount': base_amount,
-                'quote_asset': 'MATIC',
-                'quote_amount': quote_amount,
-                'fee_amount': float(tx.get('gasUsed', 0)) * float(tx.get('gasPrice', 0)) / 1e18,
-                'fee_asset': 'MATIC',
-                'notes': f"Polygon tx: {tx['hash']}"
-            }
-        except Exception as e:
-            logger.error(f"Error processing Polygon transaction: {e}")
-            return None
+            with _btc_cache_lock:
+                for tx, pair in zip(new_txs, zip(input_amount.tolist(), output_amount.tolist())):
+                    # A null value decodes to NaN; leave it out so it is never reused
+                    if np.isfinite(pair).all():
+                        _btc_cache[(address, tx['hash'])] = pair
+                while len(_btc_cache) > BTC_CACHE_SIZE:
+                    _btc_cache.popitem(last=False)
+        
+        return totals[:, 0], totals[:, 1]
     
-    def _is_in_date_range(self, timestamp: datetime, start_date: Optional[datetime], 
-                         end_date: Optional[datetime]) -> bool:
-        """Check if timestamp is within date range."""
-        if start_date and timestamp < start_date:
-            return False
-        if end_date and timestamp > end_date:
+    def _is_valid_bitcoin_tx(self, tx: Dict) -> bool:
+        """Check that a raw blockchain.info transaction has every field the totals read."""
+        try:
+            int(tx['time'])
+            tx['hash']
+            values = [float(inp.get('prev_out', {}).get('value', 0)) for inp in tx.get('inputs', [])]
+            values += [float(out.get('value', 0)) for out in tx.get('out', [])]
+            if not np.isfinite(values).all():
+                raise ValueError(f"non-finite value in {tx['hash']}")
+            return True
+        except (KeyError, TypeError, ValueError, AttributeError) as e:
+            logger.error(f"Error processing Bitcoin transaction: {e}")
             return False
-        return True
+    
+    def _process_bitcoin_transactions(self, txs: List[Dict], address: str, start_ts: Optional[int],
+                                      end_ts: Optional[int]) -> Dict[str, Any]:
+        """Process blockchain.info transactions into TRANSACTION_COLUMNS arrays."""
+        try:
+            timestamps = np.fromiter((int(tx['time']) for tx in txs), dtype=np.int64, count=len(txs))
+            input_amount, output_amount = self._bitcoin_totals(txs, address)
+            # NumPy turns null values into NaN instead of failing
+            if not (np.isfinite(input_amount).all() and np.isfinite(output_amount).all()):
+                raise ValueError('non-numeric input or output value')
+        except (KeyError, TypeError, ValueError, AttributeError):
+            # A malformed transaction fails the whole-response reduction;
+            # drop only the bad ones and reduce the rest
+            txs = [tx for tx in txs if self._is_valid_bitcoin_tx(tx)]
+            timestamps = np.fromiter((int(tx['time']) for tx in txs), dtype=np.int64, count=len(txs))
+            input_amount, output_amount = self._bitcoin_totals(txs, address)
+        
+        # Determine transaction type
+        spent = input_amount > 0
+        tx_type = np.select([spent & (output_amount > 0), spent], ['trade', 'sell'], 'buy')
+        amount = np.maximum(input_amount, output_amount) / 1e8  # Convert from satoshis
+        
+        in_range = self._date_mask(timestamps, start_ts, end_ts)
+        asset = np.full(int(in_range.sum()), 'BTC', dtype=object)
+        return {
+            'timestamp': timestamps[in_range],
+            'type': tx_type[in_range],
+            'base_asset': asset,
+            'base_amount': amount[in_range],
+            'quote_asset': asset,
+            'quote_amount': amount[in_range],
+            'fee_amount': np.zeros(len(asset)),  # Bitcoin fees are implicit
+            'fee_asset': asset,
+            'notes': [f"Bitcoin tx: {tx['hash']}" for tx, keep in zip(txs, in_range) if keep]
+        }
+    
+    def _date_mask(self, timestamps: np.ndarray, start_ts: Optional[int],
+                   end_ts: Optional[int]) -> np.ndarray:
+        """Return a boolean mask of the Unix-second timestamps within the range."""
+        in_range = np.ones(len(timestamps), dtype=bool)
+        if start_ts is not None:
+            in_range &= timestamps >= start_ts
+        if end_ts is not None:
+            in_range &= timestamps <= end_ts
+        return in_range
     
     def import_wallet_data(self, wallet_address: str, blockchain: str, 
                           start_date: Optional[datetime] = None,
@@ -402,11 +740,15 @@ class BlockchainImporter:
         Args:
             wallet_address: Wallet address to import
             blockchain: Blockchain type ('ethereum', 'bitcoin', 'bsc', 'polygon')
-            start_date: Start date for transactions (optional)
-            end_date: End date for transactions (optional)
+            start_date: Start date for transactions (optional, naive values are UTC)
+            end_date: End date for transactions (optional, naive values are UTC)
             
         Returns:
-            DataFrame with normalized transaction data
+            DataFrame with normalized transaction data, timestamps in UTC
+        
+        Raises:
+            requests.RequestException: If an API request still fails after retries
+            APIError: If an explorer answers with an error instead of results
         """
         blockchain = blockchain.lower()
         
@@ -423,6 +765,28 @@ class BlockchainImporter:
             return pd.DataFrame()
 
 
+# Output directories already created by this process
+_ensured_dirs: set = set()
+
+
+def _ensure_dir(directory: str) -> None:
+    """Create an output directory once per process."""
+    if directory and directory not in _ensured_dirs:
+        os.makedirs(directory, exist_ok=True)
+        _ensured_dirs.add(directory)
+
+
+def _write_output(df: pd.DataFrame, output_file: str) -> None:
+    """Write imported transactions in the format given by the file extension."""
+    extension = output_file.lower()
+    if extension.endswith('.parquet'):
+        df.to_parquet(output_file, engine='pyarrow', compression='zstd', index=False)
+    elif extension.endswith('.feather'):
+        df.to_feather(output_file)
+    else:
+        df.to_csv(output_file, index=False)
+
+
 def import_blockchain_data(wallet_address: str, blockchain: str, 
                           output_file: str = 'output/blockchain_import.csv',
                           start_date: Optional[datetime] = None,
@@ -433,27 +797,26 @@ def import_blockchain_data(wallet_address: str, blockchain: str,
     Args:
         wallet_address: Wallet address to import
         blockchain: Blockchain type
-        output_file: Output file path
-        start_date: Start date for transactions
-        end_date: End date for transactions
+        output_file: Output file path; .parquet and .feather are written
+            with pyarrow, anything else as CSV
+        start_date: Start date for transactions (naive values are UTC)
+        end_date: End date for transactions (naive values are UTC)
         
     Returns:
-        DataFrame with imported transactions
+        DataFrame with imported transactions, timestamps in UTC
     """
-    importer = BlockchainImporter()
-    
-    # Set API keys from environment variables
-    import os
-    importer.etherscan_api_key = os.getenv('ETHERSCAN_API_KEY')
-    importer.bitcoin_api_key = os.getenv('BITCOIN_API_KEY')
-    
-    # Import data
-    df = importer.import_wallet_data(wallet_address, blockchain, start_date, end_date)
+    with BlockchainImporter() as importer:
+        # Set API keys from environment variables
+        importer.etherscan_api_key = os.getenv('ETHERSCAN_API_KEY')
+        importer.bitcoin_api_key = os.getenv('BITCOIN_API_KEY')
+        
+        # Import data
+        df = importer.import_wallet_data(wallet_address, blockchain, start_date, end_date)
     
     if not df.empty:
         # Save to file
-        os.makedirs(os.path.dirname(output_file), exist_ok=True)
-        df.to_csv(output_file, index=False)
+        _ensure_dir(os.path.dirname(output_file))
+        _write_output(df, output_file)
         logger.info(f"Imported {len(df)} transactions from {blockchain} to {output_file}")
     else:
         logger.warning(f"No transactions found for address {wallet_address} on {blockchain}")
@@ -1,8 +1,9 @@
 """Tax calculation engine for computing capital gains, losses, and income."""
 
 import pandas as pd
+import numpy as np
 from collections import deque
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Optional, Tuple, Union
 import logging
 from datetime import datetime, timedelta
 import os
@@ -148,25 +149,30 @@ class TaxCalculator:
         self.total_long_term_gains = 0.0
         self.total_income = 0.0
     
-    def calculate_taxes(self, input_file: str) -> Tuple[pd.DataFrame, float]:
+    def calculate_taxes(self, input_file: Union[str, pd.DataFrame]) -> Tuple[pd.DataFrame, float]:
         """
         Calculate taxes from normalized transaction data.
         
         Args:
-            input_file: Path to normalized CSV file
+            input_file: Path to normalized CSV file, or the normalized
+                transactions already in memory (left unmodified)
             
         Returns:
             Tuple of (gains_losses_df, total_income)
         """
         # Load and validate data with memory optimization
         try:
-            # Check file size and use appropriate loading strategy
-            file_size = os.path.getsize(input_file)
-            if file_size > 100 * 1024 * 1024:  # 100MB
-                logger.info(f"Large file detected ({file_size / 1024 / 1024:.1f}MB), using optimized loading")
-                df = pd.read_csv(input_file, dtype={'base_amount': 'float32', 'quote_amount': 'float32', 'fee_amount': 'float32'})
+            if isinstance(input_file, pd.DataFrame):
+                # Already loaded by the caller; work on a copy
+                df = input_file.copy()
             else:
-                df = pd.read_csv(input_file)
+                # Check file size and use appropriate loading strategy
+                file_size = os.path.getsize(input_file)
+                if file_size > 100 * 1024 * 1024:  # 100MB
+                    logger.info(f"Large file detected ({file_size / 1024 / 1024:.1f}MB), using optimized loading")
+                    df = pd.read_csv(input_file, dtype={'base_amount': 'float32', 'quote_amount': 'float32', 'fee_amount': 'float32'})
+                else:
+                    df = pd.read_csv(input_file)
             
             df['timestamp'] = pd.to_datetime(df['timestamp'])
             df = df.sort_values('timestamp')
@@ -190,8 +196,11 @@ class TaxCalculator:
         
         # Calculate totals
         if not gains_df.empty:
-            self.total_short_term_gains = gains_df[gains_df['short_term']]['gain_loss'].sum()
-            self.total_long_term_gains = gains_df[~gains_df['short_term']]['gain_loss'].sum()
+            # Masked sums over the two raw columns, without filtered frame copies
+            gain_loss = gains_df['gain_loss'].to_numpy(dtype=np.float64)
+            short_term = gains_df['short_term'].to_numpy(dtype=bool)
+            self.total_short_term_gains = np.nansum(gain_loss[short_term])
+            self.total_long_term_gains = np.nansum(gain_loss[~short_term])
         
         self.total_income = sum(event['income_amount'] for event in self.income_events)
         
@@ -427,13 +436,13 @@ class TaxCalculator:
         logger.info(f"Tax summary saved to {summary_file}")
 
 
-def calculate_taxes(input_file: str, method: str = 'fifo', tax_currency: str = 'usd', 
+def calculate_taxes(input_file: Union[str, pd.DataFrame], method: str = 'fifo', tax_currency: str = 'usd', 
                    specific_lots: Optional[Dict[str, List[str]]] = None) -> Tuple[pd.DataFrame, float]:
     """
     Convenience function to calculate taxes.
     
     Args:
-        input_file: Path to normalized CSV file
+        input_file: Path to normalized CSV file, or a DataFrame of normalized transactions
         method: Tax accounting method ('fifo', 'lifo', 'hifo', 'average_cost', 'specific_id')
         tax_currency: Currency for tax calculations
         specific_lots: For specific_id method, mapping of asset to list of transaction IDs
@@ -3,7 +3,8 @@
 import configparser
 import os
 import yaml
-from typing import Dict, Any
+from types import MappingProxyType
+from typing import Dict, Any, List, Mapping, Optional, Tuple
 
 
 class Config:
@@ -37,6 +38,7 @@ class Config:
         self.config['processing'] = {
             'max_file_size_mb': '100',
             'batch_size': '1000',
+            'chunk_size': '262144',
             'cache_prices': 'true'
         }
         self.config['output'] = {
@@ -63,15 +65,68 @@ class Config:
         return self.config.getboolean(section, key, fallback=fallback)
 
 
-def load_exchange_mappings(config_path: str = 'config/exchanges.yaml') -> Dict[str, Dict[str, str]]:
-    """Load exchange field mappings from YAML file."""
+# Parsed exchange mappings by absolute path, with the mtime they were read at
+_mappings_cache: Dict[str, Tuple[float, Mapping[str, Mapping[str, Any]]]] = {}
+
+
+def load_exchange_mappings(config_path: str = 'config/exchanges.yaml') -> Mapping[str, Mapping[str, Any]]:
+    """
+    Load exchange field mappings from YAML file.
+    
+    The parsed mappings are cached per file and reused until its modification
+    time changes. They are returned read-only because every caller shares them.
+    """
+    cache_key = os.path.abspath(config_path)
     try:
+        mtime = os.path.getmtime(config_path)
+        cached = _mappings_cache.get(cache_key)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        
         with open(config_path, 'r', encoding='utf-8') as f:
-            return yaml.safe_load(f)
+            data = yaml.safe_load(f)
     except FileNotFoundError:
         raise FileNotFoundError(f"Exchange mappings file not found: {config_path}")
     except yaml.YAMLError as e:
         raise ValueError(f"Error parsing exchange mappings YAML: {e}")
+    
+    mappings = MappingProxyType({
+        exchange: MappingProxyType(mapping) if isinstance(mapping, dict) else mapping
+        for exchange, mapping in (data or {}).items()
+    })
+    _mappings_cache[cache_key] = (mtime, mappings)
+    return mappings
+
+
+def exchange_index_path(config_path: str = 'config/exchanges.yaml') -> str:
+    """Return the path of the sorted exchange-name index for a mappings file."""
+    return os.path.splitext(config_path)[0] + '.index.txt'
+
+
+def write_exchange_index(mappings: Dict[str, Any], config_path: str = 'config/exchanges.yaml') -> None:
+    """Write the sorted exchange names next to the mappings file, one per line."""
+    try:
+        with open(exchange_index_path(config_path), 'w', encoding='utf-8') as f:
+            f.write('\n'.join(sorted(mappings)) + '\n')
+    except OSError:
+        pass  # The index is only a shortcut; the YAML remains authoritative
+
+
+def read_exchange_index(config_path: str = 'config/exchanges.yaml') -> Optional[List[str]]:
+    """
+    Read exchange names from the index if it is newer than the mappings file.
+    
+    Returns:
+        Sorted exchange names, or None if the index is missing or stale
+    """
+    index_path = exchange_index_path(config_path)
+    try:
+        if os.path.getmtime(index_path) < os.path.getmtime(config_path):
+            return None
+        with open(index_path, 'r', encoding='utf-8') as f:
+            return f.read().splitlines()
+    except OSError:
+        return None
 
 
 # Global configuration instance
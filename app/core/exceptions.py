@@ -1,20 +1,52 @@
 """Custom exception classes for the crypto tax tool."""
 
+from datetime import datetime
 from typing import Optional, Dict, Any, List
 
+from dateutil.parser import isoparse, parse
+
 
 class CryptoTaxError(Exception):
-    """Base exception class for all crypto tax tool errors."""
+    """Base exception class for all crypto tax tool errors.
+    
+    Subclasses raised on hot paths may pass ``message=None`` and set ``_fmt``
+    and ``_args`` instead; the message and details are then only built when
+    they are first read, so exceptions that are caught and discarded never
+    pay for the formatting.
+    """
+    
+    _fmt: Optional[str] = None
+    _args: tuple = ()
     
-    def __init__(self, message: str, details: Optional[Dict[str, Any]] = None):
+    def __init__(self, message: Optional[str] = None, details: Optional[Dict[str, Any]] = None):
         super().__init__(message)
-        self.message = message
-        self.details = details or {}
+        self._message = message
+        self._details = details
+    
+    @property
+    def message(self) -> str:
+        """Error message, formatted from ``_fmt`` on first access."""
+        if self._message is None:
+            self._message = self._fmt.format(*self._args) if self._fmt else ''
+        return self._message
+    
+    @property
+    def details(self) -> Dict[str, Any]:
+        """Error details, built by ``_build_details`` on first access."""
+        if self._details is None:
+            self._details = self._build_details()
+        return self._details
+    
+    def _build_details(self) -> Dict[str, Any]:
+        return {}
     
     def __str__(self):
-        if self.details:
-            return f"{self.message} - Details: {self.details}"
         return self.message
+    
+    def __repr__(self):
+        if self.details:
+            return f"{type(self).__name__}({self.message!r}, details={self.details!r})"
+        return f"{type(self).__name__}({self.message!r})"
 
 
 class DataValidationError(CryptoTaxError):
@@ -57,16 +89,25 @@ class ExchangeNotSupportedError(CryptoTaxError):
     """Raised when an exchange is not supported."""
     
     def __init__(self, exchange_name: str, supported_exchanges: Optional[List[str]] = None):
-        message = f"Exchange '{exchange_name}' is not supported"
-        details = {'exchange_name': exchange_name}
-        
-        if supported_exchanges:
-            details['supported_exchanges'] = supported_exchanges
-            message += f". Supported exchanges: {', '.join(supported_exchanges)}"
-        
-        super().__init__(message, details)
+        super().__init__()
+        self.args = (exchange_name, supported_exchanges)
         self.exchange_name = exchange_name
         self.supported_exchanges = supported_exchanges or []
+    
+    @property
+    def message(self) -> str:
+        if self._message is None:
+            message = f"Exchange '{self.exchange_name}' is not supported"
+            if self.supported_exchanges:
+                message += f". Supported exchanges: {', '.join(self.supported_exchanges)}"
+            self._message = message
+        return self._message
+    
+    def _build_details(self) -> Dict[str, Any]:
+        details = {'exchange_name': self.exchange_name}
+        if self.supported_exchanges:
+            details['supported_exchanges'] = self.supported_exchanges
+        return details
 
 
 class PriceFetchError(CryptoTaxError):
@@ -91,43 +132,46 @@ class PriceFetchError(CryptoTaxError):
 class CalculationError(CryptoTaxError):
     """Raised when tax calculations fail."""
     
-    def __init__(self, message: str, transaction_id: Optional[str] = None,
+    def __init__(self, message: Optional[str], transaction_id: Optional[str] = None,
                  asset: Optional[str] = None, calculation_method: Optional[str] = None):
-        details = {}
-        if transaction_id:
-            details['transaction_id'] = transaction_id
-        if asset:
-            details['asset'] = asset
-        if calculation_method:
-            details['calculation_method'] = calculation_method
-        
-        super().__init__(message, details)
+        super().__init__(message)
         self.transaction_id = transaction_id
         self.asset = asset
         self.calculation_method = calculation_method
+    
+    def _build_details(self) -> Dict[str, Any]:
+        details = {}
+        if self.transaction_id:
+            details['transaction_id'] = self.transaction_id
+        if self.asset:
+            details['asset'] = self.asset
+        if self.calculation_method:
+            details['calculation_method'] = self.calculation_method
+        return details
 
 
 class InsufficientInventoryError(CalculationError):
     """Raised when trying to sell more than available inventory."""
     
+    _fmt = "Insufficient {} inventory: requested {}, available {}"
+    
     def __init__(self, asset: str, requested_amount: float, available_amount: float,
                  transaction_id: Optional[str] = None):
-        message = (f"Insufficient {asset} inventory: requested {requested_amount}, "
-                  f"available {available_amount}")
-        
-        super().__init__(
-            message, 
-            transaction_id=transaction_id, 
-            asset=asset
-        )
+        super().__init__(None, transaction_id=transaction_id, asset=asset)
+        self.args = (asset, requested_amount, available_amount, transaction_id)
+        self._args = (asset, requested_amount, available_amount)
         self.requested_amount = requested_amount
         self.available_amount = available_amount
+    
+    def _build_details(self) -> Dict[str, Any]:
+        details = super()._build_details()
         
         # Add amounts to details
-        self.details.update({
-            'requested_amount': requested_amount,
-            'available_amount': available_amount
+        details.update({
+            'requested_amount': self.requested_amount,
+            'available_amount': self.available_amount
         })
+        return details
 
 
 class ReportGenerationError(CryptoTaxError):
@@ -304,11 +348,20 @@ def safe_date_conversion(value: Any, field_name: str = "date") -> str:
             validation_errors=[f"Date field '{field_name}' is empty"]
         )
     
+    text = str(value)
     try:
-        from dateutil import parser
-        parsed_date = parser.parse(str(value))
-        return parsed_date.isoformat()
-    except (ValueError, TypeError) as e:
+        # Most sources are already ISO 8601; try the C parser and dateutil's
+        # strict ISO parser before the general heuristic one.
+        try:
+            return datetime.fromisoformat(text).isoformat()
+        except ValueError:
+            pass
+        try:
+            return isoparse(text).isoformat()
+        except ValueError:
+            pass
+        return parse(text).isoformat()
+    except (ValueError, TypeError, OverflowError) as e:
         raise DataValidationError(
             f"Invalid date format for {field_name}: {value}",
             validation_errors=[f"Cannot parse date '{value}': {e}"]
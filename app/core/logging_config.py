@@ -3,9 +3,10 @@
 import logging
 import logging.handlers
 import os
+import time
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Union
 
 from src.config import config
 
@@ -17,14 +18,11 @@ class CryptoTaxFormatter(logging.Formatter):
         super().__init__()
         self.default_format = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
         self.error_format = '%(asctime)s - %(name)s - %(levelname)s - %(filename)s:%(lineno)d - %(message)s'
+        self._default = logging.Formatter(self.default_format)
+        self._error = logging.Formatter(self.error_format)
     
     def format(self, record):
-        if record.levelno >= logging.ERROR:
-            self._style._fmt = self.error_format
-        else:
-            self._style._fmt = self.default_format
-        
-        return super().format(record)
+        return (self._error if record.levelno >= logging.ERROR else self._default).format(record)
 
 
 def setup_logging(
@@ -67,27 +65,21 @@ def setup_logging(
     # Create formatter
     formatter = CryptoTaxFormatter()
     
-    # File handler with rotation
+    # File handler with daily rotation
     if log_to_file:
         log_file = log_dir / 'crypto_tax_tool.log'
         
-        # Use rotating file handler to prevent huge log files
-        file_handler = logging.handlers.RotatingFileHandler(
+        # One handler rotates at midnight and keeps dated backups, so each
+        # record is formatted and written once
+        file_handler = logging.handlers.TimedRotatingFileHandler(
             log_file,
-            maxBytes=10 * 1024 * 1024,  # 10MB
+            when='midnight',
             backupCount=5,
             encoding='utf-8'
         )
         file_handler.setLevel(numeric_level)
         file_handler.setFormatter(formatter)
         root_logger.addHandler(file_handler)
-        
-        # Also create a daily log file for easier tracking
-        daily_log_file = log_dir / f'crypto_tax_{datetime.now().strftime("%Y%m%d")}.log'
-        daily_handler = logging.FileHandler(daily_log_file, encoding='utf-8')
-        daily_handler.setLevel(numeric_level)
-        daily_handler.setFormatter(formatter)
-        root_logger.addHandler(daily_handler)
     
     # Console handler
     if log_to_console:
@@ -164,44 +156,55 @@ def log_function_call(func):
     def wrapper(*args, **kwargs):
         logger = logging.getLogger(func.__module__)
         
-        # Log function entry
-        logger.debug(f"Calling {func.__name__} with args={args}, kwargs={kwargs}")
+        debug = logger.isEnabledFor(logging.DEBUG)
         
-        start_time = datetime.now()
+        # Log function entry; the argument reprs are only built when DEBUG
+        # is on, since they can be whole DataFrames
+        if debug:
+            logger.debug("Calling %s with args=%r, kwargs=%r", func.__name__, args, kwargs)
+        
+        start = time.perf_counter()
         
         try:
             result = func(*args, **kwargs)
-            execution_time = (datetime.now() - start_time).total_seconds()
-            logger.debug(f"{func.__name__} completed in {execution_time:.2f}s")
+            if debug:
+                logger.debug("%s completed in %.2fs", func.__name__, time.perf_counter() - start)
             return result
             
         except Exception as e:
-            execution_time = (datetime.now() - start_time).total_seconds()
-            logger.error(f"{func.__name__} failed after {execution_time:.2f}s: {e}")
+            execution_time = time.perf_counter() - start
+            logger.error("%s failed after %.2fs: %s", func.__name__, execution_time, e)
             raise
     
     return wrapper
 
 
-def log_performance(operation: str, start_time: datetime, 
+def log_performance(operation: str, start_time: Union[float, datetime], 
                    records_processed: Optional[int] = None) -> None:
     """
     Log performance metrics for operations.
     
     Args:
         operation: Name of the operation
-        start_time: When the operation started
+        start_time: When the operation started, as a time.perf_counter()
+            value (datetime values are still accepted)
         records_processed: Number of records processed (optional)
     """
     logger = logging.getLogger('performance')
+    if not logger.isEnabledFor(logging.INFO):
+        return
     
-    execution_time = (datetime.now() - start_time).total_seconds()
+    if isinstance(start_time, datetime):
+        execution_time = (datetime.now() - start_time).total_seconds()
+    else:
+        execution_time = time.perf_counter() - start_time
     
     if records_processed:
         rate = records_processed / execution_time if execution_time > 0 else 0
-        logger.info(f"{operation} completed: {records_processed} records in {execution_time:.2f}s ({rate:.1f} records/sec)")
+        logger.info("%s completed: %s records in %.2fs (%.1f records/sec)",
+                    operation, records_processed, execution_time, rate)
     else:
-        logger.info(f"{operation} completed in {execution_time:.2f}s")
+        logger.info("%s completed in %.2fs", operation, execution_time)
 
 
 def log_memory_usage(operation: str) -> None:
@@ -290,11 +293,12 @@ def log_data_summary(logger: logging.Logger, df, operation: str) -> None:
     if hasattr(df, 'columns'):
         logger.debug(f"{operation} - Columns: {list(df.columns)}")
     
-    # Log data quality metrics
-    if len(df) > 0:
-        null_counts = df.isnull().sum()
-        if null_counts.sum() > 0:
-            logger.warning(f"{operation} - Null values found: {null_counts[null_counts > 0].to_dict()}")
+    # Log data quality metrics; only count nulls in the columns that have any
+    if len(df) > 0 and logger.isEnabledFor(logging.WARNING):
+        has_null = df.isna().to_numpy().any(axis=0)
+        if has_null.any():
+            null_counts = df.loc[:, has_null].isna().sum()
+            logger.warning(f"{operation} - Null values found: {null_counts.to_dict()}")
 
 
 def log_validation_results(logger: logging.Logger, results: dict) -> None:
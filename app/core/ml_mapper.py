@@ -1,15 +1,33 @@
 import os
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, List, Tuple
 
+import numpy as np
 import yaml
 import joblib
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.linear_model import LogisticRegression
 from sklearn.pipeline import Pipeline
 
+# Loaded models shared by every ColumnMapper in the process, keyed by
+# (model path, mtime) so a refitted pickle is picked up again.
+_MODEL_CACHE: Dict[Tuple[str, float], Tuple[Pipeline, List[str]]] = {}
+
 
 class ColumnMapper:
+    SYNONYMS: Dict[str, Tuple[str, ...]] = {
+        'timestamp': ('time', 'date', 'datetime', 'created at', 'created', 'timestamp'),
+        'type': ('type', 'side', 'action', 'operation', 'transaction type', 'kind'),
+        'base_asset': ('base asset', 'asset', 'coin', 'token', 'symbol', 'product', 'token in', 'asset sent', 'from asset'),
+        'base_amount': ('amount', 'qty', 'quantity', 'size', 'vol', 'volume', 'executed', 'amount in'),
+        'quote_asset': ('quote asset', 'counter asset', 'spot price currency', 'fiat', 'market', 'pair', 'token out', 'asset received', 'to asset'),
+        'quote_amount': ('total', 'value', 'subtotal', 'cost', 'price', 'amount out', 'usd amount', 'usd value'),
+        'fee_amount': ('fee', 'commission', 'trading fee', 'network fee', 'gas', 'fees and/or spread'),
+        'fee_asset': ('fee currency', 'fee coin', 'fee asset', 'network fee asset', 'bnb', 'usd'),
+        'notes': ('notes', 'info', 'remark', 'specification', 'description')
+    }
+
     def __init__(self, model_path: str = 'output/models/ml_mapper.pkl') -> None:
         self.model_path = Path(model_path)
         self.model: Pipeline = None  # type: ignore
@@ -17,25 +35,19 @@ class ColumnMapper:
             'timestamp', 'type', 'base_asset', 'base_amount',
             'quote_asset', 'quote_amount', 'fee_amount', 'fee_asset', 'notes'
         ]
+        # Header sets repeat across files from the same exchange; cache the
+        # assignment per normalized header tuple and threshold.
+        self._predict_cached = lru_cache(maxsize=128)(self._predict_mapping_uncached)
 
     def fit_from_yaml(self, config_path: str = 'config/exchanges.yaml') -> None:
         with open(config_path, 'r', encoding='utf-8') as f:
             data = yaml.safe_load(f) or {}
 
-        X: List[str] = []
-        y: List[str] = []
-
-        synonyms = {
-            'timestamp': ['time', 'date', 'datetime', 'created at', 'created', 'timestamp'],
-            'type': ['type', 'side', 'action', 'operation', 'transaction type', 'kind'],
-            'base_asset': ['base asset', 'asset', 'coin', 'token', 'symbol', 'product', 'token in', 'asset sent', 'from asset'],
-            'base_amount': ['amount', 'qty', 'quantity', 'size', 'vol', 'volume', 'executed', 'amount in'],
-            'quote_asset': ['quote asset', 'counter asset', 'spot price currency', 'fiat', 'market', 'pair', 'token out', 'asset received', 'to asset'],
-            'quote_amount': ['total', 'value', 'subtotal', 'cost', 'price', 'amount out', 'usd amount', 'usd value'],
-            'fee_amount': ['fee', 'commission', 'trading fee', 'network fee', 'gas', 'fees and/or spread'],
-            'fee_asset': ['fee currency', 'fee coin', 'fee asset', 'network fee asset', 'bnb', 'usd'],
-            'notes': ['notes', 'info', 'remark', 'specification', 'description']
-        }
+        # Unique (text, label) pairs in first-seen order, with how often each
+        # occurs. The synonym lists are shared by every exchange, so the
+        # vectorizer only needs to see each pair once; the counts go to the
+        # classifier as sample weights so the fit matches the repeated data.
+        pairs: Dict[Tuple[str, str], int] = {}
 
         for _, mapping in data.items():
             if not isinstance(mapping, dict):
@@ -44,31 +56,39 @@ class ColumnMapper:
                 v = mapping.get(label)
                 if isinstance(v, str) and v and v != 'None':
                     for txt in self._augment(v):
-                        X.append(txt)
-                        y.append(label)
-                for syn in synonyms.get(label, []):
+                        pairs[(txt, label)] = pairs.get((txt, label), 0) + 1
+                for syn in self.SYNONYMS.get(label, ()):
                     for txt in self._augment(syn):
-                        X.append(txt)
-                        y.append(label)
+                        pairs[(txt, label)] = pairs.get((txt, label), 0) + 1
 
-        if not X:
+        if not pairs:
             raise ValueError('No training data for ML column mapper')
+        X, y = map(list, zip(*pairs))
+        weights = np.fromiter(pairs.values(), dtype=float, count=len(pairs))
 
         self.model = Pipeline(steps=[
-            ('tfidf', TfidfVectorizer(analyzer='char_wb', ngram_range=(2, 5))),
+            ('tfidf', TfidfVectorizer(analyzer='char_wb', ngram_range=(2, 5), dtype=np.float32, sublinear_tf=True)),
             ('clf', LogisticRegression(max_iter=1000, class_weight='balanced'))
         ])
-        self.model.fit(X, y)
+        self.model.fit(X, y, clf__sample_weight=weights)
+        self._predict_cached.cache_clear()
 
         self.model_path.parent.mkdir(parents=True, exist_ok=True)
         joblib.dump({'model': self.model, 'labels': self.labels}, self.model_path)
+        key = (str(self.model_path), self.model_path.stat().st_mtime)
+        _MODEL_CACHE[key] = (self.model, list(self.labels))
 
     def load_or_fit(self, config_path: str = 'config/exchanges.yaml') -> None:
         if self.model_path.exists():
             try:
-                obj = joblib.load(self.model_path)
-                self.model = obj['model']
-                self.labels = obj['labels']
+                key = (str(self.model_path), self.model_path.stat().st_mtime)
+                if key not in _MODEL_CACHE:
+                    obj = joblib.load(self.model_path)
+                    _MODEL_CACHE[key] = (obj['model'], obj['labels'])
+                model, labels = _MODEL_CACHE[key]
+                self.model = model
+                self.labels = list(labels)
+                self._predict_cached.cache_clear()
                 return
             except Exception:
                 pass
@@ -79,55 +99,62 @@ class ColumnMapper:
             self.load_or_fit()
         preds: Dict[str, Tuple[str, float]] = {}
         clf = self.model.named_steps['clf']
-        has_proba = hasattr(clf, 'predict_proba')
-        y = self.model.predict(columns)
-        proba_map = {}
-        if has_proba:
-            probs = clf.predict_proba(self.model.named_steps['tfidf'].transform(columns))
-            classes = list(clf.classes_)
-            for i, col in enumerate(columns):
-                lbl = y[i]
-                try:
-                    p = float(probs[i][classes.index(lbl)])
-                except Exception:
-                    p = 0.5
-                proba_map[col] = p
+        if not hasattr(clf, 'predict_proba'):
+            for col, lbl in zip(columns, self.model.predict(columns)):
+                preds[col] = (lbl, 0.5)
+            return preds
+        # One TF-IDF transform and one classifier pass; the predicted label
+        # is the argmax of the probability row.
+        probs = clf.predict_proba(self.model.named_steps['tfidf'].transform(columns))
+        y_idx = probs.argmax(axis=1)
+        y = clf.classes_[y_idx]
         for i, col in enumerate(columns):
-            lbl = y[i]
-            p = proba_map.get(col, 0.5)
-            preds[col] = (lbl, p)
+            preds[col] = (y[i], float(probs[i, y_idx[i]]))
         return preds
 
     def predict_mapping(self, columns: List[str], threshold: float = 0.8) -> Dict[str, Tuple[str, float]]:
         if self.model is None:
             self.load_or_fit()
+        # The vectorizer lowercases and char_wb splits on whitespace, so this
+        # normalization does not change the predictions.
+        key = tuple(str(c).strip().lower() for c in columns)
+        return {columns[ci]: (lbl, p) for ci, lbl, p in self._predict_cached(key, threshold)}
+
+    def _predict_mapping_uncached(self, columns: Tuple[str, ...], threshold: float) -> Tuple[Tuple[int, str, float], ...]:
+        columns = list(columns)
         clf = self.model.named_steps['clf']
         probs = clf.predict_proba(self.model.named_steps['tfidf'].transform(columns))
         classes = list(clf.classes_)
         idx_map = {lbl: i for i, lbl in enumerate(classes)}
-        pairs: List[Tuple[float, int, int]] = []
-        for i, col in enumerate(columns):
-            for lbl in self.labels:
-                if lbl in idx_map:
-                    p = float(probs[i][idx_map[lbl]])
-                    if p >= 0.5:
-                        pairs.append((p, i, idx_map[lbl]))
-        pairs.sort(reverse=True, key=lambda x: x[0])
+        lbls = [lbl for lbl in self.labels if lbl in idx_map]
+        if not lbls:
+            return ()
+        sub = probs[:, [idx_map[lbl] for lbl in lbls]]
+        n_lbls = sub.shape[1]
+        # Greedy assignment over (column, label) pairs in descending
+        # probability; the stable sort keeps ties in column-then-label order.
+        order = np.argsort(-sub, axis=None, kind='stable')
+        min_p = max(threshold, 0.5)
         assigned_cols = set()
         assigned_lbls = set()
-        result: Dict[str, Tuple[str, float]] = {}
-        for p, ci, li in pairs:
-            lbl = classes[li]
-            if ci in assigned_cols or lbl in assigned_lbls:
-                continue
-            if p < threshold:
+        result: List[Tuple[int, str, float]] = []
+        for k in order:
+            ci, li = divmod(int(k), n_lbls)
+            p = float(sub[ci, li])
+            if p < min_p:
+                break
+            if ci in assigned_cols or li in assigned_lbls:
                 continue
             assigned_cols.add(ci)
-            assigned_lbls.add(lbl)
-            result[columns[ci]] = (lbl, p)
-        return result
+            assigned_lbls.add(li)
+            result.append((ci, lbls[li], p))
+            if len(assigned_cols) == len(columns) or len(assigned_lbls) == n_lbls:
+                break
+        return tuple(result)
 
-    def _augment(self, s: str) -> List[str]:
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _augment(s: str) -> Tuple[str, ...]:
         s = str(s)
         cand = {
             s,
@@ -137,4 +164,4 @@ class ColumnMapper:
             s.replace('_', ' '),
             s.replace('/', ' '),
         }
-        return list(cand)
+        return tuple(cand)
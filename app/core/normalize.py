@@ -12,7 +12,7 @@ import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from config import load_exchange_mappings, config
-from price_fetch import fetch_price
+from price_fetch import get_price_fetcher, price_key
 from ml_mapper import ColumnMapper
 
 
@@ -30,8 +30,10 @@ def normalize_csv(
     output_file: str = 'output/normalized.csv',
     remove_duplicates: bool = False,
     fetch_missing_prices: bool = False,
-    sheet_name: Optional[str] = None
-) -> None:
+    sheet_name: Optional[str] = None,
+    price_lookup: Optional[Dict[tuple, Optional[float]]] = None,
+    encoding: Optional[str] = None
+) -> pd.DataFrame:
     """
     Normalize exchange CSV/XLSX to standard transaction format.
     
@@ -42,6 +44,12 @@ def normalize_csv(
         remove_duplicates: Whether to remove duplicate transactions
         fetch_missing_prices: Whether to fetch missing price data
         sheet_name: Sheet name for XLSX files (default: first sheet)
+        price_lookup: Prefetched prices keyed by price_fetch.price_key();
+            missing keys are fetched in one batch
+        encoding: CSV encoding, e.g. as settled by auto-detection (default: UTF-8)
+    
+    Returns:
+        The normalized transactions, as written to output_file
     """
     # Load exchange mappings
     try:
@@ -70,11 +78,11 @@ def normalize_csv(
             if file_size > 50 * 1024 * 1024:  # 50MB
                 logger.info(f"Large file detected ({file_size / 1024 / 1024:.1f}MB), using chunked reading")
                 chunks = []
-                for chunk in pd.read_csv(input_file, chunksize=10000):
+                for chunk in pd.read_csv(input_file, chunksize=10000, encoding=encoding):
                     chunks.append(chunk)
                 df = pd.concat(chunks, ignore_index=True)
             else:
-                df = pd.read_csv(input_file)
+                df = pd.read_csv(input_file, encoding=encoding)
         
         if df.empty:
             raise ValueError("Input file is empty or has no data.")
@@ -222,7 +230,7 @@ def normalize_csv(
     
     # Fetch missing prices if requested
     if fetch_missing_prices and 'quote_amount' in df.columns:
-        _fetch_missing_prices(df)
+        _fetch_missing_prices(df, price_lookup)
     
     # Validate transaction types
     if 'type' in df.columns:
@@ -258,10 +266,12 @@ def normalize_csv(
 
     # Save normalized CSV
     os.makedirs(os.path.dirname(output_file), exist_ok=True)
-    df[standard_cols].to_csv(output_file, index=False)
+    normalized = df[standard_cols]
+    normalized.to_csv(output_file, index=False)
     
     logger.info(f"Normalized CSV saved to {output_file}")
     print(f"Normalized CSV saved to {output_file}")
+    return normalized
 
 
 def parse_pair(pair: str) -> tuple:
@@ -301,9 +311,13 @@ def parse_pair(pair: str) -> tuple:
     return pair, None
 
 
-def _fetch_missing_prices(df: pd.DataFrame) -> None:
+def _fetch_missing_prices(
+    df: pd.DataFrame, 
+    price_lookup: Optional[Dict[tuple, Optional[float]]] = None
+) -> None:
     """Fetch missing price data for transactions with zero quote_amount."""
-    mask = (df['quote_amount'] == 0) | df['quote_amount'].isna()
+    mask = ((df['quote_amount'] == 0) | df['quote_amount'].isna()) \
+        & df['base_asset'].notna() & df['timestamp'].notna()
     missing_count = mask.sum()
     
     if missing_count == 0:
@@ -311,24 +325,28 @@ def _fetch_missing_prices(df: pd.DataFrame) -> None:
     
     logger.info(f"Fetching prices for {missing_count} transactions with missing price data")
     
-    for idx in df[mask].index:
-        row = df.loc[idx]
-        if pd.isna(row['base_asset']) or pd.isna(row['timestamp']):
-            continue
-            
+    rows = df.loc[mask]
+    currencies = rows['quote_asset'].fillna('usd') if 'quote_asset' in rows.columns else pd.Series('usd', index=rows.index)
+    keys = pd.Series(
+        [price_key(a, ts, c) for a, ts, c in zip(rows['base_asset'], rows['timestamp'], currencies)],
+        index=rows.index
+    )
+    
+    # Resolve each unique (asset, date, currency) once instead of once per row
+    lookup = dict(price_lookup or {})
+    unresolved = set(keys) - lookup.keys()
+    if unresolved:
         try:
-            price = fetch_price(
-                row['base_asset'], 
-                pd.to_datetime(row['timestamp']), 
-                row.get('quote_asset', 'usd')
-            )
-            if price:
-                df.at[idx, 'quote_amount'] = price * row['base_amount']
-                logger.debug(f"Fetched price for {row['base_asset']}: {price}")
-            else:
-                logger.warning(f"Could not fetch price for {row['base_asset']} at {row['timestamp']}")
+            lookup.update(get_price_fetcher().prefetch_prices(unresolved))
         except Exception as e:
-            logger.warning(f"Price fetch failed for {row['base_asset']}: {e}")
+            logger.warning(f"Price fetch failed: {e}")
+    
+    prices = pd.to_numeric(keys.map(lookup), errors='coerce')
+    found = prices.notna() & (prices != 0)
+    df.loc[found[found].index, 'quote_amount'] = prices[found] * df.loc[found[found].index, 'base_amount']
+    
+    if (~found).any():
+        logger.warning(f"Could not fetch prices for {(~found).sum()} transactions")
 
 
 def _validate_transaction_types(df: pd.DataFrame) -> None:
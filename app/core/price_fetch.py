@@ -3,8 +3,10 @@
 import requests
 import time
 import logging
-from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Dict, Any, Iterable, Tuple
 import json
 import os
 from pathlib import Path
@@ -15,8 +17,74 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from config import config
 
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    FCNTL_AVAILABLE = False
+
+try:
+    import msvcrt
+    MSVCRT_AVAILABLE = True
+except ImportError:
+    MSVCRT_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# Concurrent CoinGecko requests allowed during batch prefetch
+MAX_PRICE_WORKERS = 4
+
+PriceKey = Tuple[str, str, str]
+
+
+class _FileLock:
+    """Exclusive lock on a sidecar file, shared by every process on the machine."""
+    
+    def __init__(self, path: Path):
+        self.path = path
+        self._file = None
+    
+    def __enter__(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, 'a+')
+        if FCNTL_AVAILABLE:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+        elif MSVCRT_AVAILABLE:
+            self._file.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(self._file.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        try:
+            if FCNTL_AVAILABLE:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+            elif MSVCRT_AVAILABLE:
+                self._file.seek(0)
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+        finally:
+            self._file.close()
+
+
+def price_key(asset: str, date: Any, vs_currency: str = 'usd') -> PriceKey:
+    """
+    Build the lookup key used for batch-fetched prices.
+    
+    Args:
+        asset: Asset symbol
+        date: Date as datetime or 'YYYY-MM-DD' string
+        vs_currency: Currency the price is quoted in
+    
+    Returns:
+        (ASSET, 'YYYY-MM-DD', currency) tuple
+    """
+    date_str = date.strftime('%Y-%m-%d') if hasattr(date, 'strftime') else str(date)[:10]
+    return str(asset).upper(), date_str, str(vs_currency).lower()
+
 
 class PriceFetcher:
     """Handles fetching and caching of cryptocurrency prices."""
@@ -28,7 +96,10 @@ class PriceFetcher:
         self.cache_enabled = config.getboolean('processing', 'cache_prices', True)
         self.cache_dir = Path('output/cache')
         self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.bulk_cache_path = Path('output/.price_cache.json')
         self.last_request_time = 0
+        self._rate_lock = threading.Lock()
+        self.session = requests.Session()
         
         # Asset ID mapping for CoinGecko
         self.asset_id_map = self._load_asset_id_map()
@@ -105,7 +176,7 @@ class PriceFetcher:
             
             logger.debug(f"Fetching price for {asset} ({asset_id}) on {date_str}")
             
-            response = requests.get(url, params=params, timeout=self.timeout)
+            response = self.session.get(url, params=params, timeout=self.timeout)
             response.raise_for_status()
             
             data = response.json()
@@ -157,6 +228,138 @@ class PriceFetcher:
         
         return results
     
+    def prefetch_prices(
+        self, 
+        requests_list: Iterable[Tuple[str, Any, str]], 
+        max_workers: int = MAX_PRICE_WORKERS
+    ) -> Dict[PriceKey, Optional[float]]:
+        """
+        Fetch daily prices for many requests with one range query per asset.
+        
+        Requests are grouped by (asset, vs_currency) and each group is
+        resolved with a single ``market_chart/range`` call spanning its
+        dates. Groups are fetched concurrently and results are persisted
+        to a shared JSON cache keyed by asset, date and currency.
+        
+        Args:
+            requests_list: Iterable of (asset, date, vs_currency) tuples
+            max_workers: Maximum number of concurrent API requests
+        
+        Returns:
+            Dictionary mapping price_key() tuples to prices (None if unavailable)
+        """
+        keys = {price_key(*request) for request in requests_list}
+        if not keys:
+            return {}
+        
+        cache = self._load_bulk_cache() if self.cache_enabled else {}
+        results: Dict[PriceKey, Optional[float]] = {}
+        pending: Dict[Tuple[str, str], set] = {}
+        fetched_prices: Dict[str, float] = {}
+        
+        for key in keys:
+            cached = cache.get('|'.join(key))
+            if cached is not None:
+                results[key] = cached
+            else:
+                pending.setdefault((key[0], key[2]), set()).add(key[1])
+        
+        if pending:
+            logger.info(f"Fetching prices for {len(keys) - len(results)} asset-days "
+                        f"across {len(pending)} assets")
+            workers = max(1, min(max_workers, len(pending)))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                fetched = executor.map(
+                    lambda group: self._fetch_price_range(group[0], group[1], pending[group]),
+                    list(pending)
+                )
+                for (asset, vs_currency), daily in zip(list(pending), fetched):
+                    for date_str in pending[(asset, vs_currency)]:
+                        price = daily.get(date_str)
+                        results[(asset, date_str, vs_currency)] = price
+                        if price is not None:
+                            fetched_prices['|'.join((asset, date_str, vs_currency))] = price
+            
+            if self.cache_enabled and fetched_prices:
+                self._save_bulk_cache(fetched_prices)
+        
+        return results
+    
+    def _fetch_price_range(self, asset: str, vs_currency: str, dates: set) -> Dict[str, float]:
+        """Fetch daily prices for an asset covering every date in ``dates``."""
+        asset_id = self._get_asset_id(asset)
+        if not asset_id:
+            logger.warning(f"No CoinGecko ID mapping found for asset: {asset}")
+            return {}
+        
+        try:
+            start = datetime.strptime(min(dates), '%Y-%m-%d').replace(tzinfo=timezone.utc)
+            end = datetime.strptime(max(dates), '%Y-%m-%d').replace(tzinfo=timezone.utc) + timedelta(days=1)
+        except ValueError as e:
+            logger.error(f"Invalid date in price request for {asset}: {e}")
+            return {}
+        
+        self._rate_limit()
+        
+        try:
+            url = f"{self.base_url}/coins/{asset_id}/market_chart/range"
+            params = {
+                'vs_currency': vs_currency,
+                'from': int(start.timestamp()),
+                'to': int(end.timestamp())
+            }
+            
+            logger.debug(f"Fetching {asset} ({asset_id}) prices from {min(dates)} to {max(dates)}")
+            
+            response = self.session.get(url, params=params, timeout=self.timeout)
+            response.raise_for_status()
+            
+            # Keep the first sample of each UTC day, matching /history's 00:00 price
+            daily: Dict[str, float] = {}
+            for timestamp_ms, price in response.json().get('prices', []):
+                day = datetime.fromtimestamp(timestamp_ms / 1000, tz=timezone.utc).strftime('%Y-%m-%d')
+                if day not in daily and price is not None:
+                    daily[day] = float(price)
+            return daily
+        
+        except requests.exceptions.RequestException as e:
+            logger.error(f"API request failed for {asset}: {e}")
+            return {}
+        except (KeyError, ValueError, TypeError) as e:
+            logger.error(f"Error parsing price range for {asset}: {e}")
+            return {}
+    
+    def _load_bulk_cache(self) -> Dict[str, float]:
+        """Load the shared price cache written by prefetch_prices."""
+        try:
+            with open(self.bulk_cache_path, 'r') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError, ValueError):
+            return {}
+    
+    def _save_bulk_cache(self, new_prices: Dict[str, float]) -> None:
+        """
+        Merge newly fetched prices into the shared price cache.
+        
+        Several normalize processes may prefetch at once. Under a lock file
+        the cache is re-read, merged and replaced atomically, so concurrent
+        writers keep each other's entries and a reader never sees a
+        half-written file.
+        """
+        try:
+            lock_path = self.bulk_cache_path.with_name(self.bulk_cache_path.name + '.lock')
+            with _FileLock(lock_path):
+                cache = self._load_bulk_cache()
+                cache.update(new_prices)
+                tmp_path = self.bulk_cache_path.with_name(
+                    f"{self.bulk_cache_path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+                )
+                with open(tmp_path, 'w') as f:
+                    json.dump(cache, f)
+                os.replace(tmp_path, self.bulk_cache_path)
+        except Exception as e:
+            logger.warning(f"Failed to write price cache: {e}")
+    
     def _get_asset_id(self, asset: str) -> Optional[str]:
         """Get CoinGecko asset ID for a given symbol."""
         asset = asset.upper()
@@ -171,14 +374,15 @@ class PriceFetcher:
     
     def _rate_limit(self) -> None:
         """Implement rate limiting for API requests."""
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
-        
-        if time_since_last < self.rate_limit_delay:
-            sleep_time = self.rate_limit_delay - time_since_last
-            time.sleep(sleep_time)
-        
-        self.last_request_time = time.time()
+        with self._rate_lock:
+            current_time = time.time()
+            time_since_last = current_time - self.last_request_time
+            
+            if time_since_last < self.rate_limit_delay:
+                sleep_time = self.rate_limit_delay - time_since_last
+                time.sleep(sleep_time)
+            
+            self.last_request_time = time.time()
     
     def _get_cache_path(self, asset: str, date: datetime, vs_currency: str) -> Path:
         """Get cache file path for a price request."""
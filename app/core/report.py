@@ -14,6 +14,13 @@ except ImportError:
     FPDF_AVAILABLE = False
     logging.warning("fpdf2 not available. PDF reports will be disabled.")
 
+try:
+    import pyarrow as pa
+    from pyarrow import csv as pacsv
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
@@ -30,13 +37,15 @@ class ReportGenerator:
         self.output_dir = output_dir or config.get('output', 'reports_dir', 'output/reports')
         os.makedirs(self.output_dir, exist_ok=True)
     
-    def generate_turbotax_report(self, gains_file: str = None, output_file: str = None) -> str:
+    def generate_turbotax_report(self, gains_file: str = None, output_file: str = None, 
+                                 gains_df: Optional[pd.DataFrame] = None) -> str:
         """
         Generate TurboTax-compatible CSV report from gains/losses data.
         
         Args:
             gains_file: Path to gains/losses CSV file
             output_file: Output path for TurboTax CSV
+            gains_df: Already-loaded gains/losses data (skips reading gains_file)
             
         Returns:
             Path to generated TurboTax report
@@ -47,11 +56,14 @@ class ReportGenerator:
         if output_file is None:
             output_file = os.path.join(self.output_dir, 'turbotax_import.csv')
         
-        try:
-            df = pd.read_csv(gains_file)
-        except FileNotFoundError:
-            logger.error(f"Gains file not found: {gains_file}")
-            raise
+        if gains_df is not None:
+            df = gains_df
+        else:
+            try:
+                df = pd.read_csv(gains_file)
+            except FileNotFoundError:
+                logger.error(f"Gains file not found: {gains_file}")
+                raise
         
         if df.empty:
             logger.warning("No gains/losses data to export")
@@ -74,7 +86,7 @@ class ReportGenerator:
         turbotax_df = turbotax_df.sort_values('Date Sold')
         
         # Save to CSV
-        turbotax_df.to_csv(output_file, index=False)
+        _write_csv(turbotax_df, output_file)
         
         logger.info(f"TurboTax report saved to {output_file}")
         logger.info(f"Generated {len(turbotax_df)} capital gains/loss entries")
@@ -326,7 +338,7 @@ class ReportGenerator:
         return output_file
     
     def generate_detailed_report(self, gains_file: str = None, income_file: str = None, 
-                               output_file: str = None) -> str:
+                               output_file: str = None, gains_df: Optional[pd.DataFrame] = None) -> str:
         """
         Generate detailed CSV report with all transaction information.
         
@@ -334,6 +346,7 @@ class ReportGenerator:
             gains_file: Path to gains/losses CSV
             income_file: Path to income events CSV
             output_file: Output path for detailed report
+            gains_df: Already-loaded gains/losses data (skips reading gains_file)
             
         Returns:
             Path to generated detailed report
@@ -342,7 +355,6 @@ class ReportGenerator:
             output_file = os.path.join(self.output_dir, 'detailed_tax_report.csv')
         
         # Load data files
-        gains_df = pd.DataFrame()
         income_df = pd.DataFrame()
         
         if gains_file is None:
@@ -351,11 +363,13 @@ class ReportGenerator:
         if income_file is None:
             income_file = os.path.join(self.output_dir, 'income_events.csv')
         
-        try:
-            if os.path.exists(gains_file):
-                gains_df = pd.read_csv(gains_file)
-        except Exception as e:
-            logger.warning(f"Could not load gains file: {e}")
+        if gains_df is None:
+            gains_df = pd.DataFrame()
+            try:
+                if os.path.exists(gains_file):
+                    gains_df = pd.read_csv(gains_file)
+            except Exception as e:
+                logger.warning(f"Could not load gains file: {e}")
         
         try:
             if os.path.exists(income_file):
@@ -472,10 +486,20 @@ class ReportGenerator:
         return output_file
 
 
-def generate_turbotax_report(gains_file: str = None, output_file: str = None) -> str:
+def _write_csv(df: pd.DataFrame, output_file: str) -> None:
+    """Write a report frame to CSV, using Arrow's writer when available."""
+    if PYARROW_AVAILABLE:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        pacsv.write_csv(table, output_file, write_options=pacsv.WriteOptions(quoting_style='needed'))
+    else:
+        df.to_csv(output_file, index=False)
+
+
+def generate_turbotax_report(gains_file: str = None, output_file: str = None, 
+                             gains_df: pd.DataFrame = None) -> str:
     """Convenience function to generate TurboTax report."""
     generator = ReportGenerator()
-    return generator.generate_turbotax_report(gains_file, output_file)
+    return generator.generate_turbotax_report(gains_file, output_file, gains_df)
 
 
 def generate_pdf_summary(gains_df: pd.DataFrame = None, income: float = 0, 
@@ -502,7 +526,7 @@ def generate_all_reports(gains_df: pd.DataFrame = None, income: float = 0,
     reports = {}
     
     try:
-        reports['turbotax'] = generator.generate_turbotax_report()
+        reports['turbotax'] = generator.generate_turbotax_report(gains_df=gains_df)
     except Exception as e:
         logger.error(f"Failed to generate TurboTax report: {e}")
     
@@ -512,7 +536,7 @@ def generate_all_reports(gains_df: pd.DataFrame = None, income: float = 0,
         logger.error(f"Failed to generate PDF summary: {e}")
     
     try:
-        reports['detailed'] = generator.generate_detailed_report()
+        reports['detailed'] = generator.generate_detailed_report(gains_df=gains_df)
     except Exception as e:
         logger.error(f"Failed to generate detailed report: {e}")
     
@@ -2,18 +2,20 @@
 
 import pandas as pd
 import logging
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable, Optional, Set, Union
 from datetime import datetime, timedelta
 
 logger = logging.getLogger(__name__)
 
 
-def validate_df(df: pd.DataFrame, required_cols: List[str] = None) -> Dict[str, Any]:
+def validate_df(df: Union[pd.DataFrame, Iterable[pd.DataFrame]],
+                required_cols: List[str] = None) -> Dict[str, Any]:
     """
     Validate normalized transaction DataFrame for data quality issues.
     
     Args:
-        df: Normalized transaction DataFrame
+        df: Normalized transaction DataFrame, or an iterable of DataFrame chunks
+            (e.g. from ``pd.read_csv(..., chunksize=N)``)
         required_cols: List of required column names
         
     Returns:
@@ -22,6 +24,9 @@ def validate_df(df: pd.DataFrame, required_cols: List[str] = None) -> Dict[str,
     if required_cols is None:
         required_cols = ['timestamp', 'type', 'base_asset', 'base_amount']
     
+    if not isinstance(df, pd.DataFrame):
+        return _validate_chunks(df, required_cols)
+    
     validation_results = {
         'total_transactions': len(df),
         'errors': [],
@@ -79,12 +84,90 @@ def validate_df(df: pd.DataFrame, required_cols: List[str] = None) -> Dict[str,
     return validation_results
 
 
-def check_duplicates(df: pd.DataFrame) -> int:
+def _validate_chunks(chunks: Iterable[pd.DataFrame], required_cols: List[str]) -> Dict[str, Any]:
+    """
+    Validate a stream of DataFrame chunks, merging per-chunk statistics.
+    
+    Duplicate detection and balance tracking carry state across chunks, so for
+    time-ordered input (as written by normalize_csv) the results match
+    validating the whole file at once while only one chunk is held in memory.
+    
+    Args:
+        chunks: Iterable of normalized transaction DataFrames
+        required_cols: List of required column names
+    
+    Returns:
+        Dictionary with validation results and statistics
+    """
+    validation_results = {
+        'total_transactions': 0,
+        'errors': [],
+        'warnings': [],
+        'duplicates_found': 0,
+        'negative_balances': [],
+        'invalid_dates': 0,
+        'missing_data': {}
+    }
+    
+    seen_keys: Set[int] = set()
+    balances: Dict[str, float] = {}
+    negative_amounts = 0
+    non_numeric: Dict[str, int] = {}
+    
+    chunks = iter(chunks)
+    for chunk in chunks:
+        validation_results['total_transactions'] += len(chunk)
+        
+        # All chunks share the header, so the first one decides
+        missing_cols = [col for col in required_cols if col not in chunk.columns]
+        if missing_cols:
+            error_msg = f"Missing required columns: {missing_cols}"
+            validation_results['errors'].append(error_msg)
+            logger.error(error_msg)
+            # Still count the remaining rows so the total matches validate_df
+            # on the whole file
+            validation_results['total_transactions'] += sum(len(rest) for rest in chunks)
+            return validation_results
+        
+        validation_results['duplicates_found'] += check_duplicates(chunk, seen_keys=seen_keys)
+        negative_amounts += check_negative_amounts(chunk)
+        validation_results['negative_balances'].extend(check_balances(chunk, balances=balances))
+        validation_results['invalid_dates'] += check_date_validity(chunk)
+        
+        for col, count in check_missing_data(chunk).items():
+            validation_results['missing_data'][col] = validation_results['missing_data'].get(col, 0) + count
+        
+        for col, count in _count_non_numeric(chunk).items():
+            non_numeric[col] = non_numeric.get(col, 0) + count
+    
+    if negative_amounts > 0:
+        warning_msg = f"Found {negative_amounts} transactions with negative amounts in buys/deposits"
+        validation_results['warnings'].append(warning_msg)
+        logger.warning(warning_msg)
+    
+    for col, count in non_numeric.items():
+        if count > 0:
+            validation_results['warnings'].append(f"Found {count} non-numeric values in {col}")
+    
+    if validation_results['errors']:
+        logger.error(f"Validation failed with {len(validation_results['errors'])} errors")
+    elif validation_results['warnings']:
+        logger.warning(f"Validation completed with {len(validation_results['warnings'])} warnings")
+    else:
+        logger.info("Data validation passed successfully")
+    
+    return validation_results
+
+
+def check_duplicates(df: pd.DataFrame, seen_keys: Optional[Set[int]] = None) -> int:
     """
     Check for duplicate transactions.
     
     Args:
         df: Transaction DataFrame
+        seen_keys: Row hashes from previously checked chunks; when given, rows
+            matching an earlier chunk also count as duplicates and the set is
+            updated in place
         
     Returns:
         Number of duplicate transactions found
@@ -97,7 +180,13 @@ def check_duplicates(df: pd.DataFrame) -> int:
         logger.warning("Insufficient columns for duplicate detection")
         return 0
     
-    duplicates = df.duplicated(subset=available_cols).sum()
+    if seen_keys is not None:
+        keys = pd.util.hash_pandas_object(df[available_cols], index=False)
+        duplicate_mask = keys.duplicated() | keys.isin(seen_keys)
+        seen_keys.update(keys.to_numpy().tolist())
+        duplicates = int(duplicate_mask.sum())
+    else:
+        duplicates = df.duplicated(subset=available_cols).sum()
     
     if duplicates > 0:
         logger.warning(f"Found {duplicates} potential duplicate transactions")
@@ -134,12 +223,14 @@ def check_negative_amounts(df: pd.DataFrame) -> int:
     return negative_count
 
 
-def check_balances(df: pd.DataFrame) -> List[Dict[str, Any]]:
+def check_balances(df: pd.DataFrame, balances: Optional[Dict[str, float]] = None) -> List[Dict[str, Any]]:
     """
     Check for negative balances by tracking each asset over time.
     
     Args:
         df: Transaction DataFrame
+        balances: Opening balance per asset; when given, closing balances are
+            written back so the next chunk continues from them
         
     Returns:
         List of assets and timestamps where negative balances occurred
@@ -157,7 +248,7 @@ def check_balances(df: pd.DataFrame) -> List[Dict[str, Any]]:
         # Sort by timestamp
         asset_df = asset_df.sort_values('timestamp')
         
-        balance = 0.0
+        balance = balances.get(asset, 0.0) if balances is not None else 0.0
         
         for _, row in asset_df.iterrows():
             transaction_type = str(row['type']).lower()
@@ -179,6 +270,9 @@ def check_balances(df: pd.DataFrame) -> List[Dict[str, Any]]:
                     'amount': amount
                 })
                 logger.warning(f"Negative balance for {asset} at {row['timestamp']}: {balance}")
+        
+        if balances is not None:
+            balances[asset] = balance
     
     return negative_balances
 
@@ -283,6 +377,23 @@ def check_data_types(df: pd.DataFrame) -> List[str]:
     return warnings
 
 
+def _count_non_numeric(df: pd.DataFrame) -> Dict[str, int]:
+    """Count non-numeric values per numeric column, for merging across chunks."""
+    counts = {}
+    
+    for col in ['base_amount', 'quote_amount', 'fee_amount']:
+        if col not in df.columns:
+            continue
+        
+        try:
+            numeric_series = pd.to_numeric(df[col], errors='coerce')
+            counts[col] = int(numeric_series.isna().sum() - df[col].isna().sum())
+        except Exception as e:
+            logger.debug(f"Error checking data types for {col}: {e}")
+    
+    return counts
+
+
 def validate_transaction_sequence(df: pd.DataFrame) -> Dict[str, Any]:
     """
     Validate the logical sequence of transactions for each asset.
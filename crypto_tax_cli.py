@@ -4,13 +4,8 @@ Crypto Tax Tool - Command Line Interface
 Professional-grade cryptocurrency tax calculations
 """
 
-import sys
-import os
-from pathlib import Path
-
-# Add app to path
-sys.path.insert(0, str(Path(__file__).parent / "app"))
-
+# The project root is on sys.path when this script runs, so the package
+# imports below resolve without any path manipulation.
 from app.cli.main import main
 
 if __name__ == "__main__":
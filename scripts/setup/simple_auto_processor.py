@@ -123,7 +123,7 @@ def auto_process_files(input_dir: str, output_dir: str) -> List[Dict[str, Any]]:
             # Normalize file
             output_file = os.path.join(output_dir, f"{file_path.stem}_normalized.csv")
             
-            normalize_csv(
+            normalized_df = normalize_csv(
                 input_file=str(file_path),
                 exchange=exchange,
                 output_file=output_file,
@@ -136,7 +136,7 @@ def auto_process_files(input_dir: str, output_dir: str) -> List[Dict[str, Any]]:
                 "normalized_file": output_file,
                 "exchange": exchange,
                 "confidence": confidence,
-                "rows": len(pd.read_csv(output_file))
+                "rows": len(normalized_df)
             })
             
             log_message(f" Processed {file_path.name} as {exchange} ({confidence:.1%})")
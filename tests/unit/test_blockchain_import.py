@@ -0,0 +1,311 @@
+"""Unit tests for the blockchain importer, with the explorer APIs mocked."""
+
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from app.core import blockchain_import
+from app.core.blockchain_import import BlockchainImporter
+
+BTC_ADDRESS = '1BtcAddr'
+
+
+class FakeResponse:
+    """Minimal stand-in for requests.Response."""
+    
+    def __init__(self, payload):
+        self.content = json.dumps(payload).encode('utf-8')
+        self.headers = {}
+    
+    def raise_for_status(self):
+        pass
+    
+    def json(self):
+        return json.loads(self.content)
+
+
+def _scan_importer(replies):
+    """Build an importer whose explorer calls return ``replies`` in order."""
+    importer = BlockchainImporter()
+    calls = []
+    
+    def fake_get(url, params=None, **kwargs):
+        calls.append(dict(params))
+        return FakeResponse(replies.pop(0))
+    
+    importer._get = fake_get
+    return importer, calls
+
+
+RATE_LIMITED = {'status': '0', 'message': 'NOTOK', 'result': 'Max rate limit reached'}
+
+
+def _evm_tx(index, block):
+    """Build an Etherscan transaction sent from the test wallet."""
+    return {
+        'hash': f'0x{index}',
+        'blockNumber': str(block),
+        'timeStamp': str(block * 100),
+        'from': '0xWallet',
+        'value': '1000000000000000000',
+        'gasUsed': '21000',
+        'gasPrice': '1000000000'
+    }
+
+
+def _window_importer(txs):
+    """Build an importer whose explorer serves ``txs`` through a result window."""
+    importer = BlockchainImporter()
+    queries = []
+    
+    def fake_fetch_page(url, params, page):
+        queries.append(dict(params))
+        matching = [tx for tx in txs if int(tx['blockNumber']) >= int(params['startblock'])]
+        return matching[:int(params['offset'])]
+    
+    importer._fetch_scan_page = fake_fetch_page
+    return importer, queries
+
+
+def _scan_hashes(pages):
+    """Flatten result pages into the list of transaction hashes."""
+    return [tx['hash'] for page in pages for tx in page]
+
+
+def _btc_tx(index, input_value, output_value=1000):
+    """Build a blockchain.info transaction spending from BTC_ADDRESS."""
+    return {
+        'hash': f'btc{index}',
+        'time': 1680000000 + index,
+        'inputs': [{'prev_out': {'addr': BTC_ADDRESS, 'value': input_value}}],
+        'out': [{'addr': 'other', 'value': output_value}]
+    }
+
+
+class TestBitcoinProcessing:
+    """Test reduction of blockchain.info transactions."""
+    
+    def setup_method(self):
+        blockchain_import._btc_cache.clear()
+    
+    def test_null_value_drops_only_that_transaction(self):
+        """Test a null satoshi value drops its transaction instead of producing NaN."""
+        txs = [_btc_tx(0, 5000), _btc_tx(1, None), _btc_tx(2, 7000)]
+        
+        page = BlockchainImporter()._process_bitcoin_transactions(txs, BTC_ADDRESS, None, None)
+        
+        assert page['notes'] == ['Bitcoin tx: btc0', 'Bitcoin tx: btc2']
+        assert list(page['type']) == ['sell', 'sell']
+        assert np.isfinite(page['base_amount']).all()
+        assert (BTC_ADDRESS, 'btc1') not in blockchain_import._btc_cache
+    
+    def test_string_time_is_accepted(self):
+        """Test numeric strings in the time field decode like integers."""
+        tx = _btc_tx(0, 5000)
+        tx['time'] = str(tx['time'])
+        
+        page = BlockchainImporter()._process_bitcoin_transactions([tx], BTC_ADDRESS, None, None)
+        
+        assert list(page['timestamp']) == [1680000000]
+
+
+class TestScanRateLimit:
+    """Test pacing and rate-limit handling for Etherscan-compatible explorers."""
+    
+    def test_default_pacing_has_no_burst(self):
+        """Test the default bucket does not let a burst through at start."""
+        assert BlockchainImporter().rate_limiter.burst == 1
+    
+    def test_rate_limit_reply_is_retried(self, monkeypatch):
+        """Test a rate-limit reply is retried with backoff instead of failing the import."""
+        sleeps = []
+        monkeypatch.setattr(blockchain_import.time, 'sleep', sleeps.append)
+        txs = [{'blockNumber': '1', 'timeStamp': '1', 'hash': 'a'}]
+        importer, calls = _scan_importer([RATE_LIMITED, RATE_LIMITED, {'status': '1', 'result': txs}])
+        
+        assert importer._fetch_scan_page('url', {'action': 'txlist'}, 1) == txs
+        assert len(calls) == 3
+        assert sleeps == [1.0, 2.0]
+    
+    def test_rate_limit_gives_up_after_retries(self, monkeypatch):
+        """Test a persistent rate limit eventually raises APIError."""
+        monkeypatch.setattr(blockchain_import.time, 'sleep', lambda seconds: None)
+        replies = [RATE_LIMITED] * (blockchain_import.SCAN_RATE_LIMIT_RETRIES + 1)
+        importer, calls = _scan_importer(replies)
+        
+        with pytest.raises(blockchain_import.APIError):
+            importer._fetch_scan_page('url', {'action': 'txlist'}, 1)
+        assert len(calls) == blockchain_import.SCAN_RATE_LIMIT_RETRIES + 1
+
+
+class TestScanPaging:
+    """Test block-cursor paging through the explorer result window."""
+    
+    def params(self, offset=3):
+        """Build a txlist query with a small result window."""
+        return {**BlockchainImporter()._scan_params('txlist', '0xWallet'), 'offset': offset}
+    
+    def test_window_cut_inside_block_is_refetched(self):
+        """Test rows of a block cut by the window are fetched once, from the next query."""
+        txs = [_evm_tx(i, block) for i, block in enumerate([1, 2, 2, 3, 3, 4])]
+        importer, queries = _window_importer(txs)
+        
+        pages = importer._fetch_scan_pages('url', self.params())
+        
+        assert _scan_hashes(pages) == [tx['hash'] for tx in txs]
+        assert [query['startblock'] for query in queries] == [0, 2, 3, 4]
+    
+    def test_single_block_overflow_warns(self, caplog):
+        """Test a block holding more than a window of rows is warned about and skipped past."""
+        txs = [_evm_tx(i, block) for i, block in enumerate([1, 1, 1, 1, 2])]
+        importer, queries = _window_importer(txs)
+        
+        with caplog.at_level('WARNING'):
+            pages = importer._fetch_scan_pages('url', self.params())
+        
+        assert _scan_hashes(pages) == ['0x0', '0x1', '0x2', '0x4']
+        assert [query['startblock'] for query in queries] == [0, 2]
+        assert 'Block 1 has more than 3 txlist records' in caplog.text
+    
+    def test_stops_after_end_timestamp(self):
+        """Test no further query is made once a page runs past the end of the range."""
+        txs = [_evm_tx(i, block) for i, block in enumerate([1, 2, 2, 3, 3, 4])]
+        importer, queries = _window_importer(txs)
+        
+        pages = importer._fetch_scan_pages('url', self.params(), end_timestamp=150)
+        
+        assert len(queries) == 1
+        assert _scan_hashes(pages) == ['0x0', '0x1', '0x2']
+    
+    def test_short_page_is_last(self):
+        """Test a page shorter than the window ends paging."""
+        txs = [_evm_tx(i, block) for i, block in enumerate([1, 2])]
+        importer, queries = _window_importer(txs)
+        
+        pages = importer._fetch_scan_pages('url', self.params())
+        
+        assert len(queries) == 1
+        assert _scan_hashes(pages) == ['0x0', '0x1']
+    
+    def test_empty_account(self):
+        """Test status '0' with an empty result means no transactions."""
+        importer, calls = _scan_importer([{'status': '0', 'message': 'No transactions found', 'result': []}])
+        
+        assert importer._fetch_scan_pages('url', self.params()) == []
+        assert len(calls) == 1
+    
+    def test_error_text_raises(self):
+        """Test status '0' with an error text raises instead of reading as an empty account."""
+        importer, calls = _scan_importer([{'status': '0', 'message': 'NOTOK', 'result': 'Invalid API Key'}])
+        
+        with pytest.raises(blockchain_import.APIError, match='Invalid API Key'):
+            importer._fetch_scan_pages('url', self.params())
+        assert len(calls) == 1
+
+
+class TestBlockRange:
+    """Test narrowing the queried block range to the requested dates."""
+    
+    def test_dates_resolve_to_blocks(self):
+        """Test start and end dates are resolved with getblocknobytime."""
+        importer, calls = _scan_importer([{'status': '1', 'result': '100'}, {'status': '1', 'result': '200'}])
+        
+        block_range = importer._block_range('url', datetime(2023, 1, 1), datetime(2023, 12, 31))
+        
+        assert block_range == (100, 200)
+        assert [call['closest'] for call in calls] == ['after', 'before']
+        assert calls[0]['timestamp'] == 1672531200
+    
+    def test_unresolved_date_keeps_full_range(self):
+        """Test a failed lookup falls back to the unbounded block range."""
+        importer, calls = _scan_importer([{'status': '0', 'message': 'NOTOK', 'result': 'Error!'}])
+        
+        block_range = importer._block_range('url', datetime(2023, 1, 1), None)
+        
+        assert block_range == (blockchain_import.FIRST_BLOCK, blockchain_import.LAST_BLOCK)
+        assert len(calls) == 1
+
+
+class TestEvmProcessing:
+    """Test decoding of Etherscan result pages."""
+    
+    def test_malformed_row_drops_only_that_transaction(self):
+        """Test a row missing a field is dropped while the rest of the page decodes."""
+        txs = [_evm_tx(i, block) for i, block in enumerate([1, 2, 3])]
+        del txs[1]['value']
+        
+        page = BlockchainImporter()._process_evm_page(
+            txs, '0xwallet', blockchain_import.EVM_CHAINS['ethereum'], None, None)
+        
+        assert page['notes'] == ['Ethereum tx: 0x0', 'Ethereum tx: 0x2']
+        assert list(page['type']) == ['sell', 'sell']
+        assert np.allclose(page['base_amount'], 1.0)
+        assert np.allclose(page['fee_amount'], 21000 * 1e9 / 1e18)
+
+
+class TestBitcoinPaging:
+    """Test offset paging through the blockchain.info address history."""
+    
+    def setup_method(self):
+        blockchain_import._btc_cache.clear()
+    
+    def test_pages_until_history_is_exhausted(self, monkeypatch):
+        """Test every page is requested with the running offset."""
+        monkeypatch.setattr(blockchain_import, 'BTC_PAGE_SIZE', 2)
+        txs = [_btc_tx(i, 5000) for i in range(5)]
+        importer = BlockchainImporter()
+        offsets = []
+        
+        def fake_get(url, params=None, **kwargs):
+            offsets.append(params['offset'])
+            page = txs[params['offset']:params['offset'] + params['limit']]
+            return FakeResponse({'n_tx': len(txs), 'txs': page})
+        
+        importer._get = fake_get
+        df = importer.import_bitcoin_transactions(BTC_ADDRESS)
+        
+        assert offsets == [0, 2, 4]
+        assert list(df['notes']) == [f'Bitcoin tx: btc{i}' for i in range(5)]
+    
+    def test_totals_are_cached_with_a_bound(self, monkeypatch):
+        """Test totals are reused across imports and the cache evicts its oldest entries."""
+        monkeypatch.setattr(blockchain_import, 'BTC_CACHE_SIZE', 2)
+        importer = BlockchainImporter()
+        
+        importer._bitcoin_totals([_btc_tx(i, 5000) for i in range(3)], BTC_ADDRESS)
+        
+        assert list(blockchain_import._btc_cache) == [(BTC_ADDRESS, 'btc1'), (BTC_ADDRESS, 'btc2')]
+        
+        # A cached entry is served without walking the transaction again
+        inputs, outputs = BlockchainImporter()._bitcoin_totals([{'hash': 'btc2'}], BTC_ADDRESS)
+        assert inputs.tolist() == [5000.0]
+        assert outputs.tolist() == [0.0]
+
+
+class TestTimestamps:
+    """Test that imported timestamps and date bounds are UTC."""
+    
+    def setup_method(self):
+        blockchain_import._btc_cache.clear()
+    
+    def test_naive_dates_are_utc(self):
+        """Test timestamps come out as naive UTC and naive bounds are read as UTC."""
+        txs = [_btc_tx(0, 5000), _btc_tx(1, 5000)]
+        txs[1]['time'] = txs[0]['time'] + 86400
+        importer = BlockchainImporter()
+        importer._get = lambda url, params=None, **kwargs: FakeResponse({'n_tx': 2, 'txs': txs})
+        
+        df = importer.import_bitcoin_transactions(BTC_ADDRESS, start_date=datetime(2023, 3, 28, 10, 40))
+        
+        assert df['timestamp'].tolist() == [pd.Timestamp('2023-03-28 10:40:00'), pd.Timestamp('2023-03-29 10:40:00')]
+        
+        df = importer.import_bitcoin_transactions(BTC_ADDRESS, start_date=datetime(2023, 3, 28, 10, 41))
+        
+        assert df['notes'].tolist() == ['Bitcoin tx: btc1']
@@ -2,10 +2,58 @@ import os
 import sys
 from pathlib import Path
 
+import pytest
+
 sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
 
 from app.core.ml_mapper import ColumnMapper
 
+ROOT = Path(__file__).resolve().parents[2]
+
+# Mappings at normalize's 0.8 threshold for real exchange headers from
+# config/exchanges.yaml. Columns without a confident label are left out.
+EXCHANGE_MAPPINGS = {
+    'binance': (
+        ['time', 'type', 'base-asset', 'quantity', 'quote-asset', 'total', 'fee', 'fee-currency'],
+        {'time': 'timestamp', 'type': 'type', 'quantity': 'base_amount', 'total': 'quote_amount',
+         'fee': 'fee_amount'},
+    ),
+    'coinbase': (
+        ['Timestamp', 'Transaction Type', 'Asset', 'Quantity Transacted', 'Spot Price Currency',
+         'Subtotal', 'Fees and/or Spread', 'Notes'],
+        {'Timestamp': 'timestamp', 'Transaction Type': 'type', 'Subtotal': 'quote_amount',
+         'Fees and/or Spread': 'fee_amount', 'Notes': 'notes'},
+    ),
+    'kraken': (
+        ['time', 'type', 'pair', 'vol', 'cost', 'fee', 'ledgers'],
+        {'time': 'timestamp', 'type': 'type', 'pair': 'quote_asset', 'vol': 'base_amount',
+         'cost': 'quote_amount', 'fee': 'fee_amount'},
+    ),
+    'bybit': (
+        ['Time', 'Type', 'Coin', 'Change', 'Fee', 'Notes'],
+        {'Time': 'timestamp', 'Type': 'type', 'Coin': 'base_asset', 'Fee': 'fee_amount', 'Notes': 'notes'},
+    ),
+    'gate_io': (
+        ['Time_unix', 'Type', 'Currency_pair', 'Amount', 'Total', 'Fee', 'Fee_currency', 'Order_id'],
+        {'Type': 'type', 'Amount': 'base_amount', 'Total': 'quote_amount', 'Fee': 'fee_amount',
+         'Fee_currency': 'fee_asset', 'Order_id': 'notes'},
+    ),
+}
+
+
+@pytest.fixture(scope='module')
+def fitted_mapper(tmp_path_factory):
+    mapper = ColumnMapper(model_path=str(tmp_path_factory.mktemp('models') / 'ml_mapper.pkl'))
+    mapper.fit_from_yaml(str(ROOT / 'config' / 'exchanges.yaml'))
+    return mapper
+
+
+@pytest.mark.parametrize('exchange', sorted(EXCHANGE_MAPPINGS))
+def test_exchange_header_mappings(fitted_mapper, exchange):
+    cols, expected = EXCHANGE_MAPPINGS[exchange]
+    mapping = fitted_mapper.predict_mapping(cols, threshold=0.8)
+    assert {col: label for col, (label, _) in mapping.items()} == expected
+
 def test_predict_mapping_unique_labels():
     mapper = ColumnMapper()
     mapper.load_or_fit()
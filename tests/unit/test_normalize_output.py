@@ -0,0 +1,43 @@
+"""Unit tests for the DataFrame returned by normalize_csv."""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from app.core.normalize import normalize_csv
+
+
+class TestNormalizeReturnValue:
+    """Test that normalize_csv returns the frame it writes."""
+    
+    def test_returns_written_frame(self):
+        """Test the returned frame matches the output file after duplicate removal."""
+        sample_data = """time,type,base-asset,quantity,quote-asset,total,fee,fee-currency
+2024-01-01T00:00:00,buy,BTC,1.0,USDT,50000.00,25.00,USDT
+2024-01-01T00:00:00,buy,BTC,1.0,USDT,50000.00,25.00,USDT
+2024-01-02T00:00:00,sell,BTC,0.5,USDT,26000.00,13.00,USDT"""
+        
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as f:
+            f.write(sample_data)
+            input_file = f.name
+        
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as f:
+            output_file = f.name
+        
+        try:
+            result = normalize_csv(input_file, 'binance', output_file, remove_duplicates=True)
+            
+            df = pd.read_csv(output_file)
+            assert len(df) == 2
+            assert len(result) == len(df)
+            assert list(result.columns) == list(df.columns)
+            assert list(result['base_asset']) == list(df['base_asset'])
+            
+        finally:
+            os.unlink(input_file)
+            os.unlink(output_file)
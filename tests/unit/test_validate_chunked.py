@@ -0,0 +1,57 @@
+"""Unit tests for validating DataFrame chunks streamed from read_csv."""
+
+import os
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from app.core.validate import validate_df
+
+
+class TestChunkedValidation:
+    """Test validation of DataFrame chunks streamed from read_csv."""
+    
+    def _write_csv(self, temp_dir, df):
+        path = os.path.join(temp_dir, 'normalized.csv')
+        df.to_csv(path, index=False)
+        return path
+    
+    def test_chunked_matches_whole_file(self, temp_dir):
+        """Test chunked validation merges to the same result as a single pass."""
+        data = {
+            'timestamp': [f'2024-01-{day:02d}T00:00:00' for day in range(1, 11)],
+            'type': ['buy', 'sell', 'sell', 'buy', 'deposit', 'sell', 'sell', 'buy', 'sell', 'sell'],
+            'base_asset': ['BTC', 'BTC', 'BTC', 'ETH', 'ETH', 'ETH', 'ETH', 'BTC', 'BTC', 'BTC'],
+            'base_amount': [1.0, 0.5, 1.0, 2.0, -1.0, 0.5, 3.0, 1.0, 0.2, 0.2],
+            'quote_amount': [100, 'bad', 50, 40, 0, 10, 60, 100, 20, 20]
+        }
+        path = self._write_csv(temp_dir, pd.DataFrame(data))
+        
+        whole = validate_df(pd.read_csv(path))
+        chunked = validate_df(pd.read_csv(path, chunksize=3))
+        
+        assert chunked == whole
+    
+    def test_chunked_duplicates_across_chunks(self, temp_dir):
+        """Test duplicates split across chunk boundaries are still counted."""
+        row = {'timestamp': '2024-01-01T00:00:00', 'type': 'buy', 'base_asset': 'BTC', 'base_amount': 1.0}
+        path = self._write_csv(temp_dir, pd.DataFrame([row, row, row]))
+        
+        result = validate_df(pd.read_csv(path, chunksize=1))
+        
+        assert result['total_transactions'] == 3
+        assert result['duplicates_found'] == 2
+    
+    def test_chunked_missing_required_columns(self, temp_dir):
+        """Test missing columns are reported from the first chunk and every row is counted."""
+        df = pd.DataFrame({'timestamp': ['2024-01-01', '2024-01-02', '2024-01-03'], 'type': ['buy'] * 3})
+        path = self._write_csv(temp_dir, df)
+        
+        result = validate_df(pd.read_csv(path, chunksize=1))
+        
+        assert any('base_asset' in error for error in result['errors'])
+        assert result['total_transactions'] == 3
+        assert result == validate_df(pd.read_csv(path))